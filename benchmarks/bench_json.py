@@ -0,0 +1,74 @@
+"""
+Benchmark: encode/decode cost of the stdlib json module vs. orjson on posts,
+users and photos payloads, plus requests.Response.json() (decodes on every
+call) vs. APIResponse.json() (decodes once) for a test reading a body three
+times
+
+Run with:
+    python -m benchmarks.bench_json
+"""
+import timeit
+
+import requests
+
+from utils.json_codec import ORJSON, STDLIB, APIResponse
+from utils.local_server import build_dataset
+from utils.responses import build_response
+
+READS_PER_RESPONSE = 3
+
+
+def _best_us(func, number: int, repeat: int = 5) -> float:
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def _response(body: bytes) -> requests.Response:
+    request = requests.Request('GET', 'http://bench.local/').prepare()
+    return build_response(request, 200, {'Content-Type': 'application/json; charset=utf-8'}, body)
+
+
+def _read_plain(body: bytes) -> None:
+    response = _response(body)
+    for _ in range(READS_PER_RESPONSE):
+        response.json()
+
+
+def _read_wrapped(body: bytes, codec) -> None:
+    response = APIResponse(_response(body), codec)
+    for _ in range(READS_PER_RESPONSE):
+        response.json()
+
+
+def main() -> None:
+    dataset = build_dataset()
+    payloads = [(name, dataset[name]) for name in ('posts', 'users', 'photos')]
+    codecs = [STDLIB] + ([ORJSON] if ORJSON else [])
+    if ORJSON is None:
+        print("orjson is not installed: only the stdlib backend is measured\n")
+
+    print(f"{'payload':<10}{'bytes':>10}{'backend':>9}{'encode':>13}{'decode':>13}{'speedup':>10}")
+    for name, items in payloads:
+        body = STDLIB.dumps(items)
+        number = max(1, 2_000_000 // len(body))
+        baseline = None
+        for codec in codecs:
+            encode_us = _best_us(lambda: codec.dumps(items), number)
+            decode_us = _best_us(lambda: codec.loads(body), number)
+            baseline = baseline or encode_us + decode_us
+            print(f"{name:<10}{len(body):>10}{codec.name:>9}{encode_us:>10.0f} us{decode_us:>10.0f} us"
+                  f"{baseline / (encode_us + decode_us):>9.1f}x")
+
+    print()
+    print(f"{'payload':<10}{'json() x' + str(READS_PER_RESPONSE):>16}"
+          + ''.join(f"{'APIResponse/' + codec.name:>21}" for codec in codecs))
+    for name, items in payloads:
+        body = STDLIB.dumps(items)
+        number = max(1, 1_000_000 // len(body))
+        plain_us = _best_us(lambda: _read_plain(body), number)
+        wrapped = [_best_us(lambda: _read_wrapped(body, codec), number) for codec in codecs]
+        print(f"{name:<10}{plain_us:>13.0f} us"
+              + ''.join(f"{us:>11.0f} us ({plain_us / us:>3.1f}x)" for us in wrapped))
+
+
+if __name__ == '__main__':
+    main()
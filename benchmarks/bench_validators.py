@@ -0,0 +1,62 @@
+"""
+Benchmark: per-object validation cost of the hand-written helpers vs. the
+compiled schema registry (and jsonschema for reference), plus row-by-row vs.
+bulk columnar validation of whole collections
+
+Run with:
+    python -m benchmarks.bench_validators
+"""
+import timeit
+
+import jsonschema
+
+from config.schemas import SCHEMAS
+from utils.bulk_validation import validate_collection
+from utils.helpers import validate_post_schema, validate_user_schema
+from utils.local_server import build_dataset
+from utils.schema_registry import registry
+
+
+def _per_object_ns(func, items, repeat: int = 5) -> float:
+    number = max(1, 20000 // len(items))
+    best = min(timeit.repeat(lambda: [func(item) for item in items], number=number, repeat=repeat))
+    return best / (number * len(items)) * 1e9
+
+
+def main() -> None:
+    dataset = build_dataset()
+    cases = [
+        ('posts', dataset['posts'], validate_post_schema),
+        ('users', dataset['users'], validate_user_schema),
+    ]
+
+    print(f"{'resource':<10}{'helpers':>14}{'compiled':>14}{'jsonschema':>14}{'speedup':>10}")
+    for name, items, helper in cases:
+        compiled = registry.validator(name)
+        reference = jsonschema.validators.validator_for(SCHEMAS[name])(SCHEMAS[name])
+
+        helper_ns = _per_object_ns(helper, items)
+        compiled_ns = _per_object_ns(compiled, items)
+        reference_ns = _per_object_ns(reference.is_valid, items, repeat=3)
+        print(f"{name:<10}{helper_ns:>11.0f} ns{compiled_ns:>11.0f} ns"
+              f"{reference_ns:>11.0f} ns{helper_ns / compiled_ns:>9.1f}x")
+
+    for name in ('comments', 'albums', 'photos', 'todos'):
+        compiled_ns = _per_object_ns(registry.validator(name), dataset[name])
+        print(f"{name:<10}{'-':>14}{compiled_ns:>11.0f} ns{'-':>14}{'-':>10}")
+
+    print()
+    print(f"{'collection':<10}{'rows':>8}{'row-by-row':>14}{'bulk':>14}{'speedup':>10}")
+    for name in SCHEMAS:
+        rows = dataset[name]
+        compiled = registry.validator(name)
+        per_row_ns = _per_object_ns(compiled, rows)
+        number = max(1, 20000 // len(rows))
+        bulk_ns = min(timeit.repeat(lambda: validate_collection(rows, name),
+                                    number=number, repeat=5)) / (number * len(rows)) * 1e9
+        print(f"{name:<10}{len(rows):>8}{per_row_ns:>11.0f} ns{bulk_ns:>11.0f} ns"
+              f"{per_row_ns / bulk_ns:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
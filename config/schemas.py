@@ -0,0 +1,119 @@
+"""
+Declarative response schemas for every JSONPlaceholder resource
+
+Schemas use the JSON Schema keywords understood by utils.schema_registry
+(type, required, properties, items, enum, minimum, minLength), so they can
+also be fed to jsonschema unchanged.
+"""
+
+POST_SCHEMA = {
+    "type": "object",
+    "required": ["userId", "id", "title", "body"],
+    "properties": {
+        "userId": {"type": "integer"},
+        "id": {"type": "integer"},
+        "title": {"type": "string"},
+        "body": {"type": "string"}
+    }
+}
+
+GEO_SCHEMA = {
+    "type": "object",
+    "required": ["lat", "lng"],
+    "properties": {
+        "lat": {"type": "string"},
+        "lng": {"type": "string"}
+    }
+}
+
+ADDRESS_SCHEMA = {
+    "type": "object",
+    "required": ["street", "suite", "city", "zipcode", "geo"],
+    "properties": {
+        "street": {"type": "string"},
+        "suite": {"type": "string"},
+        "city": {"type": "string"},
+        "zipcode": {"type": "string"},
+        "geo": GEO_SCHEMA
+    }
+}
+
+COMPANY_SCHEMA = {
+    "type": "object",
+    "required": ["name", "catchPhrase", "bs"],
+    "properties": {
+        "name": {"type": "string"},
+        "catchPhrase": {"type": "string"},
+        "bs": {"type": "string"}
+    }
+}
+
+USER_SCHEMA = {
+    "type": "object",
+    "required": ["id", "name", "username", "email", "address", "phone", "website", "company"],
+    "properties": {
+        "id": {"type": "integer"},
+        "name": {"type": "string"},
+        "username": {"type": "string"},
+        "email": {"type": "string"},
+        "address": ADDRESS_SCHEMA,
+        "phone": {"type": "string"},
+        "website": {"type": "string"},
+        "company": COMPANY_SCHEMA
+    }
+}
+
+COMMENT_SCHEMA = {
+    "type": "object",
+    "required": ["postId", "id", "name", "email", "body"],
+    "properties": {
+        "postId": {"type": "integer"},
+        "id": {"type": "integer"},
+        "name": {"type": "string"},
+        "email": {"type": "string"},
+        "body": {"type": "string"}
+    }
+}
+
+ALBUM_SCHEMA = {
+    "type": "object",
+    "required": ["userId", "id", "title"],
+    "properties": {
+        "userId": {"type": "integer"},
+        "id": {"type": "integer"},
+        "title": {"type": "string"}
+    }
+}
+
+PHOTO_SCHEMA = {
+    "type": "object",
+    "required": ["albumId", "id", "title", "url", "thumbnailUrl"],
+    "properties": {
+        "albumId": {"type": "integer"},
+        "id": {"type": "integer"},
+        "title": {"type": "string"},
+        "url": {"type": "string"},
+        "thumbnailUrl": {"type": "string"}
+    }
+}
+
+TODO_SCHEMA = {
+    "type": "object",
+    "required": ["userId", "id", "title", "completed"],
+    "properties": {
+        "userId": {"type": "integer"},
+        "id": {"type": "integer"},
+        "title": {"type": "string"},
+        "completed": {"type": "boolean"}
+    }
+}
+
+# Resource name (as in ENDPOINTS) -> schema of one item
+SCHEMAS = {
+    "posts": POST_SCHEMA,
+    "users": USER_SCHEMA,
+    "comments": COMMENT_SCHEMA,
+    "albums": ALBUM_SCHEMA,
+    "photos": PHOTO_SCHEMA,
+    "todos": TODO_SCHEMA
+}
@@ -1,10 +1,29 @@
 """
 Configuration settings for API automation tests
 """
+import os
 
 # Base URL for JSONPlaceholder API
 BASE_URL = "https://jsonplaceholder.typicode.com"
 
+# Local stand-in API (enable with --local-api or API_LOCAL=1)
+USE_LOCAL_API = os.environ.get("API_LOCAL", "").lower() in ("1", "true", "yes")
+LOCAL_API_HOST = "127.0.0.1"
+LOCAL_API_PORT = 0  # 0 picks a free port
+LOCAL_API_MAX_AGE = 43200  # Cache-Control max-age sent by JSONPlaceholder
+FAULT_SEED = 0  # Seed for fault profile probabilities and sampled latencies
+
+# HTTP response cache for GETs (opt-in with --http-cache or API_HTTP_CACHE=1)
+HTTP_CACHE_ENABLED = os.environ.get("API_HTTP_CACHE", "").lower() in ("1", "true", "yes")
+HTTP_CACHE_MAX_ENTRIES = 512
+HTTP_CACHE_MAX_BYTES = 64 * 1024 * 1024
+HTTP_CACHE_TTL = 300  # Upper bound on freshness, in seconds
+HTTP_CACHE_PATH = os.environ.get("API_HTTP_CACHE_PATH")  # SQLite file shared by xdist workers
+
+# Record/replay cassettes (off, record or replay)
+CASSETTE_MODE = os.environ.get("API_CASSETTE_MODE", "off")
+CASSETTE_PATH = os.environ.get("API_CASSETTE_PATH", "cassettes/api.cassette")
+
 # API Endpoints
 ENDPOINTS = {
     "posts": "/posts",
@@ -30,8 +49,89 @@ TEST_POST_UPDATE = {
 
 # Timeout settings (in seconds)
 REQUEST_TIMEOUT = 10
+CONNECT_TIMEOUT = 3.05  # Seconds to establish a connection (fail fast on a dead host)
+READ_TIMEOUT = REQUEST_TIMEOUT  # Seconds to wait for each read from the server
 MAX_RESPONSE_TIME = 2.0
 
+# Connection pool settings
+POOL_CONNECTIONS = 10  # Number of per-host pools kept alive
+POOL_MAXSIZE = 20      # Maximum keep-alive connections per host
+POOL_BLOCK = False     # Wait for a free connection instead of opening extra ones
+
+# Resilience settings
+RETRY_MAX_ATTEMPTS = 3            # Attempts per idempotent request (1 disables retries)
+RETRY_BACKOFF_BASE = 0.1          # Seconds; doubled per retry, with full jitter
+RETRY_BACKOFF_MAX = 2.0           # Upper bound for one backoff delay
+RETRY_STATUSES = (429, 502, 503, 504)  # Throttling and gateway errors worth retrying
+RETRY_READ_TIMEOUTS = False       # Resend after a read timeout (a hung server would cost one timeout per attempt)
+HEDGE_ENABLED = os.environ.get("API_HEDGE", "") == "1"  # Send backup GETs for slow responses
+HEDGE_DEFAULT_DELAY = 0.5         # Hedge delay until an endpoint has HEDGE_MIN_SAMPLES timings
+HEDGE_MIN_SAMPLES = 20            # Timings needed before the endpoint's p95 is used as delay
+HEDGE_MAX_WORKERS = 16            # Threads running hedged GETs
+BREAKER_FAILURE_THRESHOLD = 5     # Consecutive failures that open a host's circuit
+BREAKER_RESET_TIMEOUT = 30.0      # Seconds before a probe request is let through
+
+# Rate limiting settings
+RATE_LIMIT = float(os.environ.get("API_RATE_LIMIT", "0"))  # Requests/s per host for all processes (0: off)
+RATE_LIMIT_BURST = 0.0          # Largest burst per bucket (0: same as the rate)
+ENDPOINT_RATE_LIMITS = {}       # Requests/s per endpoint template, e.g. {"/posts/{id}": 5}
+RATE_LIMIT_PATH = os.environ.get("API_RATE_LIMIT_PATH")  # State file shared by processes
+RETRY_AFTER_MAX = 60.0          # Longest Retry-After honored, in seconds (longer values are clamped)
+
+# Request coalescing settings
+COALESCE_GETS = os.environ.get("API_COALESCE", "1") != "0"  # Share one request between identical concurrent GETs
+
+# JSON codec settings
+JSON_BACKEND = os.environ.get("API_JSON_BACKEND", "auto")  # auto (orjson if installed), orjson or json
+
+# Async client settings
+ASYNC_MAX_CONCURRENCY = 100  # Maximum requests in flight on one event loop
+
+# Streaming JSON settings
+STREAM_CHUNK_SIZE = 64 * 1024  # Bytes read per chunk by APIClient.iter_json
+
+# Pagination settings
+PAGE_SIZE = 20     # Default _limit for paginated iterators
+PAGE_PREFETCH = 2  # Pages fetched ahead of the consumer
+
+# Batch fetch settings
+BATCH_MAX_WORKERS = 8  # Default thread pool size for get_*_by_ids
+
+# Bulk write settings
+BULK_WINDOW = 16  # Requests in flight for create_*_bulk / update_*_bulk (keep <= POOL_MAXSIZE)
+
+# DataLoader settings
+LOADER_WINDOW = 0.005   # Seconds to collect load() calls before a background batch
+LOADER_MAX_BATCH = 50   # IDs per multi-id query (keeps URLs short)
+
+# Load generator settings
+RUN_LOAD_TESTS = os.environ.get("API_LOAD", "") == "1"  # Run @pytest.mark.load tests
+LOAD_MAX_WORKERS = 50  # Maximum operations in flight for open-loop profiles
+
+# Performance baseline settings
+PERF_BASELINE_PATH = os.environ.get("API_PERF_BASELINE", "perf/baselines.json")
+PERF_SAMPLES = 30              # Timed calls per performance test
+PERF_WARMUP = 5                # Untimed calls before sampling
+PERF_ALPHA = 0.01              # Significance level for regression tests
+PERF_MIN_EFFECT = 0.10         # Ignore slowdowns smaller than 10%
+PERF_BOOTSTRAP_ROUNDS = 2000   # Resamples for the p95 confidence interval
+
+# Snapshot (contract) settings
+SNAPSHOT_PATH = os.environ.get("API_SNAPSHOT_PATH", "snapshots/contracts.json")
+SNAPSHOT_MAX_DIFF = 20  # Diff lines shown when a response no longer matches its snapshot
+
+# xdist scheduling settings
+TEST_HISTORY_PATH = os.environ.get("API_TEST_HISTORY", ".test_durations.json")  # Per-test durations/endpoints
+
+# Test impact selection settings (--impact)
+IMPACT_PATH = os.environ.get("API_IMPACT_PATH", ".test_impact.json")  # Per-test modules/endpoint fingerprints
+IMPACT_PROBE_WORKERS = 8  # Endpoint fingerprint requests in flight before selection
+
+# Profiling settings (--profile-api)
+PROFILE_DIR = os.environ.get("API_PROFILE_DIR", "reports/profiles")  # Collapsed stacks per test
+PROFILE_INTERVAL = 0.001  # Seconds between stack samples
+PROFILE_TOP = 10          # Tests and functions listed in the report
+
 # Expected counts
 TOTAL_POSTS = 100
 TOTAL_USERS = 10
@@ -3,6 +3,13 @@ Services module for API automation
 """
 from .posts_service import PostsService
 from .users_service import UsersService
+from .async_posts_service import AsyncPostsService
+from .async_users_service import AsyncUsersService
+from .batch import BatchResult
+from .bulk import BulkReport, BulkRun
+from .pagination import Page, PageIterator
+from .loader import DataLoader, RelationLoader
 
-__all__ = ['PostsService', 'UsersService']
+__all__ = ['PostsService', 'UsersService', 'AsyncPostsService', 'AsyncUsersService', 'BatchResult',
+           'BulkReport', 'BulkRun', 'Page', 'PageIterator', 'DataLoader', 'RelationLoader']
 
@@ -0,0 +1,94 @@
+"""
+Async Posts Service - Handles Posts API interactions on an event loop
+"""
+from typing import Dict, Any
+from config.settings import ENDPOINTS
+from utils.async_client import AsyncResponse
+
+
+class AsyncPostsService:
+    """Async service class for Posts API operations"""
+    
+    def __init__(self, api_client):
+        """
+        Initialize Async Posts Service
+        
+        Args:
+            api_client: AsyncAPIClient instance for making HTTP requests
+        """
+        self.api_client = api_client
+        self.endpoint = ENDPOINTS['posts']
+    
+    async def get_post_by_id(self, post_id: int) -> AsyncResponse:
+        """
+        Get a single post by ID
+        
+        Args:
+            post_id: ID of the post to retrieve
+            
+        Returns:
+            Response object
+        """
+        endpoint = f"{self.endpoint}/{post_id}"
+        return await self.api_client.get(endpoint)
+    
+    async def get_all_posts(self) -> AsyncResponse:
+        """
+        Get all posts
+        
+        Returns:
+            Response object with list of all posts
+        """
+        return await self.api_client.get(self.endpoint)
+    
+    async def get_posts_by_user(self, user_id: int) -> AsyncResponse:
+        """
+        Get posts filtered by user ID
+        
+        Args:
+            user_id: ID of the user whose posts to retrieve
+            
+        Returns:
+            Response object with filtered posts
+        """
+        params = {'userId': user_id}
+        return await self.api_client.get(self.endpoint, params=params)
+    
+    async def create_post(self, post_data: Dict[str, Any]) -> AsyncResponse:
+        """
+        Create a new post
+        
+        Args:
+            post_data: Dictionary containing post data (title, body, userId)
+            
+        Returns:
+            Response object with created post
+        """
+        return await self.api_client.post(self.endpoint, post_data)
+    
+    async def update_post(self, post_id: int, post_data: Dict[str, Any]) -> AsyncResponse:
+        """
+        Update an existing post
+        
+        Args:
+            post_id: ID of the post to update
+            post_data: Dictionary containing updated post data
+            
+        Returns:
+            Response object with updated post
+        """
+        endpoint = f"{self.endpoint}/{post_id}"
+        return await self.api_client.put(endpoint, post_data)
+    
+    async def delete_post(self, post_id: int) -> AsyncResponse:
+        """
+        Delete a post
+        
+        Args:
+            post_id: ID of the post to delete
+            
+        Returns:
+            Response object
+        """
+        endpoint = f"{self.endpoint}/{post_id}"
+        return await self.api_client.delete(endpoint)
@@ -0,0 +1,81 @@
+"""
+Async Users Service - Handles Users API interactions on an event loop
+"""
+from typing import Dict, Any
+from config.settings import ENDPOINTS
+from utils.async_client import AsyncResponse
+
+
+class AsyncUsersService:
+    """Async service class for Users API operations"""
+    
+    def __init__(self, api_client):
+        """
+        Initialize Async Users Service
+        
+        Args:
+            api_client: AsyncAPIClient instance for making HTTP requests
+        """
+        self.api_client = api_client
+        self.endpoint = ENDPOINTS['users']
+    
+    async def get_user_by_id(self, user_id: int) -> AsyncResponse:
+        """
+        Get a single user by ID
+        
+        Args:
+            user_id: ID of the user to retrieve
+            
+        Returns:
+            Response object
+        """
+        endpoint = f"{self.endpoint}/{user_id}"
+        return await self.api_client.get(endpoint)
+    
+    async def get_all_users(self) -> AsyncResponse:
+        """
+        Get all users
+        
+        Returns:
+            Response object with list of all users
+        """
+        return await self.api_client.get(self.endpoint)
+    
+    async def create_user(self, user_data: Dict[str, Any]) -> AsyncResponse:
+        """
+        Create a new user
+        
+        Args:
+            user_data: Dictionary containing user data
+            
+        Returns:
+            Response object with created user
+        """
+        return await self.api_client.post(self.endpoint, user_data)
+    
+    async def update_user(self, user_id: int, user_data: Dict[str, Any]) -> AsyncResponse:
+        """
+        Update an existing user
+        
+        Args:
+            user_id: ID of the user to update
+            user_data: Dictionary containing updated user data
+            
+        Returns:
+            Response object with updated user
+        """
+        endpoint = f"{self.endpoint}/{user_id}"
+        return await self.api_client.put(endpoint, user_data)
+    
+    async def delete_user(self, user_id: int) -> AsyncResponse:
+        """
+        Delete a user
+        
+        Args:
+            user_id: ID of the user to delete
+            
+        Returns:
+            Response object
+        """
+        endpoint = f"{self.endpoint}/{user_id}"
+        return await self.api_client.delete(endpoint)
@@ -0,0 +1,75 @@
+"""
+Batch helpers - Fan single-id service calls out across a thread pool
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Optional
+import requests
+from config.settings import BATCH_MAX_WORKERS
+
+
+class BatchResult(NamedTuple):
+    """Outcome of one item in a batch: either a response or the error raised"""
+
+    key: Any
+    response: Optional[requests.Response] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the request completed without raising"""
+        return self.error is None
+
+
+def _call(fetch: Callable[[Any], requests.Response], key: Any) -> BatchResult:
+    try:
+        return BatchResult(key, response=fetch(key))
+    except Exception as exc:  # reported per item, never aborts the batch
+        return BatchResult(key, error=exc)
+
+
+def fetch_batch(fetch: Callable[[Any], requests.Response], keys: Iterable[Any],
+                max_workers: Optional[int] = None) -> List[BatchResult]:
+    """
+    Run fetch(key) for every key concurrently
+
+    Args:
+        fetch: Single-item service call, e.g. PostsService.get_post_by_id
+        keys: Items to fetch
+        max_workers: Thread pool size (defaults to BATCH_MAX_WORKERS)
+
+    Returns:
+        List of BatchResult in the same order as keys
+    """
+    keys = list(keys)
+    if not keys:
+        return []
+    workers = min(max_workers or BATCH_MAX_WORKERS, len(keys))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda key: _call(fetch, key), keys))
+
+
+def fetch_as_completed(fetch: Callable[[Any], requests.Response], keys: Iterable[Any],
+                       max_workers: Optional[int] = None) -> Iterator[BatchResult]:
+    """
+    Run fetch(key) for every key concurrently and yield results as they finish
+
+    Args:
+        fetch: Single-item service call, e.g. PostsService.get_post_by_id
+        keys: Items to fetch
+        max_workers: Thread pool size (defaults to BATCH_MAX_WORKERS)
+
+    Yields:
+        BatchResult in completion order
+    """
+    keys = list(keys)
+    if not keys:
+        return
+    workers = min(max_workers or BATCH_MAX_WORKERS, len(keys))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = [executor.submit(_call, fetch, key) for key in keys]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # Drop queued work if the caller stops iterating early
+        executor.shutdown(wait=True, cancel_futures=True)
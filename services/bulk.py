@@ -0,0 +1,153 @@
+"""
+Bulk writes - Pipeline create/update calls through a bounded in-flight window
+
+Items are pulled from the input lazily: a new one is read only when a slot
+in the window frees up, so a generator of millions of payloads is never
+materialized and memory stays flat. Results stream out in completion order.
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, List
+import requests
+from config.settings import BULK_WINDOW
+from .batch import BatchResult
+
+_END = object()
+
+
+def _send(send: Callable[[Any], requests.Response], index: int, item: Any) -> BatchResult:
+    response = None
+    try:
+        response = send(item)
+        response.raise_for_status()
+    except Exception as exc:  # reported per item; the run decides whether to stop
+        return BatchResult(index, response=response, error=exc)
+    return BatchResult(index, response=response)
+
+
+class BulkReport:
+    """Running totals of a bulk run (only failed results are kept)"""
+
+    def __init__(self):
+        self.succeeded = 0
+        self.failed = 0
+        self.errors: List[BatchResult] = []
+        self.stopped = False
+        self.elapsed = 0.0
+        self._start = time.perf_counter()
+
+    def add(self, result: BatchResult) -> None:
+        if result.ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+            self.errors.append(result)
+        self.elapsed = time.perf_counter() - self._start
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def throughput(self) -> float:
+        """Completed items per second"""
+        return self.completed / self.elapsed if self.elapsed > 0 else 0.0
+
+    def format(self) -> str:
+        """One-line summary, e.g. for assertion messages"""
+        stopped = ', stopped at first error' if self.stopped else ''
+        return (f"{self.completed} items in {self.elapsed:.2f}s ({self.throughput:.1f}/s): "
+                f"{self.succeeded} succeeded, {self.failed} failed{stopped}")
+
+
+class BulkRun:
+    """
+    Send one request per input item with at most `window` in flight
+
+    Iterate the run for BatchResult objects in completion order; `key` is
+    the item's position in the input. A response with a 4xx/5xx status
+    counts as a failure (its HTTPError is the result's error, the response
+    is kept). With stop_on_error=True no new items are read after the first
+    failure; requests already in flight still complete and are yielded.
+    """
+
+    def __init__(self, send: Callable[[Any], requests.Response], items: Iterable[Any],
+                 window: int = BULK_WINDOW, stop_on_error: bool = False):
+        """
+        Initialize the run (nothing is sent until iteration starts)
+
+        Args:
+            send: Single-item service call, e.g. PostsService.create_post
+            items: Input items, read lazily
+            window: Maximum requests in flight
+            stop_on_error: Stop reading input after the first failed item
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.send = send
+        self.items = items
+        self.window = window
+        self.stop_on_error = stop_on_error
+        self.report = BulkReport()
+        self._started = False
+
+    def __iter__(self) -> Iterator[BatchResult]:
+        if self._started:
+            raise RuntimeError("A BulkRun can only be iterated once")
+        self._started = True
+        report = self.report = BulkReport()
+        items = iter(self.items)
+        executor = ThreadPoolExecutor(max_workers=self.window, thread_name_prefix='bulk')
+        in_flight = set()
+        index = 0
+        reading = True
+        try:
+            while True:
+                while reading and len(in_flight) < self.window:
+                    item = next(items, _END)
+                    if item is _END:
+                        reading = False
+                        break
+                    in_flight.add(executor.submit(_send, self.send, index, item))
+                    index += 1
+                if not in_flight:
+                    break
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    report.add(result)
+                    if not result.ok and self.stop_on_error and reading:
+                        reading = False
+                        report.stopped = True
+                    yield result
+        finally:
+            # Drop queued work if the caller stops iterating early
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def run(self) -> BulkReport:
+        """
+        Send everything without keeping successful results
+
+        Returns:
+            BulkReport with counts, throughput and the failed results
+        """
+        for _ in self:
+            pass
+        return self.report
+
+
+def bulk_update(update: Callable[[int, Any], requests.Response], items: Iterable[Any],
+                window: int = BULK_WINDOW, stop_on_error: bool = False) -> BulkRun:
+    """
+    BulkRun for (id, data) pairs sent through update(id, data)
+
+    Args:
+        update: Service update call, e.g. PostsService.update_post
+        items: (id, data) pairs, read lazily
+        window: Maximum requests in flight
+        stop_on_error: Stop reading input after the first failed item
+
+    Returns:
+        BulkRun
+    """
+    return BulkRun(lambda pair: update(*pair), items, window, stop_on_error)
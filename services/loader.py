@@ -0,0 +1,240 @@
+"""
+DataLoader - Batch and deduplicate id lookups into multi-id queries
+
+load(key) calls are queued and sent as one request such as
+/posts?id=1&id=2&id=3 once a short window has elapsed (so calls from several
+threads are collected), or immediately on load_many()/dispatch(). With
+window=None a batch is sent when a caller first needs a result, the sync
+equivalent of "end of tick". Repeated keys share one future, so each id is
+fetched once.
+"""
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+from config.settings import ENDPOINTS, LOADER_WINDOW, LOADER_MAX_BATCH
+
+BatchFunction = Callable[[List[Hashable]], Dict[Hashable, Any]]
+
+
+class _LoaderFuture(Future):
+    """Future that sends its loader's pending batch when needed (window=None)"""
+
+    def __init__(self, loader: 'DataLoader'):
+        super().__init__()
+        self._loader = loader
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        if not self.done() and self._loader.window is None:
+            self._loader.dispatch()
+        return super().result(timeout)
+
+
+class DataLoader:
+    """
+    Collect load(key) calls into batched lookups
+
+    The batch function receives a list of unique keys and returns a dict of
+    key -> value; keys missing from the dict resolve to `default`.
+    """
+
+    def __init__(self, batch_fn: BatchFunction, window: Optional[float] = LOADER_WINDOW,
+                 max_batch_size: int = LOADER_MAX_BATCH, cache: bool = True,
+                 default: Any = None):
+        """
+        Initialize the loader
+
+        Args:
+            batch_fn: Callable mapping a list of keys to {key: value}
+            window: Seconds to wait for more keys before sending a batch in
+                the background; None sends only when a result is needed
+            max_batch_size: Keys per request (longer batches are split)
+            cache: Reuse results for keys already loaded by this loader
+            default: Value for keys the batch function did not return
+        """
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.cache = cache
+        self.default = default
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, _LoaderFuture] = {}
+        self._results: Dict[Hashable, _LoaderFuture] = {}
+        self._timer: Optional[threading.Timer] = None
+        self.batches = 0
+
+    def load(self, key: Hashable) -> Future:
+        """
+        Queue one key
+
+        Args:
+            key: ID to load
+
+        Returns:
+            Future resolving to the value once its batch has been sent
+        """
+        with self._lock:
+            future = self._results.get(key) or self._pending.get(key)
+            if future is not None:
+                return future
+            future = self._pending[key] = _LoaderFuture(self)
+            if self.cache:
+                self._results[key] = future
+            full = len(self._pending) >= self.max_batch_size
+            if not full and self.window is not None and self._timer is None:
+                self._timer = threading.Timer(self.window, self.dispatch)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.dispatch()
+        return future
+
+    def load_many(self, keys: Iterable[Hashable]) -> List[Any]:
+        """
+        Load several keys with as few requests as possible
+
+        Args:
+            keys: IDs to load (duplicates are fetched once)
+
+        Returns:
+            Values in the same order as keys
+        """
+        futures = [self.load(key) for key in keys]
+        self.dispatch()
+        return [future.result() for future in futures]
+
+    def dispatch(self) -> None:
+        """Send every queued key now"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        keys = list(pending)
+        for start in range(0, len(keys), self.max_batch_size):
+            chunk = keys[start:start + self.max_batch_size]
+            with self._lock:
+                self.batches += 1
+            try:
+                values = self.batch_fn(chunk)
+            except Exception as exc:
+                with self._lock:
+                    for key in chunk:
+                        self._results.pop(key, None)
+                for key in chunk:
+                    pending[key].set_exception(exc)
+                continue
+            for key in chunk:
+                pending[key].set_result(values.get(key, self.default))
+
+    def clear(self) -> None:
+        """Forget cached results"""
+        with self._lock:
+            self._results = dict(self._pending)
+
+
+def _fetch(api_client, endpoint: str, field: str, keys: List[Hashable]) -> List[Dict[str, Any]]:
+    response = api_client.get(endpoint, params={field: keys})
+    response.raise_for_status()
+    return response.json()
+
+
+def by_field(api_client, endpoint: str, field: str = 'id') -> BatchFunction:
+    """
+    Batch function for one item per key, e.g. /users?id=1&id=2
+
+    Args:
+        api_client: APIClient instance
+        endpoint: Collection endpoint
+        field: Field the keys are matched against
+
+    Returns:
+        Batch function for DataLoader
+    """
+    def batch(keys: List[Hashable]) -> Dict[Hashable, Any]:
+        return {item[field]: item for item in _fetch(api_client, endpoint, field, keys)}
+    return batch
+
+
+def grouped_by_field(api_client, endpoint: str, field: str) -> BatchFunction:
+    """
+    Batch function for a list of items per key, e.g. /posts?userId=1&userId=2
+
+    Args:
+        api_client: APIClient instance
+        endpoint: Collection endpoint
+        field: Foreign key field, e.g. 'userId'
+
+    Returns:
+        Batch function for DataLoader (keys with no items map to [])
+    """
+    def batch(keys: List[Hashable]) -> Dict[Hashable, Any]:
+        groups: Dict[Hashable, List[Dict[str, Any]]] = {key: [] for key in keys}
+        for item in _fetch(api_client, endpoint, field, keys):
+            groups.setdefault(item[field], []).append(item)
+        return groups
+    return batch
+
+
+class RelationLoader:
+    """Loaders for JSONPlaceholder relationships, sharing one cache per instance"""
+
+    def __init__(self, api_client, window: Optional[float] = LOADER_WINDOW):
+        """
+        Initialize the loaders
+
+        Args:
+            api_client: APIClient instance
+            window: Batching window passed to every DataLoader
+        """
+        self.users = DataLoader(by_field(api_client, ENDPOINTS['users']), window)
+        self.posts = DataLoader(by_field(api_client, ENDPOINTS['posts']), window)
+        self.posts_by_user = DataLoader(
+            grouped_by_field(api_client, ENDPOINTS['posts'], 'userId'), window)
+        self.comments_by_post = DataLoader(
+            grouped_by_field(api_client, ENDPOINTS['comments'], 'postId'), window)
+
+    def _with_comments(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        comments = self.comments_by_post.load_many(post['id'] for post in posts)
+        return [dict(post, comments=items) for post, items in zip(posts, comments)]
+
+    def users_with_posts(self, user_ids: Iterable[int],
+                         include_comments: bool = True) -> List[Optional[Dict[str, Any]]]:
+        """
+        Load users with their posts (and each post's comments)
+
+        Costs one request per level (split every LOADER_MAX_BATCH ids).
+
+        Args:
+            user_ids: User IDs
+            include_comments: Also attach comments to every post
+
+        Returns:
+            New user dicts with a 'posts' list, None for unknown IDs
+        """
+        user_ids = list(user_ids)
+        users = self.users.load_many(user_ids)
+        found = [user for user in users if user is not None]
+        posts = self.posts_by_user.load_many(user['id'] for user in found)
+        if include_comments:
+            flat = self._with_comments([post for items in posts for post in items])
+            by_id = {post['id']: post for post in flat}
+            posts = [[by_id[post['id']] for post in items] for items in posts]
+        graph = {user['id']: dict(user, posts=items) for user, items in zip(found, posts)}
+        return [graph.get(user['id']) if user is not None else None for user in users]
+
+    def posts_with_author_and_comments(self, post_ids: Iterable[int]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Load posts with their author ('user') and comments
+
+        Args:
+            post_ids: Post IDs
+
+        Returns:
+            New post dicts with 'user' and 'comments', None for unknown IDs
+        """
+        posts = self.posts.load_many(post_ids)
+        found = [post for post in posts if post is not None]
+        authors = self.users.load_many(post['userId'] for post in found)
+        detailed = self._with_comments(found)
+        graph = {post['id']: dict(post, user=author) for post, author in zip(detailed, authors)}
+        return [graph.get(post['id']) if post is not None else None for post in posts]
@@ -0,0 +1,142 @@
+"""
+Pagination helpers - Iterate _page/_limit collections with next-page prefetch
+"""
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+import requests
+from config.settings import PAGE_SIZE, PAGE_PREFETCH
+
+
+class Page(NamedTuple):
+    """One fetched page of a collection"""
+
+    number: int
+    items: List[Dict[str, Any]]
+    total: Optional[int]
+
+
+def _total_count(response: requests.Response) -> Optional[int]:
+    value = response.headers.get('X-Total-Count')
+    return int(value) if value and value.isdigit() else None
+
+
+def _last_page(response: requests.Response, page_size: int, total: Optional[int]) -> Optional[int]:
+    if total is not None:
+        return max((total + page_size - 1) // page_size, 1)
+    last = response.links.get('last', {}).get('url')
+    if last and '_page=' in last:
+        number = last.split('_page=', 1)[1].split('&', 1)[0]
+        if number.isdigit():
+            return int(number)
+    return None
+
+
+class PageIterator:
+    """
+    Iterate a paginated collection while the next pages load in the background
+
+    The first page is fetched eagerly to learn the collection size from
+    X-Total-Count (or the Link rel="last" header). After that up to
+    `prefetch` pages are kept in flight while the current one is consumed;
+    with prefetch=0 each page is fetched on the caller's thread when it is
+    reached. With ordered=False and a known size, all remaining pages are fetched in
+    parallel and yielded as they complete.
+    """
+
+    def __init__(self, api_client, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                 page_size: int = PAGE_SIZE, prefetch: int = PAGE_PREFETCH,
+                 ordered: bool = True):
+        """
+        Initialize the iterator (nothing is fetched until iteration starts)
+
+        Args:
+            api_client: APIClient instance
+            endpoint: Collection endpoint, e.g. ENDPOINTS['posts']
+            params: Extra filters, e.g. {'userId': 1}
+            page_size: Items per page (_limit)
+            prefetch: Pages kept in flight ahead of the consumer (0 = none)
+            ordered: Yield pages in order; False allows completion order
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.api_client = api_client
+        self.endpoint = endpoint
+        self.params = dict(params or {})
+        self.page_size = page_size
+        self.prefetch = max(prefetch, 0)
+        self.ordered = ordered
+        self.total: Optional[int] = None
+
+    def _request(self, number: int) -> requests.Response:
+        params = dict(self.params, _page=number, _limit=self.page_size)
+        response = self.api_client.get(self.endpoint, params=params)
+        response.raise_for_status()
+        return response
+
+    def _fetch(self, number: int) -> Page:
+        response = self._request(number)
+        return Page(number, response.json(), _total_count(response))
+
+    def pages(self) -> Iterator[Page]:
+        """
+        Yield pages, prefetching ahead of the consumer
+
+        Yields:
+            Page objects
+        """
+        response = self._request(1)
+        first = Page(1, response.json(), _total_count(response))
+        self.total = first.total
+        last = _last_page(response, self.page_size, first.total)
+        yield first
+        if not first.items or (last is not None and last <= 1):
+            return
+
+        if self.prefetch == 0:
+            number = 2
+            while last is None or number <= last:
+                page = self._fetch(number)
+                if not page.items:
+                    return
+                yield page
+                if last is None and len(page.items) < self.page_size:
+                    return
+                number += 1
+            return
+
+        workers = self.prefetch
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            if not self.ordered and last is not None:
+                futures = [executor.submit(self._fetch, number) for number in range(2, last + 1)]
+                for future in as_completed(futures):
+                    yield future.result()
+                return
+
+            in_flight: Dict[int, Future] = {}
+            next_to_submit = 2
+
+            def top_up() -> None:
+                nonlocal next_to_submit
+                while len(in_flight) < workers and (last is None or next_to_submit <= last):
+                    in_flight[next_to_submit] = executor.submit(self._fetch, next_to_submit)
+                    next_to_submit += 1
+
+            number = 2
+            top_up()
+            while number in in_flight:
+                page = in_flight.pop(number).result()
+                top_up()
+                if not page.items:
+                    return
+                yield page
+                # Without a known size, a short page is the last one
+                if last is None and len(page.items) < self.page_size:
+                    return
+                number += 1
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for page in self.pages():
+            yield from page.items
@@ -1,9 +1,13 @@
 """
 Posts Service - Handles all Posts API interactions
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Tuple
 import requests
-from config.settings import ENDPOINTS
+from config.settings import BULK_WINDOW, ENDPOINTS, PAGE_SIZE, PAGE_PREFETCH
+from .batch import BatchResult, fetch_batch, fetch_as_completed
+from .bulk import BulkRun, bulk_update
+from .pagination import PageIterator
+from .loader import RelationLoader
 
 
 class PostsService:
@@ -32,6 +36,35 @@ class PostsService:
         endpoint = f"{self.endpoint}/{post_id}"
         return self.api_client.get(endpoint)
     
+    def get_posts_by_ids(self, post_ids: Iterable[int],
+                         max_workers: Optional[int] = None) -> List[BatchResult]:
+        """
+        Get several posts by ID concurrently
+        
+        Args:
+            post_ids: IDs of the posts to retrieve
+            max_workers: Thread pool size (defaults to BATCH_MAX_WORKERS)
+            
+        Returns:
+            List of BatchResult in the same order as post_ids; failed
+            requests carry the error instead of a response
+        """
+        return fetch_batch(self.get_post_by_id, post_ids, max_workers)
+    
+    def get_posts_by_ids_as_completed(self, post_ids: Iterable[int],
+                                      max_workers: Optional[int] = None) -> Iterator[BatchResult]:
+        """
+        Get several posts by ID concurrently, yielding each as soon as it arrives
+        
+        Args:
+            post_ids: IDs of the posts to retrieve
+            max_workers: Thread pool size (defaults to BATCH_MAX_WORKERS)
+            
+        Yields:
+            BatchResult in completion order
+        """
+        return fetch_as_completed(self.get_post_by_id, post_ids, max_workers)
+    
     def get_all_posts(self) -> requests.Response:
         """
         Get all posts
@@ -54,6 +87,54 @@ class PostsService:
         params = {'userId': user_id}
         return self.api_client.get(self.endpoint, params=params)
     
+    def iter_all_posts(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream all posts, yielding each one as soon as it is decoded
+        
+        Yields:
+            Post objects in response order
+        """
+        return self.api_client.iter_json(self.endpoint)
+    
+    def get_posts_with_author_and_comments(self, post_ids: Iterable[int]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get posts with their author and comments in batched requests
+        
+        Args:
+            post_ids: IDs of the posts to retrieve
+            
+        Returns:
+            Post dicts with 'user' and 'comments', in the same order as
+            post_ids; None for posts that do not exist
+        """
+        return RelationLoader(self.api_client).posts_with_author_and_comments(post_ids)
+    
+    def iter_posts_paginated(self, page_size: Optional[int] = None,
+                             prefetch: Optional[int] = None,
+                             ordered: bool = True,
+                             user_id: Optional[int] = None) -> PageIterator:
+        """
+        Iterate posts page by page, prefetching the next pages in the background
+        
+        Args:
+            page_size: Items per page (defaults to PAGE_SIZE)
+            prefetch: Pages kept in flight (defaults to PAGE_PREFETCH)
+            ordered: Set False to fetch all pages in parallel in completion order
+            user_id: Optional filter by user ID
+            
+        Returns:
+            PageIterator; iterate it for posts, or call .pages() for Page objects
+        """
+        params = {'userId': user_id} if user_id is not None else None
+        return PageIterator(
+            self.api_client,
+            self.endpoint,
+            params=params,
+            page_size=page_size or PAGE_SIZE,
+            prefetch=PAGE_PREFETCH if prefetch is None else prefetch,
+            ordered=ordered,
+        )
+    
     def create_post(self, post_data: Dict[str, Any]) -> requests.Response:
         """
         Create a new post
@@ -80,6 +161,38 @@ class PostsService:
         endpoint = f"{self.endpoint}/{post_id}"
         return self.api_client.put(endpoint, post_data)
     
+    def create_posts_bulk(self, posts: Iterable[Dict[str, Any]], window: int = BULK_WINDOW,
+                          stop_on_error: bool = False) -> BulkRun:
+        """
+        Create many posts with a bounded number of requests in flight
+        
+        Args:
+            posts: Post payloads, read lazily (a generator is never materialized)
+            window: Maximum requests in flight
+            stop_on_error: Stop reading input after the first failed item
+            
+        Returns:
+            BulkRun; iterate it for per-item BatchResults, or call .run()
+            for a BulkReport with counts and throughput
+        """
+        return BulkRun(self.create_post, posts, window, stop_on_error)
+    
+    def update_posts_bulk(self, updates: Iterable[Tuple[int, Dict[str, Any]]], window: int = BULK_WINDOW,
+                          stop_on_error: bool = False) -> BulkRun:
+        """
+        Update many posts with a bounded number of requests in flight
+        
+        Args:
+            updates: (post_id, post_data) pairs, read lazily
+            window: Maximum requests in flight
+            stop_on_error: Stop reading input after the first failed item
+            
+        Returns:
+            BulkRun; iterate it for per-item BatchResults, or call .run()
+            for a BulkReport with counts and throughput
+        """
+        return bulk_update(self.update_post, updates, window, stop_on_error)
+    
     def delete_post(self, post_id: int) -> requests.Response:
         """
         Delete a post
@@ -1,9 +1,13 @@
 """
 Users Service - Handles all Users API interactions
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Tuple
 import requests
-from config.settings import ENDPOINTS
+from config.settings import BULK_WINDOW, ENDPOINTS, PAGE_SIZE, PAGE_PREFETCH
+from .batch import BatchResult, fetch_batch, fetch_as_completed
+from .bulk import BulkRun, bulk_update
+from .pagination import PageIterator
+from .loader import RelationLoader
 
 
 class UsersService:
@@ -32,6 +36,35 @@ class UsersService:
         endpoint = f"{self.endpoint}/{user_id}"
         return self.api_client.get(endpoint)
     
+    def get_users_by_ids(self, user_ids: Iterable[int],
+                         max_workers: Optional[int] = None) -> List[BatchResult]:
+        """
+        Get several users by ID concurrently
+        
+        Args:
+            user_ids: IDs of the users to retrieve
+            max_workers: Thread pool size (defaults to BATCH_MAX_WORKERS)
+            
+        Returns:
+            List of BatchResult in the same order as user_ids; failed
+            requests carry the error instead of a response
+        """
+        return fetch_batch(self.get_user_by_id, user_ids, max_workers)
+    
+    def get_users_by_ids_as_completed(self, user_ids: Iterable[int],
+                                      max_workers: Optional[int] = None) -> Iterator[BatchResult]:
+        """
+        Get several users by ID concurrently, yielding each as soon as it arrives
+        
+        Args:
+            user_ids: IDs of the users to retrieve
+            max_workers: Thread pool size (defaults to BATCH_MAX_WORKERS)
+            
+        Yields:
+            BatchResult in completion order
+        """
+        return fetch_as_completed(self.get_user_by_id, user_ids, max_workers)
+    
     def get_all_users(self) -> requests.Response:
         """
         Get all users
@@ -41,6 +74,54 @@ class UsersService:
         """
         return self.api_client.get(self.endpoint)
     
+    def iter_all_users(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream all users, yielding each one as soon as it is decoded
+        
+        Yields:
+            User objects in response order
+        """
+        return self.api_client.iter_json(self.endpoint)
+    
+    def iter_users_paginated(self, page_size: Optional[int] = None,
+                             prefetch: Optional[int] = None,
+                             ordered: bool = True) -> PageIterator:
+        """
+        Iterate users page by page, prefetching the next pages in the background
+        
+        Args:
+            page_size: Items per page (defaults to PAGE_SIZE)
+            prefetch: Pages kept in flight (defaults to PAGE_PREFETCH)
+            ordered: Set False to fetch all pages in parallel in completion order
+            
+        Returns:
+            PageIterator; iterate it for users, or call .pages() for Page objects
+        """
+        return PageIterator(
+            self.api_client,
+            self.endpoint,
+            page_size=page_size or PAGE_SIZE,
+            prefetch=PAGE_PREFETCH if prefetch is None else prefetch,
+            ordered=ordered,
+        )
+    
+    def get_users_with_posts(self, user_ids: Iterable[int],
+                             include_comments: bool = True) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get users with their posts (and each post's comments) in batched requests
+        
+        One multi-id query per level replaces one request per user and post.
+        
+        Args:
+            user_ids: IDs of the users to retrieve
+            include_comments: Also attach comments to every post
+            
+        Returns:
+            User dicts with a 'posts' list, in the same order as user_ids;
+            None for users that do not exist
+        """
+        return RelationLoader(self.api_client).users_with_posts(user_ids, include_comments)
+    
     def create_user(self, user_data: Dict[str, Any]) -> requests.Response:
         """
         Create a new user
@@ -67,6 +148,38 @@ class UsersService:
         endpoint = f"{self.endpoint}/{user_id}"
         return self.api_client.put(endpoint, user_data)
     
+    def create_users_bulk(self, users: Iterable[Dict[str, Any]], window: int = BULK_WINDOW,
+                          stop_on_error: bool = False) -> BulkRun:
+        """
+        Create many users with a bounded number of requests in flight
+        
+        Args:
+            users: User payloads, read lazily (a generator is never materialized)
+            window: Maximum requests in flight
+            stop_on_error: Stop reading input after the first failed item
+            
+        Returns:
+            BulkRun; iterate it for per-item BatchResults, or call .run()
+            for a BulkReport with counts and throughput
+        """
+        return BulkRun(self.create_user, users, window, stop_on_error)
+    
+    def update_users_bulk(self, updates: Iterable[Tuple[int, Dict[str, Any]]], window: int = BULK_WINDOW,
+                          stop_on_error: bool = False) -> BulkRun:
+        """
+        Update many users with a bounded number of requests in flight
+        
+        Args:
+            updates: (user_id, user_data) pairs, read lazily
+            window: Maximum requests in flight
+            stop_on_error: Stop reading input after the first failed item
+            
+        Returns:
+            BulkRun; iterate it for per-item BatchResults, or call .run()
+            for a BulkReport with counts and throughput
+        """
+        return bulk_update(self.update_user, updates, window, stop_on_error)
+    
     def delete_user(self, user_id: int) -> requests.Response:
         """
         Delete a user
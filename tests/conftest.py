@@ -1,20 +1,269 @@
 """
 Pytest configuration and fixtures
 """
+import json
+import os
 import pytest
+import pytest_asyncio
+from config.settings import (
+    BASE_URL,
+    USE_LOCAL_API,
+    CASSETTE_MODE,
+    CASSETTE_PATH,
+    HTTP_CACHE_ENABLED,
+    HTTP_CACHE_PATH,
+    RUN_LOAD_TESTS,
+    LOAD_MAX_WORKERS,
+    PERF_BASELINE_PATH,
+    PERF_SAMPLES,
+    PERF_WARMUP,
+    SNAPSHOT_PATH,
+    TEST_HISTORY_PATH,
+    IMPACT_PATH,
+    RATE_LIMIT_PATH,
+    PROFILE_DIR
+)
 from utils.helpers import APIClient
-from services import PostsService, UsersService
+from utils.async_client import AsyncAPIClient
+from utils.local_server import LocalAPIServer
+from utils.faults import build_profile
+from utils.cassette import Cassette, MODES as CASSETTE_MODES
+from utils.http_cache import HTTPCache
+from utils.resilience import Resilience, RetryPolicy
+from utils.prefetch import load_or_fetch
+from utils.rate_limiter import RateLimiter
+from utils.perf_baseline import BaselineStore, baseline_key, compare, sample_latency
+from utils.snapshots import diff as snapshot_diff, snapshot_entry, structure_hash
+from utils.loadgen import SCENARIOS, load_client, service_operations, run_closed_loop, run_open_loop
+from services import (
+    PostsService,
+    UsersService,
+    AsyncPostsService,
+    AsyncUsersService
+)
+from tests.plugins import (
+    DurationPlugin,
+    TimingPlugin,
+    ResiliencePlugin,
+    PerfBaselinePlugin,
+    SnapshotPlugin,
+    ProfilingPlugin,
+    ImpactPlugin
+)
+
+
+def pytest_addoption(parser):
+    """Register command line options for selecting the API target"""
+    parser.addoption(
+        "--local-api",
+        action="store_true",
+        default=USE_LOCAL_API,
+        help="Run against the in-process JSONPlaceholder stand-in (or set API_LOCAL=1)"
+    )
+    parser.addoption(
+        "--cassette-mode",
+        choices=CASSETTE_MODES,
+        default=CASSETTE_MODE,
+        help="Record API traffic to a cassette or replay it without the network"
+    )
+    parser.addoption(
+        "--cassette-path",
+        default=CASSETTE_PATH,
+        help="Cassette file used by --cassette-mode"
+    )
+    parser.addoption(
+        "--http-cache",
+        action="store_true",
+        default=HTTP_CACHE_ENABLED,
+        help="Cache GET responses with ETag revalidation (or set API_HTTP_CACHE=1)"
+    )
+    parser.addoption(
+        "--http-cache-path",
+        default=HTTP_CACHE_PATH,
+        help="SQLite file to share the response cache across xdist workers"
+    )
+    parser.addoption(
+        "--load",
+        action="store_true",
+        default=RUN_LOAD_TESTS,
+        help="Run tests marked @pytest.mark.load (or set API_LOAD=1)"
+    )
+    parser.addoption(
+        "--perf-baseline-path",
+        default=PERF_BASELINE_PATH,
+        help="JSON file holding latency baselines for performance tests"
+    )
+    parser.addoption(
+        "--update-perf-baseline",
+        action="store_true",
+        default=False,
+        help="Store this run's performance samples as the new baselines"
+    )
+    parser.addoption(
+        "--snapshot-path",
+        default=SNAPSHOT_PATH,
+        help="JSON file holding the response snapshots checked by the snapshot fixture"
+    )
+    parser.addoption(
+        "--update-snapshots",
+        action="store_true",
+        default=False,
+        help="Record this run's responses as the new snapshots"
+    )
+    parser.addoption(
+        "--snapshot-strict",
+        action="store_true",
+        default=False,
+        help="Fail tests whose responses have no stored snapshot (for CI)"
+    )
+    parser.addoption(
+        "--lpt-schedule",
+        action="store_true",
+        default=False,
+        help="With -n, balance workers by recorded test durations and group tests by endpoint"
+    )
+    parser.addoption(
+        "--test-history-path",
+        default=TEST_HISTORY_PATH,
+        help="JSON file of per-test durations and endpoints used by --lpt-schedule"
+    )
+    parser.addoption(
+        "--impact",
+        action="store_true",
+        default=False,
+        help="Run only tests whose code or endpoint responses changed since they last passed"
+    )
+    parser.addoption(
+        "--impact-path",
+        default=IMPACT_PATH,
+        help="JSON file of per-test module digests and endpoint fingerprints used by --impact"
+    )
+    parser.addoption(
+        "--profile-api",
+        action="store_true",
+        default=False,
+        help="Sample each test's stacks and memory, split into network/decode/validation time"
+    )
+    parser.addoption(
+        "--profile-dir",
+        default=PROFILE_DIR,
+        help="Directory for the per-test collapsed-stack files written by --profile-api"
+    )
+
+
+def pytest_configure(config):
+    """Register the plugins that keep run data and report it (see tests/plugins)"""
+    config.pluginmanager.register(DurationPlugin(config), DurationPlugin.name)
+    config.pluginmanager.register(TimingPlugin(), TimingPlugin.name)
+    config.pluginmanager.register(ResiliencePlugin(), ResiliencePlugin.name)
+    config.pluginmanager.register(PerfBaselinePlugin(config), PerfBaselinePlugin.name)
+    config.pluginmanager.register(SnapshotPlugin(config), SnapshotPlugin.name)
+    if config.getoption("--profile-api"):
+        config.pluginmanager.register(ProfilingPlugin(config), ProfilingPlugin.name)
+    if config.getoption("--impact"):
+        config.pluginmanager.register(ImpactPlugin(config), ImpactPlugin.name)
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip load tests unless --load is given"""
+    if not config.getoption("--load"):
+        skip_load = pytest.mark.skip(reason="load test, run with --load")
+        for item in items:
+            if item.get_closest_marker("load") is not None:
+                item.add_marker(skip_load)
+
+
+def _add_run_hooks(config, client):
+    """Let the duration history (and --impact) see the client's requests"""
+    client.add_timing_hook(config.pluginmanager.get_plugin(DurationPlugin.name).note_endpoint)
+    impact = config.pluginmanager.get_plugin(ImpactPlugin.name)
+    if impact is not None:
+        client.add_response_hook(impact.recorder)
+
+
+@pytest.fixture(scope="session")
+def base_url(request):
+    """
+    Fixture to provide the API base URL for the run
+    
+    Starts the local stand-in server in a background thread when
+    --local-api (or API_LOCAL=1) is given, otherwise uses BASE_URL.
+    Replay always starts it: the cassette serves the shared clients,
+    and tests that build their own client only need a reachable server.
+    
+    Yields:
+        Base URL string
+    """
+    replaying = request.config.getoption("--cassette-mode") == "replay"
+    if not replaying and not request.config.getoption("--local-api"):
+        yield BASE_URL
+        return
+    with LocalAPIServer() as server:
+        yield server.base_url
+
+
+@pytest.fixture(scope="session")
+def cassette(request):
+    """
+    Fixture to provide the record/replay cassette selected by --cassette-mode
+    
+    Yields:
+        Cassette instance, or None when cassettes are off
+    """
+    mode = request.config.getoption("--cassette-mode")
+    if mode == "off":
+        yield None
+        return
+    tape = Cassette(request.config.getoption("--cassette-path"), mode)
+    yield tape
+    tape.close()
+
+
+def _run_dir(tmp_path_factory):
+    """Temp dir shared by every process of the run (the xdist base temp)"""
+    root = tmp_path_factory.getbasetemp()
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        # Workers get basetemp/popen-gwN; the parent is shared by the run
+        root = root.parent
+    return root
 
 
 @pytest.fixture(scope="session")
-def api_client():
+def api_client(request, base_url, cassette, tmp_path_factory):
     """
     Fixture to provide API client instance for all tests
     
-    Returns:
+    The client keeps one pooled keep-alive session for the whole run and
+    closes it when the session ends. Under xdist the rate limiter state is
+    shared by all workers unless API_RATE_LIMIT_PATH points elsewhere; with
+    no rate limits configured the file only carries Retry-After pauses and
+    costs a stat per request.
+    
+    Yields:
         APIClient instance
     """
-    return APIClient()
+    cache = None
+    if request.config.getoption("--http-cache"):
+        cache = HTTPCache(persist_path=request.config.getoption("--http-cache-path"))
+    rate_limiter = None
+    if RATE_LIMIT_PATH is None and os.environ.get("PYTEST_XDIST_WORKER"):
+        rate_limiter = RateLimiter.from_settings(str(_run_dir(tmp_path_factory) / "rate_limits.json"))
+    client = APIClient(base_url, cassette=cassette, cache=cache, rate_limiter=rate_limiter)
+    _add_run_hooks(request.config, client)
+    yield client
+    client.close()
+
+
+@pytest.fixture(autouse=True)
+def _bypass_cache_for_performance_tests(request):
+    """Performance and load tests always measure the origin, never the response cache"""
+    node = request.node
+    if node.get_closest_marker("performance") is None and node.get_closest_marker("load") is None:
+        yield
+        return
+    # Resolved only here, so unit tests never build the session client
+    with request.getfixturevalue("api_client").bypass_cache():
+        yield
 
 
 @pytest.fixture(scope="session")
@@ -45,6 +294,238 @@ def users_service(api_client):
     return UsersService(api_client)
 
 
+@pytest.fixture(scope="session")
+def prefetched_data(tmp_path_factory, posts_service, users_service):
+    """
+    Fixture to fetch reference datasets once per run, shared by xdist workers
+    
+    The first worker fetches all posts and users and writes a snapshot next
+    to the run's base temp dir under a file lock; the others read it.
+    
+    Returns:
+        Dataset name -> JSON text
+    """
+    root = _run_dir(tmp_path_factory)
+    
+    def fetch(call):
+        response = call()
+        response.raise_for_status()
+        return response.json()
+    
+    return load_or_fetch(str(root / "api_prefetch.json"), {
+        "posts": lambda: fetch(posts_service.get_all_posts),
+        "users": lambda: fetch(users_service.get_all_users),
+    })
+
+
+@pytest.fixture
+def all_posts(prefetched_data):
+    """
+    Fixture to provide the run's snapshot of all posts (a private copy per test)
+    
+    Returns:
+        List of post dictionaries
+    """
+    return json.loads(prefetched_data["posts"])
+
+
+@pytest.fixture
+def all_users(prefetched_data):
+    """
+    Fixture to provide the run's snapshot of all users (a private copy per test)
+    
+    Returns:
+        List of user dictionaries
+    """
+    return json.loads(prefetched_data["users"])
+
+
+@pytest.fixture
+def perf_baseline(request):
+    """
+    Fixture to sample an operation's latency and gate it against the baseline
+    
+    perf_baseline(func) runs func PERF_WARMUP times untimed, then PERF_SAMPLES
+    times timed, and fails the test only if the samples are a statistically
+    significant regression from the stored baseline. Baselines are kept per
+    target (API host, local stand-in or cassette replay), so one measured
+    elsewhere is never compared. Without a baseline (or with
+    --update-perf-baseline) the samples are only recorded.
+    
+    Returns:
+        Callable taking (func, samples=PERF_SAMPLES, warmup=PERF_WARMUP) and
+        returning the latencies in seconds
+    """
+    config = request.config
+    plugin = config.pluginmanager.get_plugin(PerfBaselinePlugin.name)
+    key = baseline_key(request.node.nodeid, plugin.target())
+    
+    def check(func, samples=PERF_SAMPLES, warmup=PERF_WARMUP):
+        latencies = sample_latency(func, samples, warmup)
+        plugin.samples[key] = latencies
+        baseline = BaselineStore(config.getoption("--perf-baseline-path")).get(key)
+        if baseline is None or config.getoption("--update-perf-baseline"):
+            return latencies
+        comparison = compare(latencies, baseline)
+        request.node.user_properties.append(("perf_comparison", comparison.describe()))
+        if comparison.regressed:
+            pytest.fail(f"Significant slowdown against the stored baseline: {comparison.describe()}")
+        return latencies
+    
+    return check
+
+
+@pytest.fixture
+def snapshot(request):
+    """
+    Fixture to check a response against the structural snapshot stored for the test
+    
+    snapshot(response) hashes the keys and value types of the body (values too
+    with values=True) and compares the hash with the stored one; the full
+    structural diff is only computed when they differ. Responses without a
+    snapshot pass and are listed in the terminal summary, or fail with
+    --snapshot-strict. With --update-snapshots the responses are recorded
+    instead of checked.
+    
+    Returns:
+        Callable taking (response_or_data, values=False, name=None); name
+        tells several snapshots of one test apart
+    """
+    config = request.config
+    nodeid = request.node.nodeid
+    plugin = config.pluginmanager.get_plugin(SnapshotPlugin.name)
+    store = plugin.store
+    calls = []
+    
+    def check(response, values=False, name=None):
+        data = response.json() if hasattr(response, "json") else response
+        key = f"{nodeid}::{name}" if name else (f"{nodeid}#{len(calls)}" if calls else nodeid)
+        calls.append(key)
+        if config.getoption("--update-snapshots"):
+            plugin.recorded[key] = snapshot_entry(data, values)
+            return
+        entry = store.get(key)
+        if entry is None:
+            if config.getoption("--snapshot-strict"):
+                pytest.fail(f"No snapshot {key} in {store.path} (record it with --update-snapshots)")
+            plugin.recorded[key] = None
+            return
+        if entry["hash"] == structure_hash(data, values):
+            return
+        lines = snapshot_diff(entry, data)
+        pytest.fail(f"Response no longer matches snapshot {key} "
+                    f"(rerun with --update-snapshots if intended):\n" + "\n".join(lines))
+    
+    return check
+
+
+@pytest.fixture
+def load_report(request, base_url, cassette):
+    """
+    Fixture to run the load profile described by the test's load marker
+    
+    @pytest.mark.load(scenario="read_heavy", mode="closed", users=10, duration=5)
+    runs closed-loop virtual users; mode="constant" uses rate=, and
+    mode="ramp" moves from rate= to end_rate=. The run uses its own client
+    without retries or request coalescing, so every failure counts.
+    
+    Returns:
+        LoadReport for the finished run
+    """
+    marker = request.node.get_closest_marker("load")
+    options = dict(marker.kwargs) if marker else {}
+    mode = options.get("mode", "closed")
+    duration = options.get("duration", 5.0)
+    weights = SCENARIOS[options.get("scenario", "read_heavy")]
+    concurrency = options.get("users", 10) if mode == "closed" else LOAD_MAX_WORKERS
+    with load_client(base_url, concurrency, cassette=cassette) as client:
+        _add_run_hooks(request.config, client)
+        operations = service_operations(PostsService(client), UsersService(client))
+        if mode == "closed":
+            return run_closed_loop(operations, weights, options.get("users", 10), duration)
+        end_rate = options.get("end_rate") if mode == "ramp" else None
+        return run_open_loop(operations, weights, options.get("rate", 50.0), duration, end_rate=end_rate)
+
+
+@pytest.fixture
+def fast_retries():
+    """
+    Fixture to build resilience layers with millisecond backoff
+    
+    Returns:
+        Callable taking Resilience keyword arguments (e.g. hedge=True) and
+        returning a Resilience whose retries back off 10 ms instead of 100 ms
+    """
+    def build(**kwargs):
+        return Resilience(retry=RetryPolicy(backoff_base=0.01), **kwargs)
+    
+    return build
+
+
+@pytest.fixture
+def fault_server(request):
+    """
+    Fixture to provide a local stand-in server that misbehaves on purpose
+    
+    The test's faults marker selects the profile, e.g.
+    @pytest.mark.faults("flaky_gateway") or
+    @pytest.mark.faults(route="/posts/{id}", latency=fixed(0.2)).
+    The server always runs locally, so fault tests are deterministic offline.
+    
+    Yields:
+        Started LocalAPIServer
+    """
+    marker = request.node.get_closest_marker("faults")
+    profile = build_profile(*marker.args, **marker.kwargs) if marker else None
+    with LocalAPIServer(faults=profile) as server:
+        yield server
+
+
+@pytest_asyncio.fixture
+async def async_api_client(base_url, cassette):
+    """
+    Fixture to provide an asyncio API client bound to the test's event loop
+    
+    Args:
+        base_url: Base URL fixture
+        cassette: Cassette fixture (shared with the synchronous client)
+        
+    Yields:
+        AsyncAPIClient instance
+    """
+    client = AsyncAPIClient(base_url, cassette=cassette)
+    yield client
+    await client.close()
+
+
+@pytest.fixture
+def async_posts_service(async_api_client):
+    """
+    Fixture to provide Async Posts Service instance
+    
+    Args:
+        async_api_client: AsyncAPIClient fixture
+        
+    Returns:
+        AsyncPostsService instance
+    """
+    return AsyncPostsService(async_api_client)
+
+
+@pytest.fixture
+def async_users_service(async_api_client):
+    """
+    Fixture to provide Async Users Service instance
+    
+    Args:
+        async_api_client: AsyncAPIClient fixture
+        
+    Returns:
+        AsyncUsersService instance
+    """
+    return AsyncUsersService(async_api_client)
+
+
 @pytest.fixture(scope="function")
 def sample_post_data():
     """
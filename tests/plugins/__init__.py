@@ -0,0 +1,13 @@
+"""
+Pytest plugins for run bookkeeping and reports, registered by conftest.py
+"""
+from .durations import DurationPlugin
+from .timing import TimingPlugin
+from .resilience import ResiliencePlugin
+from .perf import PerfBaselinePlugin
+from .snapshots import SnapshotPlugin
+from .profiling import ProfilingPlugin
+from .impact import ImpactPlugin
+
+__all__ = ['DurationPlugin', 'TimingPlugin', 'ResiliencePlugin', 'PerfBaselinePlugin', 'SnapshotPlugin',
+           'ProfilingPlugin', 'ImpactPlugin']
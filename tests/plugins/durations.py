@@ -0,0 +1,64 @@
+"""
+Per-test durations and endpoints for --lpt-schedule
+
+Every process notes the endpoint each test hits most and attaches it to the
+test's reports; the xdist controller sums the phase durations and folds
+them into the history that DurationAffinityScheduling plans runs from.
+"""
+from collections import Counter
+import pytest
+from utils.scheduling import DurationAffinityScheduling, DurationHistory
+from utils.timing import endpoint_template
+
+
+class DurationPlugin:
+    """Records test durations and main endpoints, and schedules xdist runs by them"""
+    
+    name = "api_durations"
+    
+    def __init__(self, config):
+        self.config = config
+        self.controller = not hasattr(config, "workerinput")
+        # Node ID -> [summed phase durations, main endpoint] (controller only)
+        self.durations = {}
+        # Endpoint templates hit by the running test (filled by an APIClient timing hook)
+        self.endpoints = Counter()
+    
+    def note_endpoint(self, method, endpoint, timings):
+        """APIClient timing hook counting the endpoints of the running test"""
+        self.endpoints[endpoint_template(endpoint)] += 1
+    
+    def pytest_runtest_setup(self, item):
+        self.endpoints.clear()
+    
+    def pytest_runtest_teardown(self, item):
+        """Attach the test's main endpoint to its reports for the duration history"""
+        if self.endpoints:
+            item.user_properties.append(("api_endpoint", self.endpoints.most_common(1)[0][0]))
+    
+    def pytest_runtest_logreport(self, report):
+        """Sum setup/call/teardown time per test, including reports from xdist workers"""
+        if not self.controller:
+            return
+        entry = self.durations.setdefault(report.nodeid, [0.0, None])
+        entry[0] += report.duration
+        for name, value in report.user_properties:
+            if name == "api_endpoint":
+                entry[1] = value
+    
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        """Use the duration/endpoint-aware scheduler with --lpt-schedule"""
+        if not config.getoption("--lpt-schedule"):
+            return None
+        history = DurationHistory(config.getoption("--test-history-path"))
+        return DurationAffinityScheduling(config, log, history)
+    
+    def pytest_sessionfinish(self, session):
+        """Fold this run's durations into the history file"""
+        if not self.controller or not self.durations:
+            return
+        history = DurationHistory(self.config.getoption("--test-history-path"))
+        for nodeid, (duration, endpoint) in self.durations.items():
+            history.update(nodeid, duration, endpoint)
+        history.save()
@@ -0,0 +1,164 @@
+"""
+Change-based test selection for --impact
+
+At session start the controller fingerprints every endpoint recorded in the
+impact file and hands the fingerprints to the xdist workers. Tests whose
+files and endpoint responses are unchanged since they last passed are
+deselected; the dependencies of tests that pass are shipped back to the
+controller and stored for the next run.
+"""
+import os
+from contextlib import contextmanager
+import pytest
+from config.settings import BASE_URL
+from utils.helpers import APIClient
+from utils.local_server import LocalAPIServer
+from utils.cassette import Cassette
+from utils.impact import EndpointRecorder, ImpactStore, ImportGraph, function_files, probe
+
+GREEN = pytest.StashKey[bool]()
+MODULES = pytest.StashKey[dict]()
+
+
+@contextmanager
+def _probe_client(config):
+    """APIClient aimed at the same API (or cassette) the run will use"""
+    if config.getoption("--cassette-mode") == "replay":
+        with APIClient(BASE_URL, cassette=Cassette(config.getoption("--cassette-path"), "replay")) as client:
+            yield client
+    elif config.getoption("--local-api"):
+        with LocalAPIServer() as server, APIClient(server.base_url) as client:
+            yield client
+    else:
+        with APIClient(BASE_URL) as client:
+            yield client
+
+
+def _fixture_data_files(config, fixtures):
+    """Data files whose contents decide the outcome of the given fixtures"""
+    options = {"snapshot": "--snapshot-path", "perf_baseline": "--perf-baseline-path"}
+    if config.getoption("--cassette-mode") == "replay":
+        options["cassette"] = "--cassette-path"
+    paths = (config.getoption(option) for name, option in options.items() if name in fixtures)
+    return {path for path in paths if os.path.isfile(path)}
+
+
+def _item_modules(item, graph):
+    """Digests of the test module's import closure, the fixtures it uses and their data files"""
+    deep = {graph.relative(str(item.path))}
+    shallow = set()
+    fixtureinfo = getattr(item, "_fixtureinfo", None)
+    fixtures = fixtureinfo.name2fixturedefs if fixtureinfo else {}
+    for fixturedefs in fixtures.values():
+        for fixturedef in fixturedefs:
+            own, referenced = function_files(graph, fixturedef.func)
+            shallow |= own
+            deep |= referenced
+    for path in _fixture_data_files(item.config, fixtures):
+        shallow.add(graph.relative(path) or os.path.abspath(path))
+    deep.discard(None)
+    return graph.digests(deep, shallow)
+
+
+class ImpactPlugin:
+    """Selects impacted tests and records the dependencies of passing ones"""
+    
+    name = "api_impact"
+    
+    def __init__(self, config):
+        self.config = config
+        # GET fingerprints of the running test or fixture (an APIClient response hook)
+        self.recorder = EndpointRecorder()
+        # Endpoint key -> response fingerprint at session start
+        self.fingerprints = {}
+        # Dependencies of tests that passed, or None for tests to forget
+        self.results = {}
+        # Fixture name -> GET fingerprints captured while it was set up
+        self.fixtures = {}
+    
+    def pytest_sessionstart(self, session):
+        """Fingerprint every recorded endpoint once (xdist workers get the result)"""
+        workerinput = getattr(self.config, "workerinput", None)
+        if workerinput is not None:
+            self.fingerprints = workerinput["impact_fingerprints"]
+            return
+        keys = ImpactStore(self.config.getoption("--impact-path")).endpoint_keys()
+        with _probe_client(self.config) as client:
+            self.fingerprints = probe(client, keys)
+    
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node):
+        """Hand the probed endpoint fingerprints to each xdist worker"""
+        node.workerinput["impact_fingerprints"] = self.fingerprints
+    
+    def pytest_collection_modifyitems(self, config, items):
+        """Deselect tests whose files and endpoint responses are unchanged since they last passed"""
+        store = ImpactStore(config.getoption("--impact-path"))
+        graph = ImportGraph(str(config.rootpath))
+        selected, deselected = [], []
+        for item in items:
+            modules = _item_modules(item, graph)
+            item.stash[MODULES] = modules
+            if store.reason(item.nodeid, modules, self.fingerprints) is None:
+                deselected.append(item)
+            else:
+                selected.append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+    
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        """
+        Attribute requests made while a fixture is set up to that fixture
+        
+        A plugin sees session fixtures too, whose setup hooks do not go
+        through directory-level conftest files.
+        """
+        with self.recorder.capture() as captured:
+            yield
+        self.fixtures.setdefault(fixturedef.argname, {}).update(captured)
+    
+    def pytest_runtest_setup(self, item):
+        self.recorder.reset()
+    
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        """Remember the dependencies of tests that pass all phases"""
+        outcome = yield
+        report = outcome.get_result()
+        green = item.stash.get(GREEN, True) and not (report.failed or report.skipped)
+        item.stash[GREEN] = green
+        if report.when != "teardown":
+            return
+        if green and MODULES in item.stash:
+            self.results[item.nodeid] = {
+                "modules": item.stash[MODULES],
+                "endpoints": dict(self.recorder.current),
+                "fixtures": list(item.fixturenames),
+            }
+        else:
+            self.results[item.nodeid] = None
+    
+    def pytest_sessionfinish(self, session):
+        workeroutput = getattr(self.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput["impact"] = self.results
+            workeroutput["impact_fixtures"] = self.fixtures
+            return
+        store = ImpactStore(self.config.getoption("--impact-path"))
+        for nodeid, entry in self.results.items():
+            if entry is None:
+                store.forget(nodeid)
+            else:
+                store.record(nodeid, **entry)
+        for name, endpoints in self.fixtures.items():
+            store.fixtures.setdefault(name, {}).update(endpoints)
+        store.save()
+    
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        workeroutput = getattr(node, "workeroutput", {})
+        self.results.update(workeroutput.get("impact", {}))
+        for name, endpoints in workeroutput.get("impact_fixtures", {}).items():
+            self.fixtures.setdefault(name, {}).update(endpoints)
@@ -0,0 +1,45 @@
+"""
+Latency samples taken by the perf_baseline fixture
+
+Samples are kept per baseline key; xdist workers ship theirs to the
+controller, which stores them as the new baselines with
+--update-perf-baseline.
+"""
+from urllib.parse import urlsplit
+import pytest
+from config.settings import BASE_URL
+from utils.perf_baseline import BaselineStore
+
+
+class PerfBaselinePlugin:
+    """Collects performance samples and writes them as baselines on request"""
+    
+    name = "api_perf_baseline"
+    
+    def __init__(self, config):
+        self.config = config
+        # Baseline key -> latencies in seconds
+        self.samples = {}
+    
+    def target(self):
+        """What performance samples are measured against: the API host, the local stand-in or a cassette"""
+        if self.config.getoption("--cassette-mode") == "replay":
+            return "cassette"
+        if self.config.getoption("--local-api"):
+            return "local"
+        return urlsplit(BASE_URL).netloc
+    
+    def pytest_sessionfinish(self, session):
+        workeroutput = getattr(self.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput["perf_samples"] = self.samples
+            return
+        if self.config.getoption("--update-perf-baseline") and self.samples:
+            store = BaselineStore(self.config.getoption("--perf-baseline-path"))
+            for key, samples in self.samples.items():
+                store.set(key, samples)
+            store.save()
+    
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        self.samples.update(getattr(node, "workeroutput", {}).get("perf_samples", {}))
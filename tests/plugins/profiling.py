@@ -0,0 +1,111 @@
+"""
+Per-test stack and memory profiles for --profile-api
+
+Each test body is sampled and its collapsed stacks written to
+--profile-dir; xdist workers ship the per-test summaries to the controller,
+which reports the slowest tests and hottest functions.
+"""
+import html
+import os
+import re
+import tracemalloc
+from collections import Counter
+import pytest
+from config.settings import PROFILE_TOP
+from utils.profiling import PHASES, SamplingProfiler
+
+
+def _profile_html(profiles):
+    """Tables of the slowest profiled tests and the hottest functions"""
+    slowest = sorted(profiles.items(), key=lambda entry: -entry[1]["duration"])[:PROFILE_TOP]
+    header = "".join(f"<th>{name}</th>" for name in (
+        "Test", "Duration (s)", *(f"{phase.capitalize()} (s)" for phase in PHASES),
+        "Peak memory (KiB)", *(f"{phase.capitalize()} peak (KiB)" for phase in PHASES[:3]),
+    ))
+    body = "".join(
+        "<tr>"
+        f"<td>{html.escape(nodeid)}</td><td>{entry['duration']:.3f}</td>"
+        + "".join(f"<td>{entry['phase_time'][phase]:.3f}</td>" for phase in PHASES)
+        + f"<td>{entry['peak_memory'] / 1024:.0f}</td>"
+        + "".join(f"<td>{entry['phase_peak'][phase] / 1024:.0f}</td>" for phase in PHASES[:3])
+        + "</tr>"
+        for nodeid, entry in slowest
+    )
+    functions = Counter()
+    for entry in profiles.values():
+        functions.update(entry["functions"])
+    hottest = "".join(
+        f"<tr><td>{html.escape(name)}</td><td>{seconds:.3f}</td></tr>"
+        for name, seconds in functions.most_common(PROFILE_TOP)
+    )
+    return (
+        "<h2>API profile</h2>"
+        "<p>Sampled thread-seconds per phase and peak traced memory for the slowest tests; "
+        "collapsed stacks per test are in the --profile-dir directory.</p>"
+        f"<table><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table>"
+        "<h3>Hottest functions (self time, all tests)</h3>"
+        f"<table><thead><tr><th>Function</th><th>Seconds</th></tr></thead><tbody>{hottest}</tbody></table>"
+    )
+
+
+class ProfilingPlugin:
+    """Profiles each test body and reports where the run's time went"""
+    
+    name = "api_profiling"
+    
+    def __init__(self, config):
+        self.config = config
+        # Node ID -> profile summary
+        self.profiles = {}
+    
+    def pytest_configure(self, config):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    
+    def pytest_unconfigure(self, config):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+    
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        """Sample the test body and write its collapsed stacks"""
+        function = getattr(item, "function", None)
+        profiler = SamplingProfiler(root=getattr(function, "__code__", None)).start()
+        try:
+            yield
+        finally:
+            profile = profiler.stop()
+            directory = self.config.getoption("--profile-dir")
+            os.makedirs(directory, exist_ok=True)
+            filename = re.sub(r"[^\w.-]+", "_", item.nodeid).strip("_") + ".folded"
+            with open(os.path.join(directory, filename), "w", encoding="utf-8") as handle:
+                handle.write(profile.folded())
+            self.profiles[item.nodeid] = profile.summary()
+    
+    def pytest_sessionfinish(self, session):
+        workeroutput = getattr(self.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput["api_profiles"] = self.profiles
+    
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        self.profiles.update(getattr(node, "workeroutput", {}).get("api_profiles", {}))
+    
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        if self.profiles:
+            postfix.append(_profile_html(self.profiles))
+    
+    def pytest_terminal_summary(self, terminalreporter):
+        """Report thread-seconds per phase over all profiled tests"""
+        if not self.profiles:
+            return
+        totals = Counter()
+        for entry in self.profiles.values():
+            totals.update(entry["phase_time"])
+        terminalreporter.write_sep("-", "API profile")
+        terminalreporter.write_line(
+            f"{len(self.profiles)} tests profiled, thread-seconds: "
+            + ", ".join(f"{phase}={totals[phase]:.2f}" for phase in PHASES)
+            + f"; stacks in {self.config.getoption('--profile-dir')}"
+        )
@@ -0,0 +1,39 @@
+"""
+Retry, hedge and circuit breaker counters for the console and HTML report
+
+Counters are kept in utils.resilience.totals by every process; xdist
+workers ship theirs to the controller, which reports the total.
+"""
+import pytest
+from utils.resilience import totals
+
+
+class ResiliencePlugin:
+    """Merges worker resilience counters and reports them"""
+    
+    name = "api_resilience"
+    
+    def pytest_sessionfinish(self, session):
+        workeroutput = getattr(session.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput["api_resilience"] = totals.snapshot()
+    
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        totals.merge(getattr(node, "workeroutput", {}).get("api_resilience", {}))
+    
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        counts = totals.snapshot()
+        prefix.append(
+            "<p>API resilience: "
+            + ", ".join(f"{name.replace('_', ' ')}: {round(count, 2)}" for name, count in counts.items())
+            + "</p>"
+        )
+    
+    def pytest_terminal_summary(self, terminalreporter):
+        """Make retries, hedges and circuit breaker trips visible in the console"""
+        counts = totals.snapshot()
+        if any(counts.values()):
+            terminalreporter.write_sep("-", "API resilience")
+            terminalreporter.write_line(", ".join(f"{name}={round(count, 2)}" for name, count in counts.items()))
@@ -0,0 +1,55 @@
+"""
+Response snapshots checked by the snapshot fixture
+
+The store is loaded once per process. Snapshots recorded with
+--update-snapshots, and keys that have none yet, are shipped from xdist
+workers to the controller, which writes or lists them.
+"""
+import pytest
+from utils.snapshots import SnapshotStore
+
+
+class SnapshotPlugin:
+    """Holds the snapshot store and collects new or missing snapshots"""
+    
+    name = "api_snapshots"
+    
+    def __init__(self, config):
+        self.config = config
+        self._store = None
+        # Snapshots recorded for --update-snapshots, or None for keys that have none yet
+        self.recorded = {}
+    
+    @property
+    def store(self) -> SnapshotStore:
+        """Snapshots stored at --snapshot-path, loaded on first use"""
+        if self._store is None:
+            self._store = SnapshotStore(self.config.getoption("--snapshot-path"))
+        return self._store
+    
+    def pytest_sessionfinish(self, session):
+        workeroutput = getattr(self.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput["snapshots"] = self.recorded
+            return
+        if self.config.getoption("--update-snapshots") and self.recorded:
+            store = SnapshotStore(self.config.getoption("--snapshot-path"))
+            for key, entry in self.recorded.items():
+                store.set(key, entry)
+            store.save()
+    
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        self.recorded.update(getattr(node, "workeroutput", {}).get("snapshots", {}))
+    
+    def pytest_terminal_summary(self, terminalreporter):
+        """Report snapshots written, or responses that have none"""
+        if not self.recorded:
+            return
+        terminalreporter.write_sep("-", "API snapshots")
+        path = self.config.getoption("--snapshot-path")
+        if self.config.getoption("--update-snapshots"):
+            terminalreporter.write_line(f"{len(self.recorded)} snapshots written to {path}")
+        else:
+            terminalreporter.write_line(f"{len(self.recorded)} responses have no snapshot in {path} "
+                                        "(record them with --update-snapshots)")
@@ -0,0 +1,50 @@
+"""
+Per-endpoint request timings for the HTML report
+
+Requests are recorded in utils.timing.recorder by every process; xdist
+workers ship their recordings to the controller, which reports the total.
+"""
+import html
+import pytest
+from utils.timing import recorder
+
+
+class TimingPlugin:
+    """Merges worker request timings and adds the timing table to the HTML report"""
+    
+    name = "api_timing"
+    
+    def pytest_sessionfinish(self, session):
+        workeroutput = getattr(session.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput["api_timings"] = recorder.to_dict()
+    
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        recorder.merge_dict(getattr(node, "workeroutput", {}).get("api_timings", {}))
+    
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        """Add latency percentiles and phase times per endpoint"""
+        rows = recorder.summary()
+        if not rows:
+            return
+        header = "".join(f"<th>{name}</th>" for name in (
+            "Method", "Endpoint", "Requests", "Total (s)", "p50 (ms)", "p95 (ms)", "p99 (ms)",
+            "Max (ms)", "Queue (ms)", "Connect (ms)", "TTFB (ms)", "Download (ms)"
+        ))
+        body = "".join(
+            "<tr>"
+            f"<td>{row['method']}</td><td>{html.escape(row['endpoint'])}</td><td>{row['count']}</td>"
+            f"<td>{row['time']:.2f}</td>"
+            + "".join(f"<td>{row[key] * 1000:.1f}</td>" for key in (
+                "p50", "p95", "p99", "max", "queue", "connect", "ttfb", "download"))
+            + "</tr>"
+            for row in rows
+        )
+        postfix.append(
+            "<h2>API request timings</h2>"
+            "<p>Latency percentiles per endpoint and mean time per phase, "
+            "for requests that reached the network.</p>"
+            f"<table><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table>"
+        )
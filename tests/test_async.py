@@ -0,0 +1,177 @@
+"""
+Test cases for the asyncio client and async services
+"""
+import asyncio
+import pytest
+from utils.helpers import validate_post_schema, validate_user_schema
+from utils.async_client import AsyncAPIClient
+from utils.cassette import Cassette, CassetteMiss
+from utils.single_flight import AsyncSingleFlight
+from config.settings import ENDPOINTS, TOTAL_USERS
+
+
+class TestAsyncAPI:
+    """Test suite for concurrent requests from one event loop"""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.positive
+    async def test_async_get_single_post(self, async_posts_service):
+        """
+        Verify async retrieval of a single post by ID
+        
+        Validations:
+        - Status code is 200
+        - Response schema is valid
+        - Headers are looked up case-insensitively, like requests.Response
+        """
+        # Act
+        response = await async_posts_service.get_post_by_id(1)
+        
+        # Assert
+        assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+        assert validate_post_schema(response.json()), "Response schema validation failed"
+        assert 'application/json' in response.headers['content-type'], \
+            f"Expected a JSON content type, got {response.headers.get('Content-Type')}"
+        assert response.copy().headers['CONTENT-TYPE'] == response.headers['Content-Type'], \
+            "Copied responses should keep case-insensitive headers"
+    
+    @pytest.mark.asyncio
+    @pytest.mark.positive
+    async def test_async_get_users_concurrently(self, async_users_service):
+        """
+        Verify many users can be fetched concurrently on one event loop
+        
+        Validations:
+        - Every request returns 200
+        - Results come back in request order with valid schema
+        """
+        # Arrange
+        user_ids = list(range(1, TOTAL_USERS + 1))
+        
+        # Act
+        responses = await asyncio.gather(
+            *(async_users_service.get_user_by_id(user_id) for user_id in user_ids)
+        )
+        
+        # Assert
+        for user_id, response in zip(user_ids, responses):
+            assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+            user_data = response.json()
+            assert user_data['id'] == user_id, f"Expected user id {user_id}, got {user_data['id']}"
+            assert validate_user_schema(user_data), f"User {user_id} schema validation failed"
+    
+    @pytest.mark.asyncio
+    @pytest.mark.negative
+    async def test_async_get_post_not_found(self, async_posts_service):
+        """
+        Verify async handling of non-existent post
+        
+        Validations:
+        - Status code is 404
+        """
+        # Act
+        response = await async_posts_service.get_post_by_id(9999)
+        
+        # Assert
+        assert response.status_code == 404, f"Expected status code 404, got {response.status_code}"
+    
+    @pytest.mark.asyncio
+    @pytest.mark.positive
+    async def test_async_identical_gets_are_coalesced(self, async_api_client):
+        """
+        Verify identical GETs gathered on one event loop share one request
+        
+        Validations:
+        - Every caller gets a 200 and its own response object
+        - Four of the five GETs are counted as coalesced
+        """
+        # Act
+        responses = await asyncio.gather(
+            *(async_api_client.get(f"{ENDPOINTS['posts']}/1") for _ in range(5))
+        )
+        stats = async_api_client.get_coalescing_stats()
+        
+        # Assert
+        assert all(response.status_code == 200 for response in responses), "Expected status code 200"
+        assert len({id(response) for response in responses}) == 5, "Each caller should get its own response"
+        assert stats == {'sent': 1, 'coalesced': 4}, f"Unexpected coalescing stats {stats}"
+    
+    @pytest.mark.asyncio
+    @pytest.mark.positive
+    async def test_async_coalesced_call_survives_leader_cancellation(self):
+        """
+        Verify cancelling the task that started a coalesced call spares its waiters
+        
+        Validations:
+        - The waiter gets the result after the leader is cancelled
+        - The call ran once
+        - A call nobody waits for any more is dropped, so the next caller starts afresh
+        """
+        # Arrange
+        flight = AsyncSingleFlight()
+        release = asyncio.Event()
+        calls = []
+        
+        async def fetch():
+            calls.append('fetch')
+            await release.wait()
+            return {'id': 1}
+        
+        leader = asyncio.ensure_future(flight.do('post-1', fetch, copy=dict))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(flight.do('post-1', fetch, copy=dict))
+        await asyncio.sleep(0)
+        
+        # Act
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        result = await waiter
+        
+        # Assert
+        assert leader.cancelled(), "The leader should be cancelled"
+        assert result == {'id': 1}, f"Waiter should get the result, got {result}"
+        assert calls == ['fetch'], f"Expected one call, got {calls}"
+        
+        # Act: the only caller gives up, so the call is cancelled and forgotten
+        release.clear()
+        lone = asyncio.ensure_future(flight.do('post-2', fetch))
+        await asyncio.sleep(0)
+        lone.cancel()
+        await asyncio.gather(lone, return_exceptions=True)
+        release.set()
+        again = await flight.do('post-2', fetch)
+        
+        # Assert
+        assert again == {'id': 1}, f"A new caller should get a fresh result, got {again}"
+        assert flight.stats() == {'sent': 3, 'coalesced': 1}, f"Unexpected stats {flight.stats()}"
+    
+    @pytest.mark.asyncio
+    @pytest.mark.positive
+    async def test_async_cassette_record_and_replay(self, base_url, tmp_path):
+        """
+        Verify the async client records to and replays from a cassette
+        
+        Validations:
+        - Replayed status and body match the recording, without a network
+        - Unrecorded requests raise CassetteMiss instead of going live
+        """
+        # Arrange
+        path = str(tmp_path / "async.cassette")
+        recorder = Cassette(path, mode="record")
+        async with AsyncAPIClient(base_url, cassette=recorder) as client:
+            live = await client.get(ENDPOINTS['posts'], params={'userId': 2})
+        recorder.close()
+        
+        # Act
+        player = Cassette(path, mode="replay")
+        async with AsyncAPIClient("http://replay.invalid", cassette=player) as client:
+            replayed = await client.get(ENDPOINTS['posts'], params={'userId': 2})
+            
+            # Assert
+            assert replayed.status_code == live.status_code, "Replayed status code mismatch"
+            assert replayed.json() == live.json(), "Replayed body mismatch"
+            assert replayed.headers['content-type'] == live.headers['Content-Type'], "Replayed headers mismatch"
+            with pytest.raises(CassetteMiss):
+                await client.get(ENDPOINTS['posts'], params={'userId': 3})
+        player.close()
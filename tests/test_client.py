@@ -0,0 +1,383 @@
+"""
+Test cases for APIClient transport features
+"""
+import threading
+import time
+import pytest
+from utils.helpers import APIClient
+from utils.local_server import LocalAPIServer, LocalAPIState
+from utils.cassette import Cassette, CassetteMiss
+from utils.http_cache import HTTPCache
+from utils.timing import TimingRecorder
+from utils.json_codec import JSONCodec, STDLIB
+from utils.schema_registry import SchemaRegistry, SchemaValidationError, validate_stream
+from config.settings import ENDPOINTS
+from config.schemas import POST_SCHEMA
+
+
+class _SlowState(LocalAPIState):
+    """Stand-in API that counts requests and answers after a fixed delay"""
+    
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.calls = 0
+    
+    def handle(self, method, path, params, body):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return super().handle(method, path, params, body)
+
+
+class TestAPIClient:
+    """Test suite for APIClient connection handling and record/replay"""
+    
+    @pytest.mark.positive
+    def test_connections_are_reused(self, base_url):
+        """
+        Verify sequential requests reuse one pooled keep-alive connection
+        
+        Validations:
+        - Every request is counted
+        - Only one connection is opened for sequential requests
+        """
+        # Act
+        with APIClient(base_url) as client:
+            for post_id in range(1, 6):
+                client.get(f"{ENDPOINTS['posts']}/{post_id}")
+            stats = client.get_connection_stats()
+        
+        # Assert
+        assert stats['requests'] == 5, f"Expected 5 requests, got {stats['requests']}"
+        assert stats['opened'] == 1, f"Expected 1 connection opened, got {stats['opened']}"
+        assert stats['reused'] == 4, f"Expected 4 reused connections, got {stats['reused']}"
+    
+    @pytest.mark.positive
+    def test_cassette_record_and_replay(self, base_url, tmp_path):
+        """
+        Verify recorded interactions replay without touching the network
+        
+        Validations:
+        - Replayed status, headers and body match the recording
+        - Params are part of the match key
+        - Unrecorded requests raise CassetteMiss
+        """
+        # Arrange
+        path = str(tmp_path / "api.cassette")
+        recorder = Cassette(path, mode="record")
+        with APIClient(base_url, cassette=recorder) as client:
+            live = client.get(ENDPOINTS['posts'], params={'userId': 2})
+        recorder.close()
+        
+        # Act
+        player = Cassette(path, mode="replay")
+        with APIClient("http://replay.invalid", cassette=player) as client:
+            replayed = client.get(ENDPOINTS['posts'], params={'userId': 2})
+            
+            # Assert
+            assert replayed.status_code == live.status_code, "Replayed status code mismatch"
+            assert replayed.json() == live.json(), "Replayed body mismatch"
+            assert replayed.headers['Content-Type'] == live.headers['Content-Type'], "Replayed headers mismatch"
+            with pytest.raises(CassetteMiss):
+                client.get(ENDPOINTS['posts'], params={'userId': 3})
+        player.close()
+    
+    @pytest.mark.positive
+    def test_cassette_records_streams_and_merges_recorders(self, base_url, tmp_path):
+        """
+        Verify streamed GETs are recorded intact and recorders sharing a file merge
+        
+        Validations:
+        - iter_json yields every element while a cassette is recording
+        - The streamed body replays from the cassette
+        - A second recorder on the same file keeps the first one's interactions
+        """
+        # Arrange
+        path = str(tmp_path / "api.cassette")
+        first, second = Cassette(path, mode="record"), Cassette(path, mode="record")
+        with APIClient(base_url, cassette=first) as client:
+            streamed = list(client.iter_json(ENDPOINTS['posts']))
+        with APIClient(base_url, cassette=second) as client:
+            user = client.get(f"{ENDPOINTS['users']}/1")
+        
+        # Act
+        first.close()
+        second.close()
+        
+        # Assert
+        assert len(streamed) == 100, f"Expected 100 streamed posts, got {len(streamed)}"
+        player = Cassette(path, mode="replay")
+        assert len(player) == 2, f"Expected 2 recorded interactions, got {len(player)}"
+        with APIClient("http://replay.invalid", cassette=player) as client:
+            assert list(client.iter_json(ENDPOINTS['posts'])) == streamed, "Replayed stream mismatch"
+            assert client.get(f"{ENDPOINTS['users']}/1").json() == user.json(), "Replayed body mismatch"
+        player.close()
+    
+    @pytest.mark.positive
+    def test_http_cache_hits_and_bypass(self, base_url):
+        """
+        Verify repeated GETs are served from cache unless bypassed
+        
+        Validations:
+        - Second GET is a cache hit with the same body
+        - use_cache=False goes to the origin
+        """
+        # Arrange
+        with APIClient(base_url, cache=HTTPCache()) as client:
+            first = client.get(f"{ENDPOINTS['posts']}/1")
+            
+            # Act
+            second = client.get(f"{ENDPOINTS['posts']}/1")
+            client.get(f"{ENDPOINTS['posts']}/1", use_cache=False)
+            stats = client.get_cache_stats()
+            requests_sent = client.get_connection_stats()['requests']
+        
+        # Assert
+        assert second.json() == first.json(), "Cached body should match the original"
+        assert stats['hits'] == 1, f"Expected 1 cache hit, got {stats['hits']}"
+        assert stats['misses'] == 1, f"Expected 1 cache miss, got {stats['misses']}"
+        assert requests_sent == 2, f"Expected 2 origin requests, got {requests_sent}"
+    
+    @pytest.mark.positive
+    def test_http_cache_revalidates_with_etag(self, base_url):
+        """
+        Verify stale entries are revalidated with If-None-Match
+        
+        Validations:
+        - Stale entry with an ETag is revalidated (304) instead of refetched
+        - Revalidated response carries the cached body
+        """
+        # Arrange
+        with APIClient(base_url, cache=HTTPCache(ttl=0)) as client:
+            first = client.get(ENDPOINTS['users'])
+            
+            # Act
+            second = client.get(ENDPOINTS['users'])
+            stats = client.get_cache_stats()
+        
+        # Assert
+        assert 'ETag' in first.headers, "Origin should send an ETag"
+        assert second.status_code == 200, f"Expected status code 200, got {second.status_code}"
+        assert second.json() == first.json(), "Revalidated body should match the original"
+        assert stats['revalidations'] == 1, f"Expected 1 revalidation, got {stats['revalidations']}"
+    
+    @pytest.mark.negative
+    def test_stream_stops_at_first_invalid_element(self, api_client):
+        """
+        Verify streaming validation fails on the first bad element
+        
+        Validations:
+        - SchemaValidationError is raised for the first invalid element
+        - The error reports the element index and path
+        """
+        # Arrange: only posts of user 1 are "valid", so post 11 is the first failure
+        only_user_1 = SchemaRegistry({
+            'posts': {'type': 'object', 'properties': {'userId': {'enum': [1]}}}
+        })
+        seen = []
+        
+        # Act
+        with pytest.raises(SchemaValidationError) as error:
+            for post in validate_stream(api_client.iter_json(ENDPOINTS['posts']), 'posts', only_user_1):
+                seen.append(post['id'])
+        
+        # Assert
+        assert error.value.index == 10, f"Expected failure at index 10, got {error.value.index}"
+        assert error.value.violations[0].path == '$.userId', "Violation should point at userId"
+        assert seen == list(range(1, 11)), "Only the valid prefix should be yielded"
+    
+    @pytest.mark.negative
+    @pytest.mark.parametrize("data, path, message", [
+        ({'id': 'one', 'title': 't', 'body': 'b', 'userId': 1}, '$.id', 'expected integer, got str'),
+        ({'id': 1, 'body': 'b', 'userId': 1}, '$.title', 'missing required field'),
+        ({'id': 1, 'tags': [{'a{b}': 'x'}], 'state': 'gone'}, '$.state', 'not one of'),
+        ({'id': 1, 'tags': [{'a{b}': 1}], 'state': 'open'}, '$.tags[0].a{b}', 'expected string, got int'),
+    ], ids=["wrong-type", "missing-required", "bad-enum", "braces-in-key"])
+    def test_schema_violations_report_paths(self, data, path, message):
+        """
+        Verify each kind of violation is reported at the offending path
+        
+        Validations:
+        - Exactly one SchemaViolation is returned
+        - It points at the expected JSON path, braces in keys included
+        - Its message names the failed check
+        """
+        # Arrange
+        registry = SchemaRegistry({'posts': POST_SCHEMA, 'tagged': {
+            'type': 'object',
+            'required': ['id'],
+            'properties': {
+                'id': {'type': 'integer'},
+                'state': {'enum': ['open', 'closed']},
+                'tags': {'type': 'array', 'items': {'type': 'object', 'properties': {'a{b}': {'type': 'string'}}}},
+            },
+        }})
+        name = 'tagged' if 'tags' in data else 'posts'
+        
+        # Act
+        violations = registry.validate(name, data)
+        
+        # Assert
+        assert len(violations) == 1, f"Expected 1 violation, got {violations}"
+        assert violations[0].path == path, f"Expected path {path}, got {violations[0].path}"
+        assert message in violations[0].message, f"Expected '{message}' in {violations[0].message!r}"
+    
+    @pytest.mark.positive
+    def test_registry_reuses_compiled_validators(self):
+        """
+        Verify validators are compiled once per distinct schema
+        
+        Validations:
+        - Repeated lookups return the same function
+        - Names registered with identical schemas share one validator
+        - Re-registering a name compiles the new schema
+        """
+        # Arrange
+        registry = SchemaRegistry({'posts': POST_SCHEMA, 'articles': dict(POST_SCHEMA)})
+        
+        # Act
+        first = registry.validator('posts')
+        
+        # Assert
+        assert registry.validator('posts') is first, "Lookups should reuse the compiled validator"
+        assert registry.validator('articles') is first, "Identical schemas should share a validator"
+        registry.register('posts', {'type': 'object'})
+        assert registry.validator('posts') is not first, "A replaced schema should be recompiled"
+        assert registry.validator('articles') is first, "Other names should keep their validator"
+    
+    @pytest.mark.positive
+    def test_phase_timings_are_recorded(self, base_url):
+        """
+        Verify every network request is split into phases per endpoint template
+        
+        Validations:
+        - Requests to /posts/{id} share one histogram
+        - Only the first request pays for connecting
+        - Phases add up to no more than the total
+        - Histograms merge like an xdist worker snapshot
+        """
+        # Arrange
+        timings = TimingRecorder()
+        seen = []
+        
+        # Act
+        with APIClient(base_url, timings=timings) as client:
+            client.add_timing_hook(lambda method, endpoint, phases: seen.append(phases))
+            for post_id in range(1, 4):
+                client.get(f"{ENDPOINTS['posts']}/{post_id}")
+        merged = TimingRecorder()
+        merged.merge_dict(timings.to_dict())
+        merged.merge_dict(timings.to_dict())
+        
+        # Assert
+        total = timings.histogram('GET', '/posts/{id}')
+        assert total.count == 3, f"Expected 3 timed requests, got {total.count}"
+        assert seen[0].connect > 0, "First request should include connect time"
+        assert all(phases.connect == 0 for phases in seen[1:]), "Reused connections should not connect"
+        for phases in seen:
+            parts = phases.queue + phases.connect + phases.ttfb + phases.download
+            assert parts <= phases.total + 1e-6, f"Phases {phases} exceed the total"
+        assert merged.histogram('GET', '/posts/5').count == 6, "Merged histogram should hold both snapshots"
+    
+    @pytest.mark.positive
+    def test_concurrent_identical_gets_are_coalesced(self):
+        """
+        Verify identical in-flight GETs from several threads share one request
+        
+        Validations:
+        - The server sees a single request for 8 concurrent callers
+        - Seven GETs are counted as coalesced
+        - Every caller gets its own Response (mutating one leaves the others intact)
+        """
+        # Arrange
+        state = _SlowState(0.3)
+        barrier = threading.Barrier(8)
+        responses = []
+        
+        with LocalAPIServer(state=state) as server, APIClient(server.base_url) as client:
+            def fetch():
+                barrier.wait()
+                responses.append(client.get(f"{ENDPOINTS['posts']}/1"))
+            
+            # Act
+            threads = [threading.Thread(target=fetch) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            stats = client.get_coalescing_stats()
+        responses[0].headers['X-Mutated'] = '1'
+        responses[0].json()['title'] = 'changed'
+        
+        # Assert
+        assert state.calls == 1, f"Expected 1 request to the server, got {state.calls}"
+        assert stats == {'sent': 1, 'coalesced': 7}, f"Unexpected coalescing stats {stats}"
+        assert len({id(response) for response in responses}) == 8, "Each caller should get its own Response"
+        for response in responses[1:]:
+            assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+            assert 'X-Mutated' not in response.headers, "Headers should not be shared between callers"
+            assert response.json()['title'] != 'changed', "Bodies should decode independently"
+    
+    @pytest.mark.positive
+    def test_without_coalescing_only_affects_its_thread(self):
+        """
+        Verify without_coalescing() opts out the calling thread and nobody else
+        
+        Validations:
+        - A GET made inside the block is sent on its own
+        - Identical GETs from other threads at the same time are still coalesced
+        - Nesting the block restores the outer setting on exit
+        """
+        # Arrange
+        state = _SlowState(0.3)
+        barrier = threading.Barrier(4)
+        
+        with LocalAPIServer(state=state) as server, APIClient(server.base_url) as client:
+            def fetch():
+                barrier.wait()
+                client.get(f"{ENDPOINTS['posts']}/1")
+            
+            def fetch_alone():
+                with client.without_coalescing():
+                    with client.without_coalescing():
+                        pass
+                    fetch()
+            
+            # Act
+            threads = [threading.Thread(target=fetch) for _ in range(3)]
+            threads.append(threading.Thread(target=fetch_alone))
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            stats = client.get_coalescing_stats()
+        
+        # Assert
+        assert state.calls == 2, f"Expected 2 requests to the server, got {state.calls}"
+        assert stats == {'sent': 1, 'coalesced': 2}, f"Unexpected coalescing stats {stats}"
+    
+    @pytest.mark.positive
+    def test_response_json_is_decoded_once(self, base_url):
+        """
+        Verify response bodies are decoded lazily, at most once per response
+        
+        Validations:
+        - A response whose json() is never called is never decoded
+        - Repeated json() calls decode once and return the same object
+        """
+        # Arrange
+        decoded = []
+        codec = JSONCodec('counting', STDLIB.dumps, lambda data: decoded.append(data) or STDLIB.loads(data))
+        
+        # Act
+        with APIClient(base_url, json_codec=codec) as client:
+            client.get(f"{ENDPOINTS['users']}/1")
+            response = client.get(f"{ENDPOINTS['posts']}/1")
+            first, second = response.json(), response.json()
+        
+        # Assert
+        assert len(decoded) == 1, f"Expected 1 decode, got {len(decoded)}"
+        assert first is second, "Repeated json() calls should return the cached body"
+        assert first['id'] == 1, f"Expected post 1, got {first['id']}"
@@ -0,0 +1,162 @@
+"""
+Test cases for APIClient timeouts, retries and tail latency against injected faults
+"""
+import random
+import statistics
+import time
+import pytest
+import requests
+from utils.helpers import APIClient
+from utils.faults import FaultRule, exponential, fixed
+from utils.resilience import Resilience, RetryPolicy
+from config.settings import ENDPOINTS
+
+
+def _no_retries():
+    return Resilience(retry=RetryPolicy(max_attempts=1))
+
+
+class TestFaults:
+    """Test suite for client behavior against the fault-injecting stand-in API"""
+    
+    @pytest.mark.negative
+    @pytest.mark.faults(route="/posts/{id}", latency=fixed(0.5))
+    def test_slow_response_hits_read_timeout(self, fault_server):
+        """
+        Verify a response slower than the read timeout fails fast
+        
+        Validations:
+        - requests.Timeout is raised
+        - The call gives up well before the server answers
+        """
+        # Arrange
+        client = APIClient(fault_server.base_url, resilience=_no_retries())
+        client.timeout = (1.0, 0.1)
+        
+        # Act / Assert
+        start = time.perf_counter()
+        with client, pytest.raises(requests.Timeout):
+            client.get(f"{ENDPOINTS['posts']}/1")
+        elapsed = time.perf_counter() - start
+        assert elapsed < 0.4, f"Expected the timeout after ~0.1s, took {elapsed:.2f}s"
+    
+    @pytest.mark.positive
+    @pytest.mark.faults("flaky_gateway")
+    def test_gateway_burst_is_retried(self, fault_server, fast_retries):
+        """
+        Verify a burst of 503s is absorbed by retries
+        
+        Validations:
+        - The GET finally returns 200
+        - Both 503s of the burst are retried
+        """
+        # Act
+        with APIClient(fault_server.base_url, resilience=fast_retries()) as client:
+            response = client.get(f"{ENDPOINTS['posts']}/1")
+            stats = client.get_resilience_stats()
+        
+        # Assert
+        assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+        assert stats['retries'] == 2, f"Expected 2 retries, got {stats['retries']}"
+    
+    @pytest.mark.positive
+    @pytest.mark.faults("resets")
+    def test_connection_reset_is_retried(self, fault_server, fast_retries):
+        """
+        Verify a connection reset by the server is retried on a new connection
+        
+        Validations:
+        - The GET finally returns 200
+        - One retry is counted
+        """
+        # Act
+        with APIClient(fault_server.base_url, resilience=fast_retries()) as client:
+            response = client.get(f"{ENDPOINTS['posts']}/1")
+            stats = client.get_resilience_stats()
+        
+        # Assert
+        assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+        assert stats['retries'] == 1, f"Expected 1 retry, got {stats['retries']}"
+    
+    @pytest.mark.positive
+    @pytest.mark.faults(route="/photos", drip=(16384, 0.02))
+    def test_slow_drip_body_is_read_completely(self, fault_server):
+        """
+        Verify a body sent in slow slices arrives complete
+        
+        Validations:
+        - The response is 200 with every photo
+        - The transfer took at least as long as the drip
+        """
+        # Act
+        start = time.perf_counter()
+        with APIClient(fault_server.base_url, resilience=_no_retries()) as client:
+            response = client.get(ENDPOINTS['photos'])
+        elapsed = time.perf_counter() - start
+        
+        # Assert
+        assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+        assert len(response.json()) == 5000, f"Expected 5000 photos, got {len(response.json())}"
+        slices = -(-len(response.content) // 16384)
+        assert elapsed >= slices * 0.02, f"Expected at least {slices * 0.02:.2f}s, got {elapsed:.2f}s"
+    
+    @pytest.mark.negative
+    @pytest.mark.faults(FaultRule(route="/users/{id}", stall=2.0))
+    def test_stalled_body_hits_read_timeout(self, fault_server):
+        """
+        Verify a body that stops halfway trips the read timeout
+        
+        Validations:
+        - The read fails with a timeout instead of hanging for the stall
+        """
+        # Arrange
+        client = APIClient(fault_server.base_url, resilience=_no_retries())
+        client.timeout = (1.0, 0.2)
+        
+        # Act / Assert
+        start = time.perf_counter()
+        with client, pytest.raises((requests.Timeout, requests.ConnectionError)):
+            client.get(f"{ENDPOINTS['users']}/1")
+        elapsed = time.perf_counter() - start
+        assert elapsed < 1.5, f"Expected the timeout after ~0.2s, took {elapsed:.2f}s"
+    
+    @pytest.mark.performance
+    @pytest.mark.faults("tail_latency", seed=7)
+    def test_tail_latency_profile(self, fault_server):
+        """
+        Verify the tail latency profile slows a few requests and not the median
+        
+        Validations:
+        - The slowest request takes at least the injected 250 ms
+        - The median stays far below it
+        """
+        # Act
+        latencies = []
+        with APIClient(fault_server.base_url, resilience=_no_retries()) as client:
+            for _ in range(60):
+                start = time.perf_counter()
+                response = client.get(f"{ENDPOINTS['posts']}/1")
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+        
+        # Assert
+        assert max(latencies) >= 0.25, f"Expected a request of at least 0.25s, slowest was {max(latencies):.3f}s"
+        median = statistics.median(latencies)
+        assert median < 0.1, f"Expected a median under 0.1s, got {median:.3f}s"
+    
+    @pytest.mark.positive
+    def test_zero_mean_latency_is_no_delay(self):
+        """
+        Verify latency distributions with a zero mean inject no delay
+        
+        Validations:
+        - exponential(0) and fixed(0) sample 0 instead of raising
+        """
+        # Arrange
+        rng = random.Random(1)
+        
+        # Act
+        samples = [exponential(0).sample(rng), fixed(0).sample(rng)]
+        
+        # Assert
+        assert samples == [0.0, 0], f"Expected no delay, got {samples}"
@@ -0,0 +1,49 @@
+"""
+Load tests driven by utils.loadgen (skipped unless --load / API_LOAD=1)
+"""
+import pytest
+from config.settings import MAX_RESPONSE_TIME
+
+
+class TestLoad:
+    """Throughput and latency under sustained load"""
+    
+    @pytest.mark.load(scenario="read_heavy", mode="closed", users=10, duration=3)
+    def test_read_heavy_closed_loop(self, load_report):
+        """
+        TC-L01: Verify 10 virtual users can read posts and users without errors
+        
+        Validations:
+        - Every operation in the mix ran
+        - Error rate is 0
+        - p95 latency of each operation is under MAX_RESPONSE_TIME
+        """
+        # Act
+        operations = load_report.operations()
+        
+        # Assert
+        names = {item.name for item in operations}
+        assert names == {"get_post", "get_user", "get_posts_by_user"}, f"Unexpected operations {names}"
+        assert load_report.error_rate == 0, f"Expected no errors\n{load_report.format()}"
+        for item in operations:
+            assert item.p95 < MAX_RESPONSE_TIME, \
+                f"{item.name} p95 {item.p95:.3f}s exceeds {MAX_RESPONSE_TIME}s\n{load_report.format()}"
+    
+    @pytest.mark.load(scenario="mixed", mode="ramp", rate=20, end_rate=100, duration=3)
+    def test_mixed_ramp(self, load_report):
+        """
+        TC-L02: Verify a mixed read/write ramp from 20 to 100 requests/s
+        
+        Validations:
+        - Throughput reaches the mean of the ramp (about 60 requests/s)
+        - Error rate is 0
+        - p99 latency is under MAX_RESPONSE_TIME
+        """
+        # Act
+        operations = load_report.operations()
+        throughput = sum(item.throughput for item in operations)
+        
+        # Assert
+        assert throughput > 50, f"Expected about 60 requests/s, got {throughput:.1f}\n{load_report.format()}"
+        assert load_report.error_rate == 0, f"Expected no errors\n{load_report.format()}"
+        assert max(item.p99 for item in operations) < MAX_RESPONSE_TIME, load_report.format()
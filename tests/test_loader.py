@@ -0,0 +1,74 @@
+"""
+Test cases for DataLoader request batching
+"""
+import threading
+import pytest
+from services import DataLoader
+
+
+class TestDataLoader:
+    """Test suite for batching and deduplication of id lookups"""
+    
+    @pytest.mark.positive
+    def test_concurrent_loads_share_one_batch(self):
+        """
+        Verify loads from several threads within the window become one batch
+        
+        Validations:
+        - One batch call for all threads
+        - Repeated ids are sent once
+        - Every caller gets the value for its own id
+        """
+        # Arrange
+        calls = []
+        
+        def batch(keys):
+            calls.append(list(keys))
+            return {key: key * 10 for key in keys}
+        
+        loader = DataLoader(batch, window=0.05)
+        results = {}
+        
+        def worker(key):
+            results[threading.get_ident()] = (key, loader.load(key).result())
+        
+        # Act
+        threads = [threading.Thread(target=worker, args=(key,)) for key in (1, 2, 2, 3, 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Assert
+        assert len(calls) == 1, f"Expected one batch, got {calls}"
+        assert sorted(calls[0]) == [1, 2, 3], f"Expected unique ids [1, 2, 3], got {calls[0]}"
+        assert all(value == key * 10 for key, value in results.values()), f"Mismatched results {results}"
+    
+    @pytest.mark.negative
+    def test_failed_batch_is_not_cached(self):
+        """
+        Verify a failing batch raises for every caller and is retried later
+        
+        Validations:
+        - Each future in the failed batch raises the batch error
+        - A later load of the same id sends a new batch
+        """
+        # Arrange
+        attempts = []
+        
+        def batch(keys):
+            attempts.append(list(keys))
+            if len(attempts) == 1:
+                raise ConnectionError("boom")
+            return {key: key for key in keys}
+        
+        loader = DataLoader(batch, window=None)
+        
+        # Act
+        with pytest.raises(ConnectionError):
+            loader.load_many([1, 2])
+        retried = loader.load_many([1, 2])
+        
+        # Assert
+        assert retried == [1, 2], f"Expected [1, 2] after retry, got {retried}"
+        assert len(attempts) == 2, f"Expected 2 batch attempts, got {len(attempts)}"
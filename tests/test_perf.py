@@ -0,0 +1,79 @@
+"""
+Test cases for the performance tooling: baseline comparison and phase profiling
+"""
+import math
+import random
+import pytest
+from utils.helpers import APIClient, validate_post_schema
+from utils.json_codec import APIResponse
+from utils.profiling import SamplingProfiler, classify
+from utils.perf_baseline import compare, mann_whitney_greater
+from config.settings import ENDPOINTS
+
+
+class TestPerfTooling:
+    """Test suite for --perf-baseline comparisons and the --profile-api sampler"""
+    
+    @pytest.mark.positive
+    def test_perf_comparison_statistics(self):
+        """
+        Verify the baseline comparison flags real slowdowns only
+        
+        Validations:
+        - A sample shifted 50% slower is a significant regression
+        - An equal sample is not
+        - A zero baseline gives infinite ratios instead of ZeroDivisionError
+        """
+        # Arrange
+        rng = random.Random(1)
+        baseline = [0.010 + rng.uniform(0, 0.002) for _ in range(30)]
+        shifted = [value * 1.5 for value in baseline]
+        
+        # Act
+        slower = compare(shifted, baseline)
+        same = compare(list(baseline), baseline)
+        from_zero = compare(shifted, [0.0] * 30)
+        
+        # Assert
+        assert mann_whitney_greater(shifted, baseline) < 0.001, "Shifted sample should be significantly slower"
+        assert mann_whitney_greater(baseline, shifted) > 0.99, "Faster sample should not be significantly slower"
+        assert slower.regressed, f"Expected a regression: {slower.describe()}"
+        assert not same.regressed, f"Expected no regression: {same.describe()}"
+        assert same.median_ratio == 1.0 and same.p95_ratio == 1.0, f"Expected ratios of 1: {same.describe()}"
+        assert from_zero.median_ratio == math.inf and from_zero.p95_ratio == math.inf, \
+            f"Expected infinite ratios: {from_zero.describe()}"
+        assert compare([0.0] * 30, [0.0] * 30).p95_ratio == 1.0, "Zero against zero should not be a change"
+    
+    @pytest.mark.positive
+    def test_profiler_attributes_phases(self, base_url):
+        """
+        Verify the --profile-api sampler splits time into phases
+        
+        Validations:
+        - Stacks are classified by their innermost recognizable frame
+        - Requests made while sampling are charged to the network phase
+        - Collapsed stacks start at the profiled function
+        """
+        # Arrange
+        test_code = self.test_profiler_attributes_phases.__code__
+        
+        def workload():
+            with APIClient(base_url) as client:
+                for _ in range(20):
+                    client.get(ENDPOINTS['posts']).json()
+        
+        # Act
+        profiler = SamplingProfiler(root=workload.__code__).start()
+        workload()
+        profile = profiler.stop()
+        
+        # Assert
+        assert classify([APIResponse.json.__code__, test_code]) == 'decode', "json() should count as decode"
+        assert classify([validate_post_schema.__code__, test_code]) == 'validation', \
+            "validate_* helpers should count as validation"
+        assert classify([APIClient._send.__code__, test_code]) == 'network', "_send should count as network"
+        assert classify([test_code]) == 'other', "Test code should count as other"
+        assert profile.samples > 0 and profile.phase_time['network'] > 0, f"No network samples: {profile.summary()}"
+        main_stacks = [line for line in profile.folded().splitlines() if line.startswith('MainThread;')]
+        assert main_stacks and all(line.split(';')[1].endswith('workload') for line in main_stacks), \
+            "Main thread stacks should start at the profiled function"
@@ -0,0 +1,160 @@
+"""
+Test cases for the pytest plugins: xdist scheduling, snapshots and impact selection
+"""
+import pytest
+from utils.helpers import APIClient
+from utils.scheduling import DurationHistory, plan_schedule
+from utils.impact import EndpointRecorder, ImpactStore, ImportGraph
+from utils.snapshots import SnapshotStore, diff, snapshot_entry, structure_hash
+from config.settings import ENDPOINTS
+
+
+class TestPlugins:
+    """Test suite for the --lpt-schedule, snapshot and --impact plugin building blocks"""
+    
+    @pytest.mark.positive
+    def test_lpt_schedule_balances_known_durations(self):
+        """
+        Verify the xdist plan balances recorded durations and keeps endpoints together
+        
+        Validations:
+        - Every test is planned exactly once
+        - LPT splits a known duration set into equal loads
+        - Tests of one endpoint share a worker
+        - A group longer than a fair share is split
+        """
+        # Arrange
+        durations = {'a': 5.0, 'b': 4.0, 'c': 3.0, 'd': 3.0, 'e': 2.0, 'f': 2.0, 'g': 1.0}
+        nodeids = [f"tests/test_{name}.py::test_{name}" for name in durations]
+        costs = dict(zip(nodeids, durations.values()))
+        endpoints = {nodeid: f"GET /{nodeid[-1]}" for nodeid in nodeids}
+        same_endpoint = {nodeid: "GET /posts" for nodeid in nodeids[-2:]}
+        
+        # Act
+        plans = plan_schedule(nodeids, 2, costs, endpoints)
+        grouped = plan_schedule(nodeids, 2, costs, same_endpoint)
+        one_group = plan_schedule(nodeids, 2, costs, dict.fromkeys(nodeids, "GET /posts"))
+        
+        # Assert
+        assert sorted(sum(plans, [])) == list(range(7)), f"Every test should be planned once: {plans}"
+        loads = [sum(costs[nodeids[index]] for index in plan) for plan in plans]
+        assert loads == [10.0, 10.0], f"Expected balanced loads of 10s, got {loads}"
+        assert any({5, 6} <= set(plan) for plan in grouped), f"Same-endpoint tests should share a worker: {grouped}"
+        assert all(one_group), f"A group over the fair share should be split: {one_group}"
+    
+    @pytest.mark.positive
+    def test_duration_history_smoothing(self, tmp_path):
+        """
+        Verify recorded durations are smoothed and survive a save
+        
+        Validations:
+        - A new measurement is blended with the previous one
+        - A run without an endpoint keeps the known endpoint
+        - Saved entries load back unchanged
+        """
+        # Arrange
+        path = str(tmp_path / "history.json")
+        history = DurationHistory(path)
+        
+        # Act
+        history.update("t::a", 1.0, "GET /posts")
+        history.update("t::a", 3.0, None)
+        history.update("t::b", 0.5, None)
+        history.save()
+        reloaded = DurationHistory(path)
+        
+        # Assert
+        assert reloaded.durations() == {"t::a": 2.0, "t::b": 0.5}, f"Unexpected durations {reloaded.durations()}"
+        assert reloaded.endpoints() == {"t::a": "GET /posts"}, f"Unexpected endpoints {reloaded.endpoints()}"
+    
+    @pytest.mark.positive
+    def test_snapshot_hash_and_diff(self, api_client, tmp_path):
+        """
+        Verify structural snapshots ignore values and key order and explain mismatches
+        
+        Validations:
+        - Changed values keep the structural hash, unless values=True
+        - Key order does not change the hash
+        - A collection stores one item shape, not every item
+        - The diff names removed, added and retyped fields
+        - Snapshots round-trip through the store file
+        """
+        # Arrange
+        photos = api_client.get(ENDPOINTS['photos']).json()
+        posts = api_client.get(ENDPOINTS['posts']).json()
+        changed = [dict(post, title=post['title'] + '!') for post in posts]
+        reordered = [dict(reversed(list(post.items()))) for post in posts]
+        broken = [dict(post) for post in posts]
+        del broken[3]['body']
+        broken[5]['userId'] = str(broken[5]['userId'])
+        broken[7]['tags'] = []
+        
+        # Act
+        store = SnapshotStore(str(tmp_path / "snapshots.json"))
+        store.set('posts', snapshot_entry(posts))
+        store.set('posts-values', snapshot_entry(posts, values=True))
+        store.set('photos', snapshot_entry(photos))
+        store.save()
+        store = SnapshotStore(str(tmp_path / "snapshots.json"))
+        lines = diff(store.get('posts'), broken)
+        value_lines = diff(store.get('posts-values'), changed)
+        
+        # Assert
+        assert structure_hash(changed) == store.get('posts')['hash'], "Values should not change the hash"
+        assert structure_hash(reordered) == store.get('posts')['hash'], "Key order should not change the hash"
+        assert structure_hash(changed, values=True) != store.get('posts-values')['hash'], \
+            "values=True should hash the values"
+        assert len(store.get('photos')['shape']) == 1, "Photos should fold into one item shape"
+        assert structure_hash(broken) != store.get('posts')['hash'], "A structural change should change the hash"
+        assert any('$[*].body' in line and 'removed' in line for line in lines), f"Missing removal in {lines}"
+        assert any('$[*].tags' in line and 'added' in line for line in lines), f"Missing addition in {lines}"
+        assert any('userId' in line for line in lines), f"Missing type change in {lines}"
+        assert value_lines == [f"~ $: values changed in {len(posts)} items, first at [0], [1], [2], [3], [4]"], \
+            f"Unexpected value diff {value_lines}"
+    
+    @pytest.mark.positive
+    def test_impact_selection_inputs(self, base_url, request, tmp_path):
+        """
+        Verify the inputs of --impact selection: endpoint fingerprints, import closures and reasons
+        
+        Validations:
+        - The response hook fingerprints every GET by path and query, not writes
+        - A streamed GET is fingerprinted like a plain one, even when closed early
+        - The import closure follows project imports and ignores other modules
+        - A test is selected only when a file or an endpoint response changed
+        """
+        # Arrange
+        recorder = EndpointRecorder()
+        graph = ImportGraph(str(request.config.rootpath))
+        
+        # Act
+        with APIClient(base_url) as client:
+            client.add_response_hook(recorder)
+            client.get(f"{ENDPOINTS['posts']}/1")
+            client.get(ENDPOINTS['posts'], params={'userId': 1})
+            client.post(ENDPOINTS['posts'], {'title': 'x', 'body': 'y', 'userId': 1})
+            stream = client.iter_json(ENDPOINTS['users'])
+            next(stream)
+            stream.close()
+            streamed = recorder.current.pop('/users', None)
+            client.get(ENDPOINTS['users'])
+        closure = graph.closure({'tests/test_posts.py'})
+        modules = graph.digests({'tests/test_posts.py'})
+        store = ImpactStore(str(tmp_path / "impact.json"))
+        store.record('test_a', modules, recorder.current, [])
+        store.save()
+        store = ImpactStore(str(tmp_path / "impact.json"))
+        changed_file = dict(modules, **{'utils/helpers.py': 'edited'})
+        changed_response = dict(recorder.current, **{'/posts/1': 'edited'})
+        
+        # Assert
+        assert sorted(recorder.current) == ['/posts/1', '/posts?userId=1', '/users'], \
+            f"Unexpected recorded endpoints {sorted(recorder.current)}"
+        assert streamed == recorder.current['/users'], "Streamed GET should be fingerprinted like a plain GET"
+        assert {'utils/helpers.py', 'config/settings.py', 'utils/resilience.py'} <= closure, \
+            f"Import closure misses project modules: {sorted(closure)}"
+        assert 'utils/local_server.py' not in closure, "Modules nothing imports should not be included"
+        assert store.reason('test_a', modules, recorder.current) is None, "Unchanged test should be deselected"
+        assert store.reason('test_b', modules, recorder.current) == "no green run recorded"
+        assert store.reason('test_a', changed_file, recorder.current) == "code changed: utils/helpers.py"
+        assert store.reason('test_a', modules, changed_response) == "response changed: GET /posts/1"
@@ -0,0 +1,341 @@
+"""
+Test cases for APIClient retries, hedged requests, circuit breaking and rate limiting
+"""
+import socket
+import threading
+import time
+import pytest
+import requests
+from utils.helpers import APIClient
+from utils.local_server import LocalAPIServer, LocalAPIState
+from utils.resilience import CircuitBreaker, CircuitOpenError, Resilience, ResilienceStats, RetryPolicy
+from utils.rate_limiter import RateLimit, RateLimiter, parse_retry_after
+from utils.json_codec import JSONCodec, STDLIB
+from config.settings import ENDPOINTS, RETRY_AFTER_MAX
+
+
+class _ScriptedState(LocalAPIState):
+    """
+    Stand-in API that answers the first requests from a script
+    
+    Steps: an int answers with that status, a (status, headers) tuple adds
+    headers, a float delays the real answer by that many seconds.
+    """
+    
+    def __init__(self, script):
+        super().__init__()
+        self.script = list(script)
+        self.lock = threading.Lock()
+        self.calls = 0
+    
+    def handle(self, method, path, params, body):
+        with self.lock:
+            self.calls += 1
+            step = self.script.pop(0) if self.script else None
+        if isinstance(step, int):
+            return step, {}, {}
+        if isinstance(step, tuple):
+            status, headers = step
+            return status, {}, headers
+        if isinstance(step, float):
+            time.sleep(step)
+        return super().handle(method, path, params, body)
+
+
+@pytest.fixture
+def scripted_server(request):
+    """Local API server whose first answers follow the test's script"""
+    server = LocalAPIServer(state=_ScriptedState(request.param)).start()
+    yield server
+    server.stop()
+
+
+class TestResilience:
+    """Test suite for the APIClient resilience layer"""
+    
+    @pytest.mark.positive
+    @pytest.mark.parametrize("scripted_server", [[503, 502]], indirect=True)
+    def test_get_is_retried_on_gateway_errors(self, scripted_server, fast_retries):
+        """
+        Verify idempotent requests are retried with backoff until they succeed
+        
+        Validations:
+        - The GET finally returns 200
+        - Two retries are counted
+        """
+        # Act
+        with APIClient(scripted_server.base_url, resilience=fast_retries()) as client:
+            response = client.get(f"{ENDPOINTS['posts']}/1")
+            stats = client.get_resilience_stats()
+        
+        # Assert
+        assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+        assert stats['retries'] == 2, f"Expected 2 retries, got {stats['retries']}"
+    
+    @pytest.mark.positive
+    @pytest.mark.parametrize("scripted_server", [[503, 503]], indirect=True)
+    def test_request_body_is_encoded_once_across_retries(self, scripted_server, sample_post_data, fast_retries):
+        """
+        Verify a retried PUT resends the body encoded for the first attempt
+        
+        Validations:
+        - The PUT finally returns 200 after two retries
+        - The body was encoded once
+        """
+        # Arrange
+        encoded = []
+        codec = JSONCodec('counting', lambda obj: encoded.append(obj) or STDLIB.dumps(obj), STDLIB.loads)
+        
+        # Act
+        with APIClient(scripted_server.base_url, resilience=fast_retries(), json_codec=codec) as client:
+            response = client.put(f"{ENDPOINTS['posts']}/1", sample_post_data)
+            stats = client.get_resilience_stats()
+        
+        # Assert
+        assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+        assert stats['retries'] == 2, f"Expected 2 retries, got {stats['retries']}"
+        assert len(encoded) == 1, f"Expected the body to be encoded once, got {len(encoded)}"
+    
+    @pytest.mark.negative
+    @pytest.mark.parametrize("scripted_server", [[503]], indirect=True)
+    def test_post_is_never_retried(self, scripted_server, sample_post_data, fast_retries):
+        """
+        Verify non-idempotent requests are sent exactly once
+        
+        Validations:
+        - The 503 is returned to the caller
+        - The server saw one request and no retry is counted
+        """
+        # Act
+        with APIClient(scripted_server.base_url, resilience=fast_retries()) as client:
+            response = client.post(ENDPOINTS['posts'], sample_post_data)
+            stats = client.get_resilience_stats()
+        
+        # Assert
+        assert response.status_code == 503, f"Expected status code 503, got {response.status_code}"
+        assert scripted_server.state.calls == 1, f"Expected 1 request, got {scripted_server.state.calls}"
+        assert stats['retries'] == 0, f"Expected no retries, got {stats['retries']}"
+    
+    @pytest.mark.positive
+    @pytest.mark.parametrize("scripted_server", [[0.6]], indirect=True)
+    def test_slow_get_is_hedged(self, scripted_server, fast_retries):
+        """
+        Verify a backup GET is sent after the hedge delay and the faster one wins
+        
+        Validations:
+        - The response arrives well before the slow first answer
+        - One hedge is sent and it wins
+        """
+        # Arrange
+        with APIClient(scripted_server.base_url, resilience=fast_retries(hedge=True)) as client:
+            client._hedge_delay = lambda method, path: 0.05
+            
+            # Act
+            started = time.perf_counter()
+            response = client.get(f"{ENDPOINTS['posts']}/1")
+            elapsed = time.perf_counter() - started
+            stats = client.get_resilience_stats()
+        
+        # Assert
+        assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+        assert elapsed < 0.3, f"Hedged GET took {elapsed:.2f}s"
+        assert stats['hedges'] == 1 and stats['hedges_won'] == 1, f"Unexpected hedge counters {stats}"
+    
+    @pytest.mark.negative
+    def test_circuit_opens_for_dead_host(self):
+        """
+        Verify repeated connection failures open the circuit and later calls fail fast
+        
+        Validations:
+        - Connection errors surface after retries
+        - Once open, requests are rejected without connecting
+        """
+        # Arrange: a port nothing listens on
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        resilience = Resilience(retry=RetryPolicy(backoff_base=0.001), breaker=breaker)
+        
+        with APIClient(f"http://127.0.0.1:{port}", resilience=resilience) as client:
+            # Act
+            with pytest.raises(requests.ConnectionError):
+                client.get(ENDPOINTS['posts'])
+            started = time.perf_counter()
+            with pytest.raises(CircuitOpenError):
+                client.get(ENDPOINTS['posts'])
+            elapsed = time.perf_counter() - started
+            stats = client.get_resilience_stats()
+        
+        # Assert
+        assert breaker.state(f"127.0.0.1:{port}") == "open", "Circuit should be open"
+        assert elapsed < 0.05, f"Open circuit should fail fast, took {elapsed:.3f}s"
+        assert stats['circuit_opened'] == 1, f"Expected the circuit to open once, got {stats}"
+    
+    @pytest.mark.negative
+    @pytest.mark.parametrize("scripted_server", [[1.0, 1.0, 1.0]], indirect=True)
+    def test_read_timeout_is_not_retried(self, scripted_server, fast_retries):
+        """
+        Verify a hung GET fails after one read timeout instead of one per attempt
+        
+        Validations:
+        - requests.Timeout is raised
+        - The server saw a single request and no retry is counted
+        """
+        # Arrange
+        client = APIClient(scripted_server.base_url, resilience=fast_retries())
+        client.timeout = (1.0, 0.2)
+        
+        # Act
+        start = time.perf_counter()
+        with client, pytest.raises(requests.Timeout):
+            client.get(f"{ENDPOINTS['posts']}/1")
+        elapsed = time.perf_counter() - start
+        
+        # Assert
+        assert scripted_server.state.calls == 1, f"Expected 1 request, got {scripted_server.state.calls}"
+        assert client.get_resilience_stats()['retries'] == 0, "Read timeouts should not be retried"
+        assert elapsed < 0.6, f"Expected one read timeout of ~0.2s, took {elapsed:.2f}s"
+    
+    @pytest.mark.negative
+    def test_failed_probe_does_not_block_circuit(self):
+        """
+        Verify an unexpected error in the half-open probe frees the probe slot
+        
+        Validations:
+        - The error of the probe reaches the caller
+        - The next request is let through and closes the circuit
+        """
+        # Arrange: open the circuit, with the probe allowed right away
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        resilience = Resilience(retry=RetryPolicy(max_attempts=1), breaker=breaker)
+        ok = requests.Response()
+        ok.status_code = 200
+        
+        def refused():
+            raise requests.ConnectionError("refused")
+        
+        def broken():
+            raise ValueError("bad request")
+        
+        with pytest.raises(requests.ConnectionError):
+            resilience.call('GET', 'api.test', refused)
+        
+        # Act
+        with pytest.raises(ValueError):
+            resilience.call('GET', 'api.test', broken)
+        response = resilience.call('GET', 'api.test', lambda: ok)
+        
+        # Assert
+        assert response is ok, "The request after the failed probe should be sent"
+        assert breaker.state('api.test') == 'closed', "A successful probe should close the circuit"
+    
+    @pytest.mark.positive
+    def test_rate_limit_is_shared_through_state_file(self, tmp_path):
+        """
+        Verify limiters sharing a state file draw from one token bucket
+        
+        Validations:
+        - 20 requests from two limiters (as two workers would) at 50/s with
+          no burst take at least 19 refill intervals
+        - Throttled requests are counted
+        """
+        # Arrange
+        path = str(tmp_path / "rate_limits.json")
+        stats = [ResilienceStats(), ResilienceStats()]
+        limiters = [RateLimiter(RateLimit(50, 1), path=path, stats=counts) for counts in stats]
+        
+        def worker(limiter):
+            for _ in range(10):
+                limiter.acquire('api.test', '/posts/1')
+        
+        # Act
+        start = time.perf_counter()
+        threads = [threading.Thread(target=worker, args=(limiter,)) for limiter in limiters]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        
+        # Assert
+        assert elapsed >= 19 / 50 * 0.95, f"Expected at least 0.36s for 20 requests, took {elapsed:.2f}s"
+        throttled = sum(counts.snapshot()['throttled'] for counts in stats)
+        assert throttled > 0, "Expected throttled requests to be counted"
+    
+    @pytest.mark.positive
+    def test_rate_below_one_per_second_does_not_hang(self):
+        """
+        Verify budgets slower than one request per second still admit requests
+        
+        Validations:
+        - A burst below 1 is raised to one whole token
+        - The first request under a 0.5/s host and 0.25/s endpoint budget
+          goes through without waiting instead of blocking forever
+        """
+        # Arrange
+        limiter = RateLimiter(RateLimit(0.5, 0.5), {'/posts': RateLimit(0.25, 0)})
+        waits = []
+        thread = threading.Thread(target=lambda: waits.append(limiter.acquire('api.test', '/posts')), daemon=True)
+        
+        # Act
+        thread.start()
+        thread.join(timeout=2)
+        
+        # Assert
+        assert limiter.host_limit.burst == 1, f"Expected a burst of 1, got {limiter.host_limit.burst}"
+        assert limiter.endpoint_limits['/posts'].burst == 1, "Endpoint burst should be raised to 1"
+        assert not thread.is_alive(), "acquire() should not block forever under a sub-1/s rate"
+        assert waits == [0.0], f"Expected the first request to go through immediately, waited {waits}"
+    
+    @pytest.mark.positive
+    def test_retry_after_is_shared_and_clamped(self, tmp_path):
+        """
+        Verify a Retry-After pause reaches limiters without budgets and is bounded
+        
+        Validations:
+        - A block from one limiter pauses another one sharing the state file
+        - Once the pause is over, requests go through without waiting
+        - Retry-After values above RETRY_AFTER_MAX are clamped
+        """
+        # Arrange
+        path = str(tmp_path / "rate_limits.json")
+        blocker, waiter = RateLimiter(path=path), RateLimiter(path=path)
+        waiter.acquire('api.test', '/posts')
+        
+        # Act
+        blocker.block('api.test', 0.2)
+        paused = waiter.acquire('api.test', '/posts')
+        after = waiter.acquire('api.test', '/posts')
+        
+        # Assert
+        assert paused >= 0.15, f"Expected a pause of about 0.2s, waited {paused:.2f}s"
+        assert after == 0, f"Expected no wait after the pause, waited {after:.2f}s"
+        assert parse_retry_after('86400') == RETRY_AFTER_MAX, "Retry-After should be clamped"
+        assert parse_retry_after('2') == 2.0, "Short Retry-After values should be kept"
+    
+    @pytest.mark.positive
+    @pytest.mark.parametrize("scripted_server", [[(429, {'Retry-After': '1'})]], indirect=True)
+    def test_retry_after_is_honored(self, scripted_server, fast_retries):
+        """
+        Verify a 429 with Retry-After holds the retry back for that long
+        
+        Validations:
+        - The GET finally returns 200
+        - The retry waited for the Retry-After delay
+        - The 429 does not count as a circuit breaker failure
+        """
+        # Act
+        with APIClient(scripted_server.base_url, resilience=fast_retries()) as client:
+            start = time.perf_counter()
+            response = client.get(f"{ENDPOINTS['posts']}/1")
+            elapsed = time.perf_counter() - start
+            stats = client.get_resilience_stats()
+            state = client.resilience.breaker.state(f"{scripted_server.host}:{scripted_server.port}")
+        
+        # Assert
+        assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+        assert elapsed >= 0.95, f"Expected the retry to wait 1s, took {elapsed:.2f}s"
+        assert stats['retry_after'] == 1, f"Expected 1 Retry-After block, got {stats['retry_after']}"
+        assert stats['throttled'] == 1, f"Expected 1 throttled request, got {stats['throttled']}"
+        assert state == 'closed', f"Expected the circuit to stay closed, got {state}"
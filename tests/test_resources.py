@@ -0,0 +1,168 @@
+"""
+Test cases for filter, pagination and nested routes across ENDPOINTS resources
+"""
+import pytest
+from config.settings import ENDPOINTS
+from utils.schema_registry import registry
+from utils.bulk_validation import validate_collection
+
+
+class TestResourceRoutes:
+    """Test suite for routes shared by every JSONPlaceholder resource"""
+    
+    @pytest.mark.positive
+    @pytest.mark.parametrize("resource", sorted(ENDPOINTS))
+    def test_get_single_resource(self, api_client, resource):
+        """
+        Verify every resource in ENDPOINTS serves items by ID
+        
+        Validations:
+        - Status code is 200
+        - Returned object has the requested ID
+        - Response matches the registered schema for the resource
+        """
+        # Act
+        response = api_client.get(f"{ENDPOINTS[resource]}/1")
+        
+        # Assert
+        assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+        item = response.json()
+        assert item['id'] == 1, f"Expected {resource} id 1"
+        violations = registry.validate(resource, item)
+        assert not violations, f"{resource} schema violations: {violations}"
+    
+    @pytest.mark.positive
+    def test_nested_route_matches_filter(self, api_client):
+        """
+        Verify nested route /posts/{id}/comments matches ?postId={id}
+        
+        Validations:
+        - Both routes return 200
+        - Both routes return the same comments
+        """
+        # Act
+        nested = api_client.get(f"{ENDPOINTS['posts']}/1{ENDPOINTS['comments']}")
+        filtered = api_client.get(ENDPOINTS['comments'], params={'postId': 1})
+        
+        # Assert
+        assert nested.status_code == 200, f"Expected status code 200, got {nested.status_code}"
+        assert filtered.status_code == 200, f"Expected status code 200, got {filtered.status_code}"
+        assert nested.json() == filtered.json(), "Nested route and filter should agree"
+        assert all(comment['postId'] == 1 for comment in nested.json()), "Comments should belong to post 1"
+    
+    @pytest.mark.positive
+    def test_repeated_id_filter(self, api_client):
+        """
+        Verify repeated ?id= filters return every requested item
+        
+        Validations:
+        - Status code is 200
+        - Exactly the requested IDs are returned
+        """
+        # Act
+        response = api_client.get(ENDPOINTS['users'], params={'id': [1, 3, 5]})
+        
+        # Assert
+        assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+        assert sorted(user['id'] for user in response.json()) == [1, 3, 5], "Unexpected users returned"
+    
+    @pytest.mark.positive
+    def test_pagination_headers(self, api_client):
+        """
+        Verify _page/_limit pagination and its headers
+        
+        Validations:
+        - Status code is 200
+        - Page holds _limit items
+        - X-Total-Count reports the full collection size
+        """
+        # Act
+        response = api_client.get(ENDPOINTS['posts'], params={'_page': 2, '_limit': 10})
+        
+        # Assert
+        assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+        posts = response.json()
+        assert [post['id'] for post in posts] == list(range(11, 21)), "Page 2 should hold posts 11-20"
+        assert response.headers.get('X-Total-Count') == '100', "X-Total-Count should be 100"
+        assert 'rel="next"' in response.headers.get('Link', ''), "Link header should point to the next page"
+    
+    @pytest.mark.negative
+    def test_non_numeric_pagination_params(self, api_client):
+        """
+        Verify non-numeric _page/_limit values get a normal answer
+        
+        Validations:
+        - Status code is 200 (the connection is not dropped)
+        - Response is a list
+        """
+        # Act
+        response = api_client.get(ENDPOINTS['posts'], params={'_page': 'abc', '_limit': 'x'})
+        
+        # Assert
+        assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+        assert isinstance(response.json(), list), "Response should be a list"
+    
+    @pytest.mark.positive
+    @pytest.mark.parametrize("resource", sorted(ENDPOINTS))
+    def test_get_full_collection(self, api_client, resource):
+        """
+        Verify every row of every collection in one bulk validation pass
+        
+        Validations:
+        - Status code is 200
+        - Every row matches the resource schema
+        - IDs are unique across the collection
+        """
+        # Act
+        response = api_client.get(ENDPOINTS[resource])
+        
+        # Assert
+        assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+        rows = response.json()
+        assert isinstance(rows, list) and rows, "Response should be a non-empty list"
+        result = validate_collection(rows, resource, unique=('id',))
+        assert result.ok, f"{resource} rows {result.failed_indices[:10]} are invalid"
+    
+    @pytest.mark.negative
+    def test_bulk_validation_reports_failing_rows(self):
+        """
+        Verify bulk validation pinpoints every failing row
+        
+        Validations:
+        - Wrong types, missing required fields, broken invariants and
+          duplicates are reported at their row and path
+        - Rows without a unique field are not counted as duplicates
+        - Unhashable values work for equals and unique
+        - Valid rows are not reported
+        """
+        # Arrange
+        schema = {
+            'type': 'object',
+            'required': ['id', 'tags'],
+            'properties': {'id': {'type': 'integer'}, 'tags': {'type': 'array'}, 'ref': {'type': 'string'}},
+        }
+        rows = [
+            {'id': 1, 'tags': ['a']},
+            {'id': 'two', 'tags': ['a']},
+            {'id': 3},
+            {'id': 4, 'tags': ['b']},
+            {'id': 1, 'tags': ['a']},
+            {'id': 6, 'tags': ['a'], 'ref': 'x'},
+            {'id': 7, 'tags': ['a'], 'ref': 'x'},
+        ]
+        
+        # Act
+        result = validate_collection(rows, schema, equals={'tags': ['a']}, unique=('id', 'ref'))
+        by_list = validate_collection([{'tags': ['a']}, {}, {'tags': ['a']}, {}], {}, unique=('tags',))
+        
+        # Assert
+        assert not result.ok, "Invalid rows should fail the collection"
+        assert result.failed_indices == [1, 2, 3, 4, 6], f"Unexpected failing rows {result.failed_indices}"
+        messages = {index: [(v.path, v.message) for v in errors] for index, errors in result.errors.items()}
+        assert messages[1] == [('$[1].id', 'expected integer, got str')], f"Row 1: {messages[1]}"
+        assert messages[2] == [('$[2].tags', 'missing required field'), ('$[2].tags', 'missing field')], \
+            f"Row 2: {messages[2]}"
+        assert messages[3] == [('$[3].tags', "expected ['a'], got ['b']")], f"Row 3: {messages[3]}"
+        assert messages[4] == [('$[4].id', 'duplicate value 1 (first at index 0)')], f"Row 4: {messages[4]}"
+        assert messages[6] == [('$[6].ref', "duplicate value 'x' (first at index 5)")], f"Row 6: {messages[6]}"
+        assert by_list.failed_indices == [2], f"Expected only row 2 as a duplicate, got {by_list.failed_indices}"
@@ -3,6 +3,7 @@ Test cases for Users API endpoints
 """
 import pytest
 from utils.helpers import validate_user_schema
+from utils.bulk_validation import validate_collection
 from config.settings import TOTAL_USERS
 
 
@@ -11,23 +12,23 @@ class TestUsersAPI:
     
     @pytest.mark.positive
     @pytest.mark.parametrize("user_id", [1, 2, 3, 4, 5])
-    def test_get_user_details(self, users_service, user_id):
+    def test_get_user_details(self, all_users, user_id):
         """
-        TC-008: Verify retrieval of user information (parametrized test)
+        TC-008: Verify user information (parametrized test, read-only snapshot)
         
         Validations:
-        - Status code is 200
+        - User is present in the collection
         - Schema validation for user object
         - Nested object validation (address, geo, company)
         - Data type validation
         """
         # Act
-        response = users_service.get_user_by_id(user_id)
+        matches = [user for user in all_users if user['id'] == user_id]
         
         # Assert
-        assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+        assert len(matches) == 1, f"Expected exactly one user with id {user_id}, got {len(matches)}"
         
-        user_data = response.json()
+        user_data = matches[0]
         
         # Validate user schema
         assert validate_user_schema(user_data), f"User {user_id} schema validation failed"
@@ -55,7 +56,7 @@ class TestUsersAPI:
     
     @pytest.mark.positive
     @pytest.mark.smoke
-    def test_get_all_users(self, users_service):
+    def test_get_all_users(self, users_service, snapshot):
         """
         Verify retrieval of all users
         
@@ -64,6 +65,7 @@ class TestUsersAPI:
         - Response is a list
         - Response count matches expected total
         - All users have valid schema
+        - Response structure matches the stored snapshot
         """
         # Act
         response = users_service.get_all_users()
@@ -79,9 +81,12 @@ class TestUsersAPI:
         # Validate count
         assert len(users) == TOTAL_USERS, f"Expected {TOTAL_USERS} users, got {len(users)}"
         
-        # Validate all users have valid schema
-        for user in users:
-            assert validate_user_schema(user), f"User {user['id']} has invalid schema"
+        # Validate all users have valid schema and unique IDs in one pass
+        result = validate_collection(users, 'users', unique=('id',))
+        assert result.ok, f"Users at indices {result.failed_indices} are invalid: {result.errors}"
+        
+        # Validate the whole response contract
+        snapshot(response)
     
     @pytest.mark.negative
     def test_get_user_not_found(self, users_service):
@@ -101,3 +106,80 @@ class TestUsersAPI:
         # Assert
         assert response.status_code == 404, f"Expected status code 404, got {response.status_code}"
 
+    
+    @pytest.mark.positive
+    def test_get_users_by_ids_as_completed(self, users_service):
+        """
+        Verify streaming batch retrieval yields every requested user
+        
+        Validations:
+        - Each requested ID is yielded exactly once
+        - Every user returns 200 with valid schema
+        """
+        # Arrange
+        user_ids = list(range(1, TOTAL_USERS + 1))
+        
+        # Act
+        results = list(users_service.get_users_by_ids_as_completed(user_ids))
+        
+        # Assert
+        assert sorted(result.key for result in results) == user_ids, "Every user should be yielded once"
+        
+        for result in results:
+            assert result.ok, f"User {result.key} request failed: {result.error}"
+            assert result.response.status_code == 200, f"Expected status code 200, got {result.response.status_code}"
+            assert validate_user_schema(result.response.json()), f"User {result.key} has invalid schema"
+    
+    @pytest.mark.positive
+    def test_get_users_with_posts(self, users_service, all_posts):
+        """
+        Verify the user -> posts -> comments graph is loaded in batched requests
+        
+        Validations:
+        - Unknown users resolve to None, known users keep input order
+        - Each user carries exactly their posts, each post its comments
+        - The whole graph costs at most one request per level
+        """
+        # Arrange
+        user_ids = [2, 9999, 1, 2]
+        requests_before = users_service.api_client.get_connection_stats()['requests']
+        
+        # Act
+        users = users_service.get_users_with_posts(user_ids)
+        
+        # Assert
+        sent = users_service.api_client.get_connection_stats()['requests'] - requests_before
+        assert sent <= 3, f"Expected at most 3 requests for the graph, got {sent}"
+        assert users[1] is None, "Unknown user should resolve to None"
+        assert [user['id'] for user in (users[0], users[2], users[3])] == [2, 1, 2], "Users out of order"
+        
+        for user in (users[0], users[2]):
+            expected = [post['id'] for post in all_posts if post['userId'] == user['id']]
+            assert [post['id'] for post in user['posts']] == expected, f"Wrong posts for user {user['id']}"
+            for post in user['posts']:
+                assert post['comments'], f"Post {post['id']} should have comments"
+                assert all(comment['postId'] == post['id'] for comment in post['comments']), \
+                    f"Comments of post {post['id']} belong to another post"
+    
+    @pytest.mark.negative
+    def test_update_users_bulk_collects_all_errors(self, users_service, all_users):
+        """
+        Verify collect-all mode keeps going after failures and reports each one
+        
+        Validations:
+        - Every item is sent
+        - Both unknown ids are reported as failures, by input position
+        - Known users are updated (200)
+        """
+        # Arrange
+        user_ids = [1, 9999, 2, 9998, 3]
+        updates = ((user_id, dict(all_users[0], name=f"Bulk user {user_id}")) for user_id in user_ids)
+        
+        # Act
+        report = users_service.update_users_bulk(updates, window=2).run()
+        
+        # Assert
+        assert report.completed == len(user_ids), report.format()
+        assert report.succeeded == 3, report.format()
+        assert sorted(result.key for result in report.errors) == [1, 3], "Unknown ids should fail by position"
+        assert not report.stopped, "Collect-all mode should not stop"
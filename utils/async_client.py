@@ -0,0 +1,249 @@
+"""
+Asyncio API client for running many requests from one event loop
+
+Given a Cassette, the client records to it or replays from it exactly like
+APIClient (same key scheme), so one cassette serves both clients.
+"""
+import asyncio
+import time
+from datetime import timedelta
+from typing import Dict, Any, Mapping, Optional
+
+import aiohttp
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from config.settings import (
+    BASE_URL,
+    CONNECT_TIMEOUT,
+    READ_TIMEOUT,
+    POOL_MAXSIZE,
+    ASYNC_MAX_CONCURRENCY,
+    COALESCE_GETS
+)
+from utils.cassette import Cassette
+from utils.responses import build_response
+from utils.single_flight import AsyncSingleFlight, request_key
+from utils.json_codec import JSONCodec, codec as default_codec
+
+_UNDECODED = object()
+
+
+class AsyncResponse:
+    """Fully-read response with the parts of requests.Response tests rely on"""
+
+    def __init__(self, method: str, url: str, status_code: int,
+                 headers: Mapping[str, str], content: bytes, elapsed: timedelta,
+                 json_codec: JSONCodec = default_codec):
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        # Case-insensitive like requests.Response.headers
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.elapsed = elapsed
+        self.codec = json_codec
+        self._json = _UNDECODED
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8')
+
+    def json(self) -> Any:
+        """
+        Decode the response body (cached after the first call)
+
+        Returns:
+            Parsed JSON body
+        """
+        if self._json is _UNDECODED:
+            self._json = self.codec.loads(self.content)
+        return self._json
+
+    def copy(self) -> 'AsyncResponse':
+        """Independent copy (body bytes are shared, JSON is decoded again)"""
+        return AsyncResponse(self.method, self.url, self.status_code,
+                             self.headers, self.content, self.elapsed, self.codec)
+
+    def __repr__(self) -> str:
+        return f"<AsyncResponse [{self.status_code}]>"
+
+
+def _prepare(method: str, url: str, kwargs: Mapping[str, Any]) -> requests.PreparedRequest:
+    """The request as requests would send it, for cassette keys"""
+    return requests.Request(method, url, params=kwargs.get('params'), data=kwargs.get('data'),
+                            headers=kwargs.get('headers')).prepare()
+
+
+class AsyncAPIClient:
+    """
+    Asyncio counterpart of APIClient
+
+    A semaphore bounds how many requests are in flight at once, so callers can
+    gather hundreds of coroutines without flooding the server or the pool.
+    """
+
+    def __init__(self, base_url: str = BASE_URL,
+                 max_concurrency: int = ASYNC_MAX_CONCURRENCY,
+                 limit_per_host: int = POOL_MAXSIZE,
+                 coalesce: bool = COALESCE_GETS,
+                 json_codec: JSONCodec = default_codec,
+                 cassette: Optional[Cassette] = None):
+        """
+        Initialize Async API Client
+
+        Args:
+            base_url: Base URL prepended to every endpoint
+            max_concurrency: Maximum number of requests in flight at once
+            limit_per_host: Maximum open connections per host
+            coalesce: Share one request between identical concurrent GETs
+            json_codec: Encoder/decoder for JSON bodies (orjson when installed)
+            cassette: Optional Cassette to record traffic to or replay it from
+        """
+        self.base_url = base_url
+        self.json_codec = json_codec
+        self.cassette = cassette
+        self.timeout = aiohttp.ClientTimeout(sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT)
+        self.max_concurrency = max_concurrency
+        self.limit_per_host = limit_per_host
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.single_flight = AsyncSingleFlight() if coalesce else None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # The session binds to the running loop, so it is created on first use
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=self.limit_per_host,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+            )
+        return self._session
+
+    async def request(self, method: str, endpoint: str, **kwargs) -> AsyncResponse:
+        """
+        Make an HTTP request, waiting for a free concurrency slot first
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            **kwargs: Extra arguments passed to aiohttp (params, json, ...)
+
+        Returns:
+            AsyncResponse object
+        """
+        url = f"{self.base_url}{endpoint}"
+        if 'json' in kwargs:
+            kwargs['data'] = self.json_codec.dumps(kwargs.pop('json'))
+            kwargs['headers'] = {'Content-Type': 'application/json', **(kwargs.get('headers') or {})}
+        if self.cassette is not None and self.cassette.replaying:
+            replayed = self.cassette.replay(_prepare(method, url, kwargs))
+            return AsyncResponse(method, replayed.url, replayed.status_code, replayed.headers,
+                                 replayed.content, replayed.elapsed, self.json_codec)
+        async with self._semaphore:
+            session = self._get_session()
+            start = time.perf_counter()
+            async with session.request(method, url, **kwargs) as response:
+                content = await response.read()
+                result = AsyncResponse(
+                    method=method,
+                    url=str(response.url),
+                    status_code=response.status,
+                    headers=response.headers,
+                    content=content,
+                    elapsed=timedelta(seconds=time.perf_counter() - start),
+                    json_codec=self.json_codec,
+                )
+        if self.cassette is not None and self.cassette.recording:
+            self.cassette.record(build_response(_prepare(method, url, kwargs), result.status_code,
+                                                result.headers, result.content))
+        return result
+
+    async def get(self, endpoint: str, params: Optional[Dict] = None) -> AsyncResponse:
+        """
+        Make GET request
+
+        Concurrent GETs for the same URL and params share one request;
+        each caller still gets its own AsyncResponse object.
+
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+
+        Returns:
+            AsyncResponse object
+        """
+        if self.single_flight is None:
+            return await self.request('GET', endpoint, params=params)
+        return await self.single_flight.do(
+            request_key(f"{self.base_url}{endpoint}", params),
+            lambda: self.request('GET', endpoint, params=params),
+            copy=AsyncResponse.copy,
+        )
+
+    async def post(self, endpoint: str, data: Dict[str, Any]) -> AsyncResponse:
+        """
+        Make POST request
+
+        Args:
+            endpoint: API endpoint
+            data: Request body data
+
+        Returns:
+            AsyncResponse object
+        """
+        return await self.request('POST', endpoint, json=data)
+
+    async def put(self, endpoint: str, data: Dict[str, Any]) -> AsyncResponse:
+        """
+        Make PUT request
+
+        Args:
+            endpoint: API endpoint
+            data: Request body data
+
+        Returns:
+            AsyncResponse object
+        """
+        return await self.request('PUT', endpoint, json=data)
+
+    async def delete(self, endpoint: str) -> AsyncResponse:
+        """
+        Make DELETE request
+
+        Args:
+            endpoint: API endpoint
+
+        Returns:
+            AsyncResponse object
+        """
+        return await self.request('DELETE', endpoint)
+
+    def get_coalescing_stats(self) -> Dict[str, int]:
+        """
+        Get single-flight counters
+
+        Returns:
+            Dictionary with GETs sent and GETs coalesced into an in-flight
+            one (empty when coalescing is off)
+        """
+        return self.single_flight.stats() if self.single_flight is not None else {}
+
+    async def close(self) -> None:
+        """Close the underlying session and its connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> 'AsyncAPIClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
@@ -0,0 +1,220 @@
+"""
+Bulk (columnar) validation of collection responses
+
+Instead of validating a list row by row, each schema field is checked as a
+column: the types seen in the column are gathered in one C-level pass
+(itemgetter/map/set, no Python bytecode per row), and only when that set is
+wrong is the column scanned again to find the failing rows. A valid
+collection therefore costs one cheap pass per field and allocates little
+more than a few small sets.
+"""
+import json
+from itertools import repeat
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+from utils.schema_registry import SchemaViolation, Validator, compile_schema, registry
+
+
+class _Missing:
+    """Placeholder type for absent fields, distinct from every JSON type"""
+
+
+_MISSING = _Missing()
+
+_JSON_TYPES = {
+    'object': (dict,),
+    'array': (list,),
+    'string': (str,),
+    'integer': (int,),
+    'number': (int, float),
+    'boolean': (bool,),
+    'null': (type(None),),
+}
+
+# Keywords the columnar pass does not handle itself; fields using them fall
+# back to a compiled per-value validator
+_SCALAR_KEYWORDS = ('enum', 'minimum', 'minLength', 'items')
+
+# Compiled per-value validators keyed by the canonical JSON of their subschema
+_CHECKS: Dict[str, Validator] = {}
+
+
+class BulkValidationResult(NamedTuple):
+    """Outcome of validating a whole collection"""
+
+    total: int
+    errors: Dict[int, List[SchemaViolation]]
+
+    @property
+    def ok(self) -> bool:
+        """True if every row passed"""
+        return not self.errors
+
+    @property
+    def failed_indices(self) -> List[int]:
+        """Sorted indices of failing rows"""
+        return sorted(self.errors)
+
+
+def _fail(errors: Dict[int, List[SchemaViolation]], row: int, path: str, message: str) -> None:
+    errors.setdefault(row, []).append(SchemaViolation(path, message))
+
+
+def _allowed_types(schema: Mapping[str, Any]) -> Optional[Tuple[type, ...]]:
+    names = schema.get('type')
+    if names is None:
+        return None
+    if isinstance(names, str):
+        names = [names]
+    allowed: Tuple[type, ...] = ()
+    for name in names:
+        allowed += _JSON_TYPES[name]
+    return allowed
+
+
+def _check(schema: Mapping[str, Any]) -> Validator:
+    """Compiled validator for a field's subschema, compiled once per distinct schema"""
+    key = json.dumps(schema, sort_keys=True)
+    check = _CHECKS.get(key)
+    if check is None:
+        check = _CHECKS[key] = compile_schema(schema)
+    return check
+
+
+def _key(value: Any) -> Any:
+    """Hashable stand-in for a decoded JSON value: arrays and objects by canonical JSON"""
+    if isinstance(value, (list, dict)):
+        return (type(value).__name__, json.dumps(value, sort_keys=True, separators=(',', ':')))
+    return value
+
+
+def _value_set(values: List[Any]) -> set:
+    """Distinct values of a column, falling back to _key for unhashable ones"""
+    try:
+        return set(values)
+    except TypeError:
+        return set(map(_key, values))
+
+
+def _column_types(rows: Sequence[dict], field: str) -> Tuple[set, bool]:
+    """Collect the set of value types in a column and whether every row has the field"""
+    try:
+        return set(map(type, map(itemgetter(field), rows))), True
+    except KeyError:
+        count = len(rows)
+        types = set(map(type, map(dict.get, rows, repeat(field, count), repeat(_MISSING, count))))
+        types.discard(_Missing)
+        return types, False
+
+
+def _validate_columns(rows: Sequence[dict], positions: Sequence[int], schema: Mapping[str, Any],
+                      prefix: str, errors: Dict[int, List[SchemaViolation]]) -> None:
+    """Check every field of schema across rows (all already known to be dicts)"""
+    required = set(schema.get('required', ()))
+    properties = schema.get('properties', {})
+
+    for field in dict.fromkeys([*schema.get('required', ()), *properties]):
+        subschema = properties.get(field, {})
+        seen, complete = _column_types(rows, field)
+
+        if not complete and field in required:
+            for local, row in enumerate(rows):
+                if field not in row:
+                    _fail(errors, positions[local], f"$[{positions[local]}]{prefix}.{field}",
+                          'missing required field')
+
+        allowed = _allowed_types(subschema)
+        if allowed is not None and not seen.issubset(allowed):
+            expected = '/'.join(subschema['type']) if isinstance(subschema['type'], list) \
+                else subschema['type']
+            for local, row in enumerate(rows):
+                value = row.get(field, _MISSING)
+                if value is not _MISSING and type(value) not in allowed:
+                    _fail(errors, positions[local], f"$[{positions[local]}]{prefix}.{field}",
+                          f"expected {expected}, got {type(value).__name__}")
+
+        if 'properties' in subschema or 'required' in subschema:
+            nested_rows, nested_positions = [], []
+            for local, row in enumerate(rows):
+                value = row.get(field)
+                if type(value) is dict:
+                    nested_rows.append(value)
+                    nested_positions.append(positions[local])
+            if nested_rows:
+                _validate_columns(nested_rows, nested_positions, subschema, f"{prefix}.{field}", errors)
+
+        if any(keyword in subschema for keyword in _SCALAR_KEYWORDS):
+            check = _check(subschema)
+            for local, row in enumerate(rows):
+                value = row.get(field, _MISSING)
+                if value is _MISSING or (allowed is not None and type(value) not in allowed):
+                    continue
+                for violation in check(value):
+                    path = f"$[{positions[local]}]{prefix}.{field}{violation.path[1:]}"
+                    _fail(errors, positions[local], path, violation.message)
+
+
+def validate_collection(rows: Sequence[Any], schema: Union[str, Mapping[str, Any]],
+                        equals: Optional[Mapping[str, Any]] = None,
+                        unique: Iterable[str] = ()) -> BulkValidationResult:
+    """
+    Validate a whole collection against an item schema in one columnar pass
+
+    Args:
+        rows: Decoded JSON list
+        schema: Registered schema name (e.g. 'posts') or an item schema
+        equals: Invariants every row must satisfy, e.g. {'userId': 1}; a
+            row without the field fails
+        unique: Fields whose values must be unique across rows, e.g. ('id',);
+            rows without the field are skipped
+
+    Returns:
+        BulkValidationResult with per-row violations and failing indices
+    """
+    item_schema = registry.schema(schema) if isinstance(schema, str) else schema
+    errors: Dict[int, List[SchemaViolation]] = {}
+    count = len(rows)
+
+    dict_rows: Sequence[dict] = rows
+    positions: Sequence[int] = range(count)
+    if set(map(type, rows)) - {dict}:
+        dict_rows, kept = [], []
+        for index, row in enumerate(rows):
+            if type(row) is dict:
+                dict_rows.append(row)
+                kept.append(index)
+            else:
+                _fail(errors, index, f"$[{index}]", f"expected object, got {type(row).__name__}")
+        positions = kept
+
+    _validate_columns(dict_rows, positions, item_schema, '', errors)
+
+    size = len(dict_rows)
+    for field, expected in (equals or {}).items():
+        values = list(map(dict.get, dict_rows, repeat(field, size), repeat(_MISSING, size)))
+        if size and (_value_set(values) != {_key(expected)} or set(map(type, values)) != {type(expected)}):
+            for local, value in enumerate(values):
+                if value is _MISSING:
+                    _fail(errors, positions[local], f"$[{positions[local]}].{field}", 'missing field')
+                elif value != expected or type(value) is not type(expected):
+                    _fail(errors, positions[local], f"$[{positions[local]}].{field}",
+                          f"expected {expected!r}, got {value!r}")
+
+    for field in unique:
+        values = list(map(dict.get, dict_rows, repeat(field, size), repeat(_MISSING, size)))
+        distinct = _value_set(values)
+        distinct.discard(_MISSING)
+        if len(distinct) != size - values.count(_MISSING):
+            first_seen: Dict[Any, int] = {}
+            for local, value in enumerate(values):
+                if value is _MISSING:
+                    continue
+                key = _key(value)
+                if key in first_seen:
+                    _fail(errors, positions[local], f"$[{positions[local]}].{field}",
+                          f"duplicate value {value!r} (first at index {first_seen[key]})")
+                else:
+                    first_seen[key] = positions[local]
+
+    return BulkValidationResult(count, errors)
@@ -0,0 +1,250 @@
+"""
+Record/replay cassettes for APIClient
+
+A cassette is a single binary file with an open-addressing hash index, so it
+can be memory-mapped and looked up in O(1) without parsing the whole file:
+
+    header   magic(8) version(u32) slot_count(u32) record_count(u32)
+             reserved(u32) index_offset(u64)
+    records  status(u16) headers_len(u32) body_len(u32) headers(JSON) body
+    index    slot_count x [key(16) record_offset(u64) record_len(u32) pad(u32)]
+
+Interactions are keyed by method, path, sorted query params and a hash of the
+request body, so a cassette recorded against one host replays against any.
+Recording processes (e.g. xdist workers) merge their interactions into the
+file under a file lock when they close, so no process overwrites another's.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from utils.locks import file_lock
+from utils.responses import build_response
+
+
+MAGIC = b'APICAS1\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sIIIIQ')
+RECORD = struct.Struct('<HII')
+SLOT = struct.Struct('<16sQII')
+EMPTY_KEY = bytes(16)
+
+MODES = ('off', 'record', 'replay')
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when a request has no recorded interaction"""
+
+
+def request_key(request: requests.PreparedRequest) -> bytes:
+    """
+    Build the 16-byte lookup key for a prepared request
+
+    Args:
+        request: Prepared request (as sent, or as it would be sent)
+
+    Returns:
+        Digest of method, path, sorted query params and body hash
+    """
+    split = urlsplit(request.url)
+    params = sorted(parse_qsl(split.query, keep_blank_values=True))
+    body = request.body or b''
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(request.method.upper().encode('ascii'))
+    digest.update(b'\n' + split.path.encode('utf-8'))
+    digest.update(b'\n' + json.dumps(params, separators=(',', ':')).encode('utf-8'))
+    digest.update(b'\n' + hashlib.sha256(body).digest())
+    return digest.digest()
+
+
+def _slot_count(records: int) -> int:
+    # Power of two with load factor <= 0.5 keeps probe chains short
+    count = 8
+    while count < records * 2:
+        count *= 2
+    return count
+
+
+def _encode_record(response: requests.Response) -> bytes:
+    headers = json.dumps(dict(response.headers), separators=(',', ':')).encode('utf-8')
+    body = response.content or b''
+    return RECORD.pack(response.status_code, len(headers), len(body)) + headers + body
+
+
+class _CassetteReader:
+    """Memory-mapped, read-only view of a cassette file"""
+
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.slot_count, self.record_count, _, self.index_offset = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} cassette")
+
+    def find(self, key: bytes) -> Optional[memoryview]:
+        """
+        Look a key up in the index
+
+        Args:
+            key: 16-byte request key
+
+        Returns:
+            Record bytes, or None if the key is absent
+        """
+        mask = self.slot_count - 1
+        slot = int.from_bytes(key[:8], 'little') & mask
+        for _ in range(self.slot_count):
+            slot_key, offset, length, _ = SLOT.unpack_from(self._map, self.index_offset + slot * SLOT.size)
+            if slot_key == key:
+                return memoryview(self._map)[offset:offset + length]
+            if slot_key == EMPTY_KEY:
+                return None
+            slot = (slot + 1) & mask
+        return None
+
+    def items(self) -> Iterator[Tuple[bytes, bytes]]:
+        """Yield every (key, record bytes) pair"""
+        for slot in range(self.slot_count):
+            key, offset, length, _ = SLOT.unpack_from(self._map, self.index_offset + slot * SLOT.size)
+            if key != EMPTY_KEY:
+                yield key, bytes(self._map[offset:offset + length])
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+def write_cassette(path: str, records: Dict[bytes, bytes]) -> None:
+    """
+    Write records to a cassette file atomically
+
+    Args:
+        path: Destination file
+        records: Mapping of request key to encoded record
+    """
+    slot_count = _slot_count(len(records))
+    slots = [None] * slot_count
+    offset = HEADER.size
+    chunks = []
+    for key, record in records.items():
+        slot = int.from_bytes(key[:8], 'little') & (slot_count - 1)
+        while slots[slot] is not None:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = (key, offset, len(record))
+        chunks.append(record)
+        offset += len(record)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as handle:
+        handle.write(HEADER.pack(MAGIC, VERSION, slot_count, len(records), 0, offset))
+        for chunk in chunks:
+            handle.write(chunk)
+        for entry in slots:
+            handle.write(SLOT.pack(*(entry or (EMPTY_KEY, 0, 0)), 0))
+    os.replace(tmp_path, path)
+
+
+class Cassette:
+    """Records interactions to, or replays them from, an indexed cassette file"""
+
+    def __init__(self, path: str, mode: str = 'replay'):
+        """
+        Open a cassette
+
+        Args:
+            path: Cassette file path
+            mode: 'record' to capture live traffic, 'replay' to serve from file
+        """
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode {mode!r}")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        # Interactions recorded by this process, merged into the file on close()
+        self._pending: Dict[bytes, bytes] = {}
+        self._reader: Optional[_CassetteReader] = None
+        if mode == 'replay':
+            self._reader = _CassetteReader(path)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == 'record'
+
+    def __len__(self) -> int:
+        """Interactions in the file (replay) or recorded by this process (record)"""
+        if self._reader is not None:
+            return self._reader.record_count
+        return len(self._pending)
+
+    def record(self, response: requests.Response) -> None:
+        """
+        Store one live interaction
+
+        The body is read, so pass streamed responses only once they have
+        been read to the end.
+
+        Args:
+            response: Response whose .request is the prepared request sent
+        """
+        key = request_key(response.request)
+        record = _encode_record(response)
+        with self._lock:
+            self._pending[key] = record
+
+    def replay(self, request: requests.PreparedRequest) -> requests.Response:
+        """
+        Serve a recorded response for a request
+
+        Args:
+            request: Prepared request that would have been sent
+
+        Returns:
+            Response rebuilt from the cassette
+
+        Raises:
+            CassetteMiss: If the request was never recorded
+        """
+        record = self._reader.find(request_key(request))
+        if record is None:
+            raise CassetteMiss(f"No recorded interaction for {request.method} {request.url}")
+        status, headers_len, body_len = RECORD.unpack_from(record, 0)
+        start = RECORD.size
+        headers = json.loads(bytes(record[start:start + headers_len]))
+        body = bytes(record[start + headers_len:start + headers_len + body_len])
+
+        return build_response(request, status, headers, body, reason='Replayed')
+
+    def close(self) -> None:
+        """Merge recordings into the file (record mode) and release it"""
+        with self._lock:
+            if self.recording and self._pending:
+                with file_lock(f"{self.path}.lock"):
+                    # Keep what other processes wrote; new interactions win on matching keys
+                    records: Dict[bytes, bytes] = {}
+                    if os.path.exists(self.path):
+                        reader = _CassetteReader(self.path)
+                        records.update(reader.items())
+                        reader.close()
+                    records.update(self._pending)
+                    write_cassette(self.path, records)
+                self._pending = {}
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
@@ -0,0 +1,149 @@
+"""
+Connection pooling for the API client
+"""
+import threading
+import time
+from typing import Dict
+
+from requests.adapters import HTTPAdapter
+from urllib3 import PoolManager
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from utils.timing import current_clock
+
+
+class ConnectionStats:
+    """Thread-safe counters for connections opened and reused by a client"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._opened = 0
+
+    def record_request(self) -> None:
+        """Count one request sent through the pool"""
+        with self._lock:
+            self._requests += 1
+
+    def record_opened(self) -> None:
+        """Count one new TCP (and TLS) connection"""
+        with self._lock:
+            self._opened += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Get a consistent copy of the counters
+
+        Returns:
+            Dictionary with requests, opened and reused counts
+        """
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'opened': self._opened,
+                'reused': max(self._requests - self._opened, 0),
+            }
+
+
+class _TimedConnectionMixin:
+    """Marks connect time and header arrival on the request's PhaseClock"""
+
+    def connect(self):
+        clock = current_clock()
+        if clock is None:
+            return super().connect()
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            clock.connect += time.perf_counter() - started
+
+    def getresponse(self):
+        response = super().getresponse()
+        clock = current_clock()
+        if clock is not None:
+            clock.headers = time.perf_counter()
+        return response
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _CountingPoolMixin:
+    """Reports every new connection to the owning client's stats"""
+
+    stats = None
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        if self.stats is not None:
+            self.stats.record_opened()
+        return conn
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout=timeout)
+        clock = current_clock()
+        if clock is not None:
+            clock.acquired = time.perf_counter()
+        return conn
+
+
+class CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class _CountingPoolManager(PoolManager):
+    """PoolManager that hands its stats object to every host pool it creates"""
+
+    def __init__(self, *args, stats: ConnectionStats, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats
+        self.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool,
+        }
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        pool.stats = self.stats
+        return pool
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with keep-alive pools that counts opened vs. reused connections
+
+    pool_connections is the number of host pools kept alive, pool_maxsize is
+    the per-host connection limit and pool_block makes callers wait for a free
+    connection instead of opening one past the limit.
+    """
+
+    def __init__(self, stats: ConnectionStats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _CountingPoolManager(
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            stats=self.stats,
+            **pool_kwargs,
+        )
+
+    def send(self, request, **kwargs):
+        self.stats.record_request()
+        return super().send(request, **kwargs)
@@ -0,0 +1,230 @@
+"""
+Latency and fault injection profiles for the local stand-in API
+
+A FaultProfile is an ordered list of FaultRules. For every request the
+first rule whose route and method match, whose schedule covers this
+request and whose probability roll succeeds decides what goes wrong:
+
+- latency: fixed or sampled delay before the response (see fixed(),
+  uniform(), exponential(), lognormal())
+- status: answer with this status instead (e.g. a 429/503 burst), plus
+  optional headers such as Retry-After
+- reset: drop the connection with a TCP RST instead of answering
+- drip: send the body in (chunk_size, interval) slices
+- stall: send half the body, then go silent for this many seconds
+
+Schedules count matching requests per rule: count=3 hits the first three,
+count=2, every=10 hits two out of every ten, start=5 skips the first five.
+Randomness comes from one seeded generator, so a sequential test sees the
+same faults on every run.
+"""
+import fnmatch
+import math
+import random
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from config.settings import FAULT_SEED
+from utils.timing import endpoint_template
+
+
+class Latency(NamedTuple):
+    """Delay distribution; build with fixed(), uniform(), exponential() or lognormal()"""
+
+    kind: str
+    a: float
+    b: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == 'fixed':
+            return self.a
+        if self.kind == 'uniform':
+            return rng.uniform(self.a, self.b)
+        if self.kind == 'exponential':
+            return rng.expovariate(1 / self.a) if self.a > 0 else 0.0
+        if self.kind == 'lognormal':
+            return rng.lognormvariate(math.log(self.a), self.b)
+        raise ValueError(f"Unknown latency distribution {self.kind!r}")
+
+
+def fixed(seconds: float) -> Latency:
+    """Always wait `seconds`"""
+    return Latency('fixed', seconds)
+
+
+def uniform(low: float, high: float) -> Latency:
+    """Wait between `low` and `high` seconds"""
+    return Latency('uniform', low, high)
+
+
+def exponential(mean: float) -> Latency:
+    """Exponentially distributed delay with the given mean"""
+    return Latency('exponential', mean)
+
+
+def lognormal(median: float, sigma: float) -> Latency:
+    """Long-tailed delay: median `median` seconds, log-space spread `sigma`"""
+    return Latency('lognormal', median, sigma)
+
+
+class Fault(NamedTuple):
+    """What the server does for one request (resolved from a rule)"""
+
+    latency: float = 0.0
+    status: Optional[int] = None
+    headers: Optional[Dict[str, str]] = None
+    reset: bool = False
+    drip: Optional[Tuple[int, float]] = None
+    stall: float = 0.0
+
+
+class FaultRule:
+    """One kind of misbehavior for the requests it matches"""
+
+    def __init__(self, route: str = '*', methods: Optional[Sequence[str]] = None,
+                 count: Optional[int] = None, start: int = 0, every: int = 0,
+                 probability: float = 1.0, latency: Optional[Latency] = None,
+                 status: Optional[int] = None, headers: Optional[Dict[str, str]] = None,
+                 reset: bool = False, drip: Optional[Tuple[int, float]] = None,
+                 stall: float = 0.0):
+        """
+        Initialize the rule
+
+        Args:
+            route: Endpoint template pattern, e.g. '/posts/{id}' or '/posts*'
+            methods: HTTP methods to match (default: all)
+            count: Requests hit per cycle (default: all)
+            start: Matching requests to let through before the first hit
+            every: Cycle length in matching requests (0: no repeat)
+            probability: Chance that a scheduled request is hit
+            latency: Delay before answering
+            status: Status to answer with instead of the real response
+            headers: Extra headers for a status answer (e.g. Retry-After)
+            reset: Reset the connection instead of answering
+            drip: (chunk_size, interval) to send the body slowly
+            stall: Seconds to pause after half of the body
+        """
+        self.route = route
+        self.methods = {method.upper() for method in methods} if methods else None
+        self.count = count
+        self.start = start
+        self.every = every
+        self.probability = probability
+        self.latency = latency
+        self.status = status
+        self.headers = headers
+        self.reset = reset
+        self.drip = drip
+        self.stall = stall
+
+    def matches(self, method: str, template: str) -> bool:
+        if self.methods is not None and method not in self.methods:
+            return False
+        return fnmatch.fnmatchcase(template, self.route)
+
+    def scheduled(self, number: int) -> bool:
+        """Whether the rule's `number`-th matching request (0-based) is hit"""
+        if number < self.start:
+            return False
+        if self.count is None:
+            return True
+        offset = number - self.start
+        return (offset % self.every if self.every else offset) < self.count
+
+    def resolve(self, rng: random.Random) -> Fault:
+        return Fault(
+            latency=self.latency.sample(rng) if self.latency is not None else 0.0,
+            status=self.status,
+            headers=self.headers,
+            reset=self.reset,
+            drip=self.drip,
+            stall=self.stall,
+        )
+
+
+class FaultProfile:
+    """Ordered fault rules shared by every request to one server"""
+
+    def __init__(self, rules: Sequence[FaultRule], seed: int = FAULT_SEED):
+        self.rules = list(rules)
+        self._matched = [0] * len(self.rules)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def decide(self, method: str, path: str) -> Optional[Fault]:
+        """
+        Pick the fault for one request
+
+        Args:
+            method: HTTP method
+            path: URL path without query string
+
+        Returns:
+            Fault to apply, or None to answer normally
+        """
+        template = endpoint_template(path)
+        with self._lock:
+            for index, rule in enumerate(self.rules):
+                if not rule.matches(method, template):
+                    continue
+                number = self._matched[index]
+                self._matched[index] += 1
+                if rule.scheduled(number) and self._rng.random() < rule.probability:
+                    return rule.resolve(self._rng)
+        return None
+
+
+def _profiles() -> Dict[str, List[FaultRule]]:
+    return {
+        # Every request takes a while, with a long tail
+        'slow': [FaultRule(latency=lognormal(0.05, 0.6))],
+        # 5% of requests take 250 ms, the rest 2 ms
+        'tail_latency': [FaultRule(probability=0.05, latency=fixed(0.25)),
+                         FaultRule(latency=fixed(0.002))],
+        # Two 503s out of every ten requests
+        'flaky_gateway': [FaultRule(count=2, every=10, status=503)],
+        # The first three requests are throttled for one second
+        'throttled': [FaultRule(count=3, status=429, headers={'Retry-After': '1'})],
+        # Every fourth connection is reset
+        'resets': [FaultRule(count=1, every=4, reset=True)],
+        # Bodies arrive 1 KiB every 10 ms
+        'slow_drip': [FaultRule(drip=(1024, 0.01))],
+        # Bodies stop halfway for five seconds
+        'stalled': [FaultRule(stall=5.0)],
+    }
+
+
+PROFILE_NAMES = tuple(_profiles())
+
+
+def build_profile(*specs: Union[str, FaultRule], seed: int = FAULT_SEED, **rule: Any) -> FaultProfile:
+    """
+    Build a profile from named profiles, rules and/or one rule's keyword arguments
+
+    This is what @pytest.mark.faults(...) passes through, e.g.
+    faults('throttled'), faults(FaultRule(...), seed=3) or
+    faults(route='/posts/{id}', status=503, count=2).
+
+    Args:
+        *specs: Names from PROFILE_NAMES or FaultRule objects, in priority order
+        seed: Seed for probabilities and sampled latencies
+        **rule: Keyword arguments for one more FaultRule (added last)
+
+    Returns:
+        FaultProfile (schedules count from zero for every new profile)
+
+    Raises:
+        ValueError: If a profile name is unknown
+    """
+    named = _profiles()
+    rules: List[FaultRule] = []
+    for spec in specs:
+        if isinstance(spec, FaultRule):
+            rules.append(spec)
+        elif spec in named:
+            rules.extend(named[spec])
+        else:
+            raise ValueError(f"Unknown fault profile {spec!r} (expected one of {', '.join(named)})")
+    if rule:
+        rules.append(FaultRule(**rule))
+    return FaultProfile(rules, seed)
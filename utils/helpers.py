@@ -1,34 +1,270 @@
 """
 Helper functions for API testing
 """
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, List, Optional, Iterator
+from urllib.parse import urlsplit
 import requests
-from typing import Dict, Any, Optional
-from config.settings import BASE_URL, REQUEST_TIMEOUT
+from config.settings import (
+    BASE_URL,
+    CONNECT_TIMEOUT,
+    READ_TIMEOUT,
+    HEDGE_DEFAULT_DELAY,
+    HEDGE_MIN_SAMPLES,
+    RATE_LIMIT_PATH,
+    COALESCE_GETS,
+    POOL_CONNECTIONS,
+    POOL_MAXSIZE,
+    POOL_BLOCK,
+    STREAM_CHUNK_SIZE
+)
+from utils.connection_pool import ConnectionStats, PooledHTTPAdapter
+from utils.cassette import Cassette
+from utils.http_cache import HTTPCache
+from utils.json_stream import iter_json_array
+from utils.timing import PhaseTimings, TimingRecorder, measure, recorder
+from utils.resilience import Resilience
+from utils.rate_limiter import RateLimiter
+from utils.single_flight import SingleFlight, request_key
+from utils.json_codec import APIResponse, JSONCodec, codec as default_codec
+
+
+def _copy_response(response: APIResponse) -> APIResponse:
+    """Independent copy of a fully-read response (body bytes are shared)"""
+    wrapped = response.wrapped
+    clone = requests.Response()
+    clone.__setstate__(wrapped.__getstate__())
+    clone.headers = wrapped.headers.copy()
+    clone.cookies = wrapped.cookies.copy()
+    clone.history = list(wrapped.history)
+    return APIResponse(clone, response.codec)
+
+
+def _tee(chunks: Iterator[bytes], body: bytearray) -> Iterator[bytes]:
+    """Pass chunks through, appending each to body"""
+    for chunk in chunks:
+        body += chunk
+        yield chunk
 
 
 class APIClient:
-    """API Client for making HTTP requests"""
+    """API Client for making HTTP requests over a pooled keep-alive session"""
     
-    def __init__(self, base_url: str = BASE_URL):
+    def __init__(self, base_url: str = BASE_URL,
+                 pool_connections: int = POOL_CONNECTIONS,
+                 pool_maxsize: int = POOL_MAXSIZE,
+                 pool_block: bool = POOL_BLOCK,
+                 cassette: Optional[Cassette] = None,
+                 cache: Optional[HTTPCache] = None,
+                 timings: Optional[TimingRecorder] = None,
+                 resilience: Optional[Resilience] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 coalesce: bool = COALESCE_GETS,
+                 json_codec: JSONCodec = default_codec):
+        """
+        Initialize API Client
+        
+        Args:
+            base_url: Base URL prepended to every endpoint
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum connections kept alive per host
+            pool_block: Wait for a free connection instead of exceeding pool_maxsize
+            cassette: Optional Cassette to record traffic to or replay it from
+            cache: Optional HTTPCache for GET responses (opt-in)
+            timings: Recorder for per-request phase timings (defaults to the
+                process-wide utils.timing.recorder)
+            resilience: Retry/hedge/circuit breaker layer (defaults from settings)
+            rate_limiter: Token buckets and Retry-After handling (defaults from settings)
+            coalesce: Share one request between identical concurrent GETs
+            json_codec: Encoder/decoder for JSON bodies (orjson when installed)
+        """
         self.base_url = base_url
-        self.timeout = REQUEST_TIMEOUT
+        self.json_codec = json_codec
+        self.timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+        self.cassette = cassette
+        self.cache = cache
+        self.timings = timings if timings is not None else recorder
+        self.timing_hooks: List[Callable[[str, str, PhaseTimings], None]] = [self.timings.record]
+        self.response_hooks: List[Callable[[str, APIResponse], None]] = []
+        self.resilience = resilience if resilience is not None else Resilience()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else \
+            RateLimiter.from_settings(RATE_LIMIT_PATH)
+        if self.rate_limiter.stats is None:
+            self.rate_limiter.stats = self.resilience.stats
+        self.single_flight = SingleFlight() if coalesce else None
+        self.connection_stats = ConnectionStats()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._closed = False
+        
+        adapter = PooledHTTPAdapter(
+            self.connection_stats,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Connection': 'keep-alive'})
     
-    def get(self, endpoint: str, params: Optional[Dict] = None) -> requests.Response:
+    def request(self, method: str, endpoint: str, use_cache: bool = True,
+                **kwargs) -> APIResponse:
+        """
+        Make an HTTP request through the shared session
+        
+        A json= body is encoded once with the client's codec, so retries and
+        hedges resend the same bytes.
+        
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            use_cache: Allow GETs to be served from the response cache
+            **kwargs: Extra arguments passed to requests (params, json, ...)
+            
+        Returns:
+            Response wrapper that decodes its JSON body at most once
+        """
+        if self._closed:
+            raise RuntimeError("APIClient is closed")
+        url = f"{self.base_url}{endpoint}"
+        kwargs.setdefault('timeout', self.timeout)
+        if 'json' in kwargs:
+            kwargs['data'] = self.json_codec.dumps(kwargs.pop('json'))
+            kwargs['headers'] = {'Content-Type': 'application/json', **(kwargs.get('headers') or {})}
+        
+        if (method == 'GET' and self.cache is not None and use_cache
+                and not getattr(self._local, 'bypass_cache', False)):
+            prepared = self._prepare(method, url, **kwargs)
+            response = self.cache.fetch(
+                prepared, lambda headers: self._send(method, url, headers=headers, **kwargs)
+            )
+        else:
+            response = self._send(method, url, **kwargs)
+        wrapped = APIResponse(response, self.json_codec)
+        for hook in self.response_hooks:
+            hook(method, wrapped)
+        return wrapped
+    
+    def _prepare(self, method: str, url: str, **kwargs) -> requests.PreparedRequest:
+        return self.session.prepare_request(requests.Request(
+            method, url,
+            params=kwargs.get('params'),
+            data=kwargs.get('data'),
+            json=kwargs.get('json'),
+            headers=kwargs.get('headers'),
+        ))
+    
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        if self.cassette is not None and self.cassette.replaying:
+            return self.cassette.replay(self._prepare(method, url, **kwargs))
+        
+        split = urlsplit(url)
+        
+        def attempt() -> requests.Response:
+            self.rate_limiter.acquire(split.netloc, split.path)
+            with measure(self.timing_hooks, method, split.path):
+                response = self.session.request(method, url, **kwargs)
+            self.rate_limiter.observe(split.netloc, response)
+            return response
+        
+        hedge_delay = None if kwargs.get('stream') else lambda: self._hedge_delay(method, split.path)
+        response = self.resilience.call(method, split.netloc, attempt, hedge_delay)
+        # A streamed body is recorded by iter_json once it has been read
+        if self.cassette is not None and self.cassette.recording and not kwargs.get('stream'):
+            self.cassette.record(response)
+        return response
+    
+    def _hedge_delay(self, method: str, path: str) -> float:
+        histogram = self.timings.histogram(method, path)
+        if histogram.count < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        return histogram.percentile(95)
+    
+    def get(self, endpoint: str, params: Optional[Dict] = None,
+            use_cache: bool = True) -> APIResponse:
         """
         Make GET request
         
+        Concurrent GETs for the same URL and params share one request;
+        each caller still gets its own Response object.
+        
         Args:
             endpoint: API endpoint
             params: Query parameters
+            use_cache: Set False to always hit the origin (e.g. timing checks)
             
         Returns:
             Response object
         """
+        single_flight = self.single_flight
+        if single_flight is None or getattr(self._local, 'no_coalescing', False):
+            return self.request('GET', endpoint, use_cache=use_cache, params=params)
+        use_cache = use_cache and not getattr(self._local, 'bypass_cache', False)
+        key = (request_key(f"{self.base_url}{endpoint}", params), use_cache)
+        return single_flight.do(
+            key,
+            lambda: self.request('GET', endpoint, use_cache=use_cache, params=params),
+            copy=_copy_response,
+        )
+    
+    def iter_json(self, endpoint: str, params: Optional[Dict] = None,
+                  chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Any]:
+        """
+        Make a streaming GET and yield array elements as they arrive
+        
+        The body is never held in memory as a whole, and closing the
+        generator early (e.g. after the first bad element) drops the
+        connection instead of downloading the rest. Streaming GETs
+        bypass the response cache. While a cassette is recording or
+        response hooks are registered, the chunks are kept (and the rest
+        is read even after an early close) so the whole body can be
+        recorded and passed to the hooks at the end.
+        
+        Args:
+            endpoint: API endpoint returning a JSON array
+            params: Query parameters
+            chunk_size: Bytes read from the socket per chunk
+            
+        Yields:
+            Each decoded array element
+            
+        Raises:
+            requests.HTTPError: If the response status is 4xx/5xx
+        """
+        if self._closed:
+            raise RuntimeError("APIClient is closed")
         url = f"{self.base_url}{endpoint}"
-        response = requests.get(url, params=params, timeout=self.timeout)
-        return response
+        response = self._send('GET', url, params=params, timeout=self.timeout, stream=True)
+        chunks = response.iter_content(chunk_size)
+        recording = self.cassette is not None and self.cassette.recording
+        body = bytearray() if recording or self.response_hooks else None
+        try:
+            response.raise_for_status()
+            yield from iter_json_array(chunks if body is None else _tee(chunks, body))
+        finally:
+            if body is not None:
+                self._finish_stream(response, chunks, body)
+            response.close()
     
-    def post(self, endpoint: str, data: Dict[str, Any]) -> requests.Response:
+    def _finish_stream(self, response: requests.Response, chunks: Iterator[bytes],
+                       body: bytearray) -> None:
+        """Read the rest of a teed stream, then record it and run the response hooks"""
+        try:
+            for chunk in chunks:
+                body += chunk
+        except requests.RequestException:
+            return  # an incomplete body is not worth recording
+        response._content = bytes(body)
+        response._content_consumed = True
+        if self.cassette is not None and self.cassette.recording:
+            self.cassette.record(response)
+        wrapped = APIResponse(response, self.json_codec)
+        for hook in self.response_hooks:
+            hook('GET', wrapped)
+    
+    def post(self, endpoint: str, data: Dict[str, Any]) -> APIResponse:
         """
         Make POST request
         
@@ -39,11 +275,9 @@ class APIClient:
         Returns:
             Response object
         """
-        url = f"{self.base_url}{endpoint}"
-        response = requests.post(url, json=data, timeout=self.timeout)
-        return response
+        return self.request('POST', endpoint, json=data)
     
-    def put(self, endpoint: str, data: Dict[str, Any]) -> requests.Response:
+    def put(self, endpoint: str, data: Dict[str, Any]) -> APIResponse:
         """
         Make PUT request
         
@@ -54,11 +288,9 @@ class APIClient:
         Returns:
             Response object
         """
-        url = f"{self.base_url}{endpoint}"
-        response = requests.put(url, json=data, timeout=self.timeout)
-        return response
+        return self.request('PUT', endpoint, json=data)
     
-    def delete(self, endpoint: str) -> requests.Response:
+    def delete(self, endpoint: str) -> APIResponse:
         """
         Make DELETE request
         
@@ -68,9 +300,111 @@ class APIClient:
         Returns:
             Response object
         """
-        url = f"{self.base_url}{endpoint}"
-        response = requests.delete(url, timeout=self.timeout)
-        return response
+        return self.request('DELETE', endpoint)
+    
+    def add_timing_hook(self, hook: Callable[[str, str, PhaseTimings], None]) -> None:
+        """
+        Call hook(method, endpoint, timings) after every request sent to the network
+        
+        Args:
+            hook: Callable receiving the method, endpoint path and PhaseTimings
+        """
+        self.timing_hooks.append(hook)
+    
+    def add_response_hook(self, hook: Callable[[str, APIResponse], None]) -> None:
+        """
+        Call hook(method, response) for every response request() returns,
+        whether it came from the network, the cache or a cassette, and for
+        every iter_json stream once its body has been read
+        
+        Args:
+            hook: Callable receiving the method and the response
+        """
+        self.response_hooks.append(hook)
+    
+    @contextmanager
+    def bypass_cache(self) -> Iterator[None]:
+        """Send every GET made by this thread inside the block to the origin"""
+        previous = getattr(self._local, 'bypass_cache', False)
+        self._local.bypass_cache = True
+        try:
+            yield
+        finally:
+            self._local.bypass_cache = previous
+    
+    @contextmanager
+    def without_coalescing(self) -> Iterator[None]:
+        """Send every GET made by this thread inside the block on its own"""
+        previous = getattr(self._local, 'no_coalescing', False)
+        self._local.no_coalescing = True
+        try:
+            yield
+        finally:
+            self._local.no_coalescing = previous
+    
+    def get_coalescing_stats(self) -> Dict[str, int]:
+        """
+        Get single-flight counters
+        
+        Returns:
+            Dictionary with GETs sent and GETs coalesced into an in-flight
+            one (empty when coalescing is off)
+        """
+        return self.single_flight.stats() if self.single_flight is not None else {}
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        Get response cache counters
+        
+        Returns:
+            Dictionary with hits, misses and revalidations (empty when caching is off)
+        """
+        return self.cache.stats() if self.cache is not None else {}
+    
+    def get_connection_stats(self) -> Dict[str, int]:
+        """
+        Get connection pool counters
+        
+        Returns:
+            Dictionary with requests sent, connections opened and connections reused
+        """
+        return self.connection_stats.snapshot()
+    
+    def get_resilience_stats(self) -> Dict[str, int]:
+        """
+        Get retry, hedge and circuit breaker counters
+        
+        Returns:
+            Dictionary with retries, hedges, hedges_won, circuit_opened,
+            circuit_rejected, throttled, throttled_seconds and retry_after
+        """
+        return self.resilience.stats.snapshot()
+    
+    def get_timing_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get per-endpoint latency and phase breakdown recorded so far
+        
+        Returns:
+            One row per method/endpoint (see TimingRecorder.summary)
+        """
+        return self.timings.summary()
+    
+    def close(self) -> None:
+        """Close the session and every pooled connection (safe to call twice)"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self.resilience.close()
+            self.session.close()
+            if self.cache is not None:
+                self.cache.close()
+    
+    def __enter__(self) -> 'APIClient':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 
 def validate_response_schema(response_data: Dict, expected_fields: list) -> bool:
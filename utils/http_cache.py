@@ -0,0 +1,250 @@
+"""
+HTTP response cache for idempotent GETs
+
+Entries live in an LRU bounded by entry count and total body size, expire
+after min(Cache-Control max-age, ttl) and are revalidated with If-None-Match
+when they carry an ETag. An optional SQLite file lets several processes (for
+example xdist workers) share one cache.
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from config.settings import HTTP_CACHE_MAX_ENTRIES, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_TTL
+from utils.responses import build_response
+
+
+class CacheEntry:
+    """One cached 200 response"""
+
+    __slots__ = ('status_code', 'headers', 'content', 'etag', 'expires_at', 'must_revalidate')
+
+    def __init__(self, status_code: int, headers: Dict[str, str], content: bytes,
+                 etag: Optional[str], expires_at: float, must_revalidate: bool):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.etag = etag
+        self.expires_at = expires_at
+        self.must_revalidate = must_revalidate
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    def is_fresh(self, now: float) -> bool:
+        return not self.must_revalidate and now < self.expires_at
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Parse a Cache-Control header into its directives
+
+    Args:
+        value: Header value, e.g. "public, max-age=43200"
+
+    Returns:
+        Dictionary of lower-cased directive names to their values (or None)
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or '').split(','):
+        name, _, arg = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+class _DiskStore:
+    """SQLite-backed second level shared between processes"""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'key TEXT PRIMARY KEY, status INTEGER, headers TEXT, content BLOB, '
+            'etag TEXT, expires_at REAL, must_revalidate INTEGER)'
+        )
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._db.execute(
+                'SELECT status, headers, content, etag, expires_at, must_revalidate '
+                'FROM entries WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, headers, content, etag, expires_at, must_revalidate = row
+        return CacheEntry(status, json.loads(headers), content, etag, expires_at, bool(must_revalidate))
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, entry.status_code, json.dumps(entry.headers), entry.content,
+                 entry.etag, entry.expires_at, int(entry.must_revalidate))
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class HTTPCache:
+    """Thread-safe LRU cache of GET responses with ETag revalidation"""
+
+    def __init__(self, max_entries: int = HTTP_CACHE_MAX_ENTRIES,
+                 max_bytes: int = HTTP_CACHE_MAX_BYTES,
+                 ttl: float = HTTP_CACHE_TTL,
+                 persist_path: Optional[str] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total size of cached bodies
+            ttl: Upper bound on freshness in seconds, whatever max-age says
+            persist_path: Optional SQLite file shared across processes
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk = _DiskStore(persist_path) if persist_path else None
+        self._stats = {'hits': 0, 'misses': 0, 'revalidations': 0, 'stores': 0, 'evictions': 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _lookup(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        if self._disk is not None:
+            entry = self._disk.get(key)
+            if entry is not None:
+                self._insert(key, entry)
+        return entry
+
+    def _insert(self, key: str, entry: CacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self._stats['evictions'] += 1
+
+    def _make_entry(self, status_code: int, headers: Dict[str, str],
+                    content: bytes) -> Optional[CacheEntry]:
+        headers = CaseInsensitiveDict(headers)
+        directives = parse_cache_control(headers.get('Cache-Control'))
+        if status_code != 200 or 'no-store' in directives:
+            return None
+        ttl = self.ttl
+        if directives.get('max-age') is not None:
+            try:
+                ttl = min(ttl, float(directives['max-age']))
+            except ValueError:
+                pass
+        return CacheEntry(
+            status_code=status_code,
+            headers=dict(headers),
+            content=content,
+            etag=headers.get('ETag'),
+            expires_at=time.time() + ttl,
+            must_revalidate='no-cache' in directives,
+        )
+
+    def _store(self, key: str, status_code: int, headers: Dict[str, str], content: bytes) -> None:
+        entry = self._make_entry(status_code, headers, content)
+        if entry is None:
+            return
+        self._insert(key, entry)
+        if self._disk is not None:
+            self._disk.put(key, entry)
+        self._count('stores')
+
+    def fetch(self, request: requests.PreparedRequest, send) -> requests.Response:
+        """
+        Serve a GET from cache, revalidating or fetching as needed
+
+        Args:
+            request: Prepared GET request (its URL is the cache key)
+            send: Callable taking extra request headers and returning a live Response
+
+        Returns:
+            Response object, either cached or fresh from the origin
+        """
+        key = request.url
+        entry = self._lookup(key)
+        now = time.time()
+
+        if entry is not None and entry.is_fresh(now):
+            self._count('hits')
+            return build_response(request, entry.status_code, entry.headers, entry.content)
+
+        if entry is not None and entry.etag:
+            response = send({'If-None-Match': entry.etag})
+            if response.status_code == 304:
+                self._count('revalidations')
+                headers = CaseInsensitiveDict(entry.headers)
+                headers.update((name, value) for name, value in response.headers.items()
+                               if name.lower() != 'content-length')
+                headers = dict(headers)
+                self._store(key, entry.status_code, headers, entry.content)
+                cached = build_response(request, entry.status_code, headers, entry.content)
+                cached.elapsed = response.elapsed
+                return cached
+        else:
+            response = send({})
+
+        self._count('misses')
+        if response.status_code == 200:
+            self._store(key, response.status_code, dict(response.headers), response.content)
+        return response
+
+    def clear(self) -> None:
+        """Drop every in-memory entry"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters
+
+        Returns:
+            Dictionary with hits, misses, revalidations, stores, evictions,
+            entries and bytes
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        return stats
+
+    def close(self) -> None:
+        """Close the shared disk store, if any"""
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
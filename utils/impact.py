@@ -0,0 +1,301 @@
+"""
+Test impact selection from code dependencies and endpoint fingerprints
+
+After every --impact run, each test that passed is stored with:
+
+- modules: digests of the project files it depends on, i.e. the static
+  import closure of its test module plus, for every fixture it uses, the
+  fixture's file and the modules the fixture's code refers to (the test
+  suite adds the data files some fixtures read, e.g. stored snapshots)
+- endpoints: a fingerprint (status and body digest) of every GET response
+  APIClient returned while it ran, streamed ones included, and of those
+  fetched by its fixtures (recorded per fixture, so a session fixture's
+  requests count for every test that uses it)
+
+The next --impact run probes every recorded endpoint once and selects only
+tests that are new, failed or were skipped last time, depend on a file that
+changed, or read an endpoint whose response changed. Writes (POST/PUT/
+DELETE) are not probed; the code that sends them is tracked as a module.
+"""
+import ast
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from types import CodeType, ModuleType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from config.settings import IMPACT_PROBE_WORKERS
+
+
+def fingerprint(response: requests.Response) -> str:
+    """Digest of a response's status and body"""
+    hasher = hashlib.blake2b(str(response.status_code).encode('ascii'), digest_size=8)
+    hasher.update(response.content)
+    return hasher.hexdigest()
+
+
+def endpoint_key(response: requests.Response) -> str:
+    """Path and query of the response's URL (independent of the base URL)"""
+    split = urlsplit(response.url)
+    return f"{split.path}?{split.query}" if split.query else split.path
+
+
+class EndpointRecorder:
+    """APIClient response hook collecting GET fingerprints for the running test or fixture"""
+
+    def __init__(self):
+        self.current: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, method: str, response: requests.Response) -> None:
+        if method != 'GET':
+            return
+        key, value = endpoint_key(response), fingerprint(response)
+        with self._lock:
+            self.current[key] = value
+
+    def reset(self) -> None:
+        with self._lock:
+            self.current = {}
+
+    @contextmanager
+    def capture(self) -> Iterator[Dict[str, str]]:
+        """Collect the block's fingerprints separately, then restore the outer ones"""
+        with self._lock:
+            outer, self.current = self.current, {}
+        captured = self.current
+        try:
+            yield captured
+        finally:
+            with self._lock:
+                self.current = outer
+
+
+class ImportGraph:
+    """Static import closure of the project's Python files"""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self._imports: Dict[str, Set[str]] = {}
+        self._digests: Dict[str, str] = {}
+
+    def relative(self, path: str) -> Optional[str]:
+        """Path relative to the root, or None for files outside the project"""
+        path = os.path.abspath(path)
+        if not path.startswith(self.root + os.sep) or not os.path.isfile(path):
+            return None
+        relative = os.path.relpath(path, self.root)
+        if any(part in ('site-packages', 'dist-packages') or part.startswith('.')
+               for part in relative.split(os.sep)):
+            return None
+        return relative.replace(os.sep, '/')
+
+    def module_files(self, name: str) -> List[str]:
+        """Project files executed by importing a dotted module name (packages included)"""
+        files = []
+        parts = name.split('.')
+        for depth in range(1, len(parts) + 1):
+            base = os.path.join(self.root, *parts[:depth])
+            for candidate in (os.path.join(base, '__init__.py'), base + '.py'):
+                if os.path.isfile(candidate):
+                    files.append(self.relative(candidate))
+                    break
+            else:
+                break
+        return [path for path in files if path is not None]
+
+    def imports(self, path: str) -> Set[str]:
+        """Project files imported anywhere in one file"""
+        cached = self._imports.get(path)
+        if cached is not None:
+            return cached
+        found: Set[str] = set()
+        self._imports[path] = found
+        with open(os.path.join(self.root, path), 'rb') as handle:
+            tree = ast.parse(handle.read(), filename=path)
+        package = path[:-len('.py')].split('/')[:-1]
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    found.update(self.module_files(alias.name))
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    parts = package[:len(package) - node.level + 1]
+                    base = '.'.join(parts + ([node.module] if node.module else []))
+                else:
+                    base = node.module or ''
+                if base:
+                    found.update(self.module_files(base))
+                for alias in node.names:
+                    found.update(self.module_files(f"{base}.{alias.name}" if base else alias.name))
+        return found
+
+    def closure(self, paths: Iterable[str]) -> Set[str]:
+        """The files plus everything they import, transitively"""
+        seen: Set[str] = set()
+        pending = [path for path in paths if path is not None]
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            pending.extend(self.imports(path) - seen)
+        return seen
+
+    def digest(self, path: str) -> str:
+        cached = self._digests.get(path)
+        if cached is None:
+            with open(os.path.join(self.root, path), 'rb') as handle:
+                cached = self._digests[path] = hashlib.blake2b(handle.read(), digest_size=8).hexdigest()
+        return cached
+
+    def digests(self, paths: Iterable[str], shallow: Iterable[str] = ()) -> Dict[str, str]:
+        """Digest per file of the closure of paths, plus the shallow files themselves"""
+        files = self.closure(paths) | set(shallow)
+        return {path: self.digest(path) for path in sorted(files)}
+
+
+def _referenced_names(code: CodeType) -> Set[str]:
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= _referenced_names(const)
+    return names
+
+
+def function_files(graph: ImportGraph, function: Callable) -> Tuple[Set[str], Set[str]]:
+    """
+    Project files a function (e.g. a fixture) depends on
+
+    The function's own file (typically conftest.py) counts as it is; the
+    modules of the globals its code refers to count with their imports.
+    Helper functions from the same file are followed the same way.
+
+    Args:
+        graph: ImportGraph of the project
+        function: Function to inspect
+
+    Returns:
+        (own files, referenced module files), project-relative
+    """
+    own: Set[str] = set()
+    referenced: Set[str] = set()
+    pending, seen = [function], set()
+    while pending:
+        current = pending.pop()
+        current = getattr(current, '__wrapped__', current)
+        code = getattr(current, '__code__', None)
+        if code is None or code in seen:
+            continue
+        seen.add(code)
+        own.add(graph.relative(code.co_filename))
+        namespace = getattr(current, '__globals__', {})
+        for name in _referenced_names(code):
+            value = namespace.get(name)
+            if getattr(getattr(value, '__code__', None), 'co_filename', None) == code.co_filename:
+                pending.append(value)
+                continue
+            module = value if isinstance(value, ModuleType) else \
+                sys.modules.get(getattr(value, '__module__', None) or '')
+            path = getattr(module, '__file__', None)
+            if path:
+                referenced.add(graph.relative(path))
+    own.discard(None)
+    referenced.discard(None)
+    return own, referenced - own
+
+
+def probe(client: Any, keys: Iterable[str], workers: int = IMPACT_PROBE_WORKERS) -> Dict[str, Optional[str]]:
+    """
+    Fetch each endpoint once and fingerprint the response
+
+    Args:
+        client: APIClient to send the GETs with
+        keys: Endpoint keys (path and query)
+        workers: Requests in flight
+
+    Returns:
+        Endpoint key -> fingerprint, or None if the request failed
+    """
+    def fetch(key: str) -> Optional[str]:
+        try:
+            return fingerprint(client.request('GET', key, use_cache=False))
+        except Exception:  # a failing endpoint counts as changed
+            return None
+
+    keys = sorted(set(keys))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='impact-probe') as executor:
+        return dict(zip(keys, executor.map(fetch, keys)))
+
+
+class ImpactStore:
+    """Per-test dependencies from the last run each test passed in, kept in a JSON file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tests: Dict[str, Dict[str, Any]] = {}
+        self.fixtures: Dict[str, Dict[str, str]] = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as handle:
+                data = json.load(handle)
+            self.tests = data.get('tests', {})
+            self.fixtures = data.get('fixtures', {})
+
+    def endpoint_keys(self) -> Set[str]:
+        """Every endpoint some stored test or fixture read"""
+        keys: Set[str] = set()
+        for entry in self.tests.values():
+            keys.update(entry['endpoints'])
+        for endpoints in self.fixtures.values():
+            keys.update(endpoints)
+        return keys
+
+    def reason(self, nodeid: str, modules: Dict[str, str],
+               current: Dict[str, Optional[str]]) -> Optional[str]:
+        """
+        Why a test has to run, or None if nothing it depends on changed
+
+        Args:
+            nodeid: Test id
+            modules: Current digests of the test's project files
+            current: Probed fingerprint per endpoint key
+        """
+        entry = self.tests.get(nodeid)
+        if entry is None:
+            return "no green run recorded"
+        if entry['modules'] != modules:
+            changed = sorted(path for path in modules.keys() | entry['modules'].keys()
+                             if modules.get(path) != entry['modules'].get(path))
+            return f"code changed: {', '.join(changed)}"
+        endpoints = dict(entry['endpoints'])
+        for fixture in entry['fixtures']:
+            endpoints.update(self.fixtures.get(fixture, {}))
+        for key, value in endpoints.items():
+            if current.get(key) != value:
+                return f"response changed: GET {key}"
+        return None
+
+    def record(self, nodeid: str, modules: Dict[str, str], endpoints: Dict[str, str],
+               fixtures: List[str]) -> None:
+        """Store the dependencies of a test that passed"""
+        self.tests[nodeid] = {'modules': modules, 'endpoints': endpoints, 'fixtures': sorted(fixtures)}
+
+    def forget(self, nodeid: str) -> None:
+        """Drop a test that failed or was skipped, so the next run selects it"""
+        self.tests.pop(nodeid, None)
+
+    def save(self) -> None:
+        """Write the file atomically"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+            json.dump({'tests': self.tests, 'fixtures': self.fixtures}, handle, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
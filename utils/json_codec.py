@@ -0,0 +1,131 @@
+"""
+Pluggable JSON codec for request and response bodies
+
+orjson is used when it is installed (several times faster on large
+payloads), otherwise the stdlib json module. Both backends write the same
+compact UTF-8 bytes for the payloads this suite sends, so request bodies and
+cassette keys do not depend on which one is active. API_JSON_BACKEND=json
+forces the stdlib.
+
+APIResponse wraps a requests.Response so that json() decodes the body at
+most once, however many times a test or service calls it.
+"""
+import json
+from typing import Any, Callable, NamedTuple, Optional, Union
+
+import requests
+
+from config.settings import JSON_BACKEND
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class JSONCodec(NamedTuple):
+    """Named pair of encode (object -> UTF-8 bytes) and decode functions"""
+
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[Union[bytes, str]], Any]
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+STDLIB = JSONCodec('json', _stdlib_dumps, json.loads)
+ORJSON: Optional[JSONCodec] = JSONCodec('orjson', orjson.dumps, orjson.loads) if orjson else None
+
+
+def get_codec(name: str = JSON_BACKEND) -> JSONCodec:
+    """
+    Look up a JSON backend
+
+    Args:
+        name: 'auto' (orjson if installed, else json), 'orjson' or 'json'
+
+    Returns:
+        JSONCodec for the backend
+
+    Raises:
+        ImportError: If 'orjson' is requested but not installed
+        ValueError: If the name is unknown
+    """
+    if name == 'auto':
+        return ORJSON or STDLIB
+    if name == 'json':
+        return STDLIB
+    if name == 'orjson':
+        if ORJSON is None:
+            raise ImportError("API_JSON_BACKEND=orjson but orjson is not installed")
+        return ORJSON
+    raise ValueError(f"Unknown JSON backend {name!r} (expected auto, orjson or json)")
+
+
+# Codec used by APIClient and AsyncAPIClient unless one is passed in
+codec = get_codec()
+
+_UNDECODED = object()
+
+
+class APIResponse:
+    """
+    requests.Response wrapper whose JSON body is decoded lazily and only once
+
+    Every other attribute is read from (and written to) the wrapped
+    response. json() returns the same object on every call, so callers that
+    need to mutate it should copy it first.
+    """
+
+    __slots__ = ('wrapped', 'codec', '_json')
+
+    def __init__(self, wrapped: requests.Response, json_codec: JSONCodec = codec):
+        object.__setattr__(self, 'wrapped', wrapped)
+        object.__setattr__(self, 'codec', json_codec)
+        object.__setattr__(self, '_json', _UNDECODED)
+
+    def json(self, **kwargs) -> Any:
+        """
+        Decode the response body (cached after the first call)
+
+        Args:
+            **kwargs: Passed to requests' own json(); bypasses the cache
+
+        Returns:
+            Parsed JSON body
+
+        Raises:
+            requests.JSONDecodeError: If the body is not valid JSON
+        """
+        if kwargs:
+            return self.wrapped.json(**kwargs)
+        if self._json is _UNDECODED:
+            try:
+                value = self.codec.loads(self.wrapped.content)
+            except json.JSONDecodeError as exc:
+                raise requests.JSONDecodeError(exc.msg, exc.doc, exc.pos) from exc
+            object.__setattr__(self, '_json', value)
+        return self._json
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.wrapped, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.wrapped, name, value)
+
+    def __bool__(self) -> bool:
+        return self.wrapped.ok
+
+    def __iter__(self):
+        return iter(self.wrapped)
+
+    def __enter__(self) -> 'APIResponse':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.wrapped.close()
+
+    def __repr__(self) -> str:
+        return repr(self.wrapped)
@@ -0,0 +1,98 @@
+"""
+Incremental decoding of top-level JSON arrays
+
+Elements are decoded and yielded as soon as their bytes have arrived, so a
+collection can be checked in bounded memory and abandoned on the first bad
+element without downloading the rest of the body.
+"""
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CONTINUATION = '0123456789.eE+-'
+_decoder = json.JSONDecoder()
+
+
+def _skip_whitespace(buffer: str, pos: int) -> int:
+    while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Yield the elements of a JSON array from a stream of byte chunks
+
+    Args:
+        chunks: Body chunks, e.g. response.iter_content(chunk_size)
+
+    Yields:
+        Each decoded array element, in order
+
+    Raises:
+        ValueError: If the body is not a well-formed JSON array
+    """
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    source = iter(chunks)
+    buffer = ''
+    pos = 0
+    eof = False
+    started = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = next(source, None)
+        if chunk is None:
+            eof = True
+            buffer = buffer[pos:] + utf8.decode(b'', final=True)
+        else:
+            # Drop consumed text so the buffer holds at most one partial element
+            buffer = buffer[pos:] + utf8.decode(chunk)
+        pos = 0
+        return True
+
+    while True:
+        pos = _skip_whitespace(buffer, pos)
+        if pos >= len(buffer):
+            if not fill():
+                raise ValueError("Unexpected end of JSON array")
+            continue
+
+        char = buffer[pos]
+        if not started:
+            if char != '[':
+                raise ValueError(f"Expected a JSON array, found {char!r}")
+            started = True
+            pos += 1
+            expect_value = True
+            first = True
+            continue
+
+        if char == ']' and (first or not expect_value):
+            return
+        if not expect_value:
+            if char != ',':
+                raise ValueError(f"Expected ',' or ']' at offset {pos}, found {char!r}")
+            pos += 1
+            expect_value = True
+            continue
+
+        try:
+            value, end = _decoder.raw_decode(buffer, pos)
+        except ValueError:
+            if not fill():
+                raise
+            continue
+        # A value ending at the buffer edge, or a number followed by more
+        # number characters, may have been cut short by the chunk boundary
+        if not eof and (_skip_whitespace(buffer, end) >= len(buffer)
+                        or buffer[end] in _NUMBER_CONTINUATION):
+            fill()
+            continue
+        pos = end
+        expect_value = False
+        first = False
+        yield value
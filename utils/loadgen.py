@@ -0,0 +1,339 @@
+"""
+Load generator driven by the service classes
+
+Runs weighted mixes of PostsService/UsersService operations under three
+profiles and reports throughput, error rate and latency percentiles per
+operation:
+
+- closed loop: N virtual users, each calling the next operation as soon as
+  the previous one finishes
+- constant rate (open loop): operations start on a fixed schedule whatever
+  the response times, so a slow server builds a queue instead of slowing the
+  load down
+- ramp (open loop): arrival rate moves linearly from a start to an end rate
+
+Open-loop latency is measured from the scheduled start time, so time spent
+waiting for a free worker is counted (no coordinated omission).
+
+CLI:
+    python -m utils.loadgen --local --scenario read_heavy --mode constant --rate 200 --duration 10
+"""
+import argparse
+import math
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from config.settings import BASE_URL, TOTAL_POSTS, TOTAL_USERS, LOAD_MAX_WORKERS, POOL_MAXSIZE
+
+Operation = Callable[[], object]
+
+
+def service_operations(posts_service, users_service) -> Dict[str, Operation]:
+    """
+    Build the named operations load scenarios can mix
+
+    Args:
+        posts_service: PostsService instance
+        users_service: UsersService instance
+
+    Returns:
+        Mapping of operation name to a no-argument callable
+    """
+    post = {"title": "Load test post", "body": "Generated by utils.loadgen", "userId": 1}
+    return {
+        'get_post': lambda: posts_service.get_post_by_id(random.randint(1, TOTAL_POSTS)),
+        'get_all_posts': posts_service.get_all_posts,
+        'get_posts_by_user': lambda: posts_service.get_posts_by_user(random.randint(1, TOTAL_USERS)),
+        'create_post': lambda: posts_service.create_post(post),
+        'update_post': lambda: posts_service.update_post(random.randint(1, TOTAL_POSTS), post),
+        'delete_post': lambda: posts_service.delete_post(random.randint(1, TOTAL_POSTS)),
+        'get_user': lambda: users_service.get_user_by_id(random.randint(1, TOTAL_USERS)),
+        'get_all_users': users_service.get_all_users,
+    }
+
+
+# Scenario name -> operation weights
+SCENARIOS: Dict[str, Dict[str, int]] = {
+    'read_heavy': {'get_post': 5, 'get_user': 3, 'get_posts_by_user': 2},
+    'collections': {'get_all_posts': 1, 'get_all_users': 1},
+    'mixed': {'get_post': 4, 'get_user': 2, 'create_post': 2, 'update_post': 1, 'delete_post': 1},
+}
+
+
+class OperationStats(NamedTuple):
+    """Aggregated results for one operation"""
+
+    name: str
+    count: int
+    errors: int
+    throughput: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted sequence
+
+    Args:
+        sorted_values: Ascending values
+        pct: Percentile in [0, 100]
+
+    Returns:
+        Value at the percentile (0.0 for an empty sequence)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LoadReport:
+    """Latency samples and errors collected during a run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, List[float]] = {}
+        self._errors: Dict[str, int] = {}
+        self.duration = 0.0
+
+    def record(self, name: str, latency: float, ok: bool) -> None:
+        """Record one finished operation"""
+        with self._lock:
+            self._latencies.setdefault(name, []).append(latency)
+            if not ok:
+                self._errors[name] = self._errors.get(name, 0) + 1
+
+    def operations(self) -> List[OperationStats]:
+        """
+        Summarize every operation
+
+        Returns:
+            OperationStats per operation, sorted by name
+        """
+        with self._lock:
+            snapshot = {name: sorted(values) for name, values in self._latencies.items()}
+            errors = dict(self._errors)
+        elapsed = self.duration or 1e-9
+        return [
+            OperationStats(
+                name=name,
+                count=len(values),
+                errors=errors.get(name, 0),
+                throughput=len(values) / elapsed,
+                p50=percentile(values, 50),
+                p95=percentile(values, 95),
+                p99=percentile(values, 99),
+                max=values[-1] if values else 0.0,
+            )
+            for name, values in sorted(snapshot.items())
+        ]
+
+    @property
+    def total(self) -> int:
+        return sum(stats.count for stats in self.operations())
+
+    @property
+    def error_rate(self) -> float:
+        stats = self.operations()
+        count = sum(item.count for item in stats)
+        return sum(item.errors for item in stats) / count if count else 0.0
+
+    def format(self) -> str:
+        """Render the report as a fixed-width table (latencies in ms)"""
+        header = (f"{'operation':<20}{'count':>8}{'rps':>9}{'errors':>8}"
+                  f"{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+        lines = [header, '-' * len(header)]
+        for item in self.operations():
+            lines.append(
+                f"{item.name:<20}{item.count:>8}{item.throughput:>9.1f}{item.error_rate:>7.1%} "
+                f"{item.p50 * 1000:>8.1f}{item.p95 * 1000:>9.1f}{item.p99 * 1000:>9.1f}{item.max * 1000:>9.1f}"
+            )
+        lines.append(f"total {self.total} requests in {self.duration:.2f}s, "
+                     f"error rate {self.error_rate:.2%}")
+        return '\n'.join(lines)
+
+
+def _picker(operations: Mapping[str, Operation], weights: Mapping[str, int],
+            rng: random.Random) -> Callable[[], Tuple[str, Operation]]:
+    names = [name for name in weights if weights[name] > 0]
+    unknown = [name for name in names if name not in operations]
+    if unknown:
+        raise ValueError(f"Unknown operation(s): {unknown}")
+    name_weights = [weights[name] for name in names]
+
+    def pick() -> Tuple[str, Operation]:
+        name = rng.choices(names, weights=name_weights)[0]
+        return name, operations[name]
+
+    return pick
+
+
+def _execute(report: LoadReport, name: str, operation: Operation, started: float) -> None:
+    ok = True
+    try:
+        result = operation()
+        ok = bool(getattr(result, 'ok', True))
+    except Exception:
+        ok = False
+    report.record(name, time.perf_counter() - started, ok)
+
+
+def run_closed_loop(operations: Mapping[str, Operation], weights: Mapping[str, int],
+                    users: int, duration: float, think_time: float = 0.0,
+                    seed: Optional[int] = None) -> LoadReport:
+    """
+    Run N virtual users back to back for a fixed duration
+
+    Args:
+        operations: Named operations (see service_operations)
+        weights: Operation mix, e.g. SCENARIOS['read_heavy']
+        users: Number of concurrent virtual users
+        duration: Run time in seconds
+        think_time: Pause between a user's operations, in seconds
+        seed: Optional seed for a reproducible operation mix
+
+    Returns:
+        LoadReport
+    """
+    report = LoadReport()
+    deadline = time.perf_counter() + duration
+
+    def virtual_user(index: int) -> None:
+        pick = _picker(operations, weights, random.Random(None if seed is None else seed + index))
+        while time.perf_counter() < deadline:
+            name, operation = pick()
+            _execute(report, name, operation, time.perf_counter())
+            if think_time:
+                time.sleep(think_time)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=virtual_user, args=(index,), daemon=True) for index in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    report.duration = time.perf_counter() - start
+    return report
+
+
+def run_open_loop(operations: Mapping[str, Operation], weights: Mapping[str, int],
+                  start_rate: float, duration: float, end_rate: Optional[float] = None,
+                  max_workers: int = LOAD_MAX_WORKERS, seed: Optional[int] = None) -> LoadReport:
+    """
+    Start operations on an arrival schedule (constant rate, or a linear ramp)
+
+    Args:
+        operations: Named operations (see service_operations)
+        weights: Operation mix, e.g. SCENARIOS['read_heavy']
+        start_rate: Arrivals per second at the start
+        duration: Run time in seconds
+        end_rate: Arrivals per second at the end (defaults to start_rate)
+        max_workers: Maximum operations in flight
+        seed: Optional seed for a reproducible operation mix
+
+    Returns:
+        LoadReport
+    """
+    if start_rate <= 0 or (end_rate is not None and end_rate <= 0):
+        raise ValueError("Arrival rates must be positive")
+    end_rate = start_rate if end_rate is None else end_rate
+    pick = _picker(operations, weights, random.Random(seed))
+    report = LoadReport()
+
+    start = time.perf_counter()
+    offset = 0.0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while offset < duration:
+            scheduled = start + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            name, operation = pick()
+            executor.submit(_execute, report, name, operation, scheduled)
+            rate = start_rate + (end_rate - start_rate) * (offset / duration)
+            offset += 1.0 / rate
+    report.duration = time.perf_counter() - start
+    return report
+
+
+def load_client(base_url: str, concurrency: int, **kwargs):
+    """
+    APIClient for a load run
+
+    Requests are sent once: a retry would hide a failure from the error
+    rate and add load the profile did not ask for. Identical GETs are not
+    coalesced, since virtual users are independent clients.
+
+    Args:
+        base_url: API base URL
+        concurrency: Requests in flight at most (sizes the connection pool)
+        **kwargs: Further APIClient arguments, e.g. cassette
+
+    Returns:
+        APIClient (use it as a context manager)
+    """
+    from utils.helpers import APIClient
+    from utils.resilience import Resilience, RetryPolicy
+
+    return APIClient(base_url, pool_maxsize=max(concurrency, POOL_MAXSIZE), coalesce=False,
+                     resilience=Resilience(retry=RetryPolicy(max_attempts=1)), **kwargs)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """CLI entry point; returns a non-zero exit code when the error budget is exceeded"""
+    parser = argparse.ArgumentParser(description="Load test the API through the service layer")
+    parser.add_argument('--base-url', default=BASE_URL, help="API base URL")
+    parser.add_argument('--local', action='store_true', help="Start and target the local stand-in API")
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), default='read_heavy')
+    parser.add_argument('--mode', choices=('closed', 'constant', 'ramp'), default='closed')
+    parser.add_argument('--users', type=int, default=10, help="Virtual users (closed mode)")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Seconds between a user's calls")
+    parser.add_argument('--rate', type=float, default=50.0, help="Arrivals/s (constant) or start rate (ramp)")
+    parser.add_argument('--end-rate', type=float, help="Arrivals/s at the end of a ramp")
+    parser.add_argument('--duration', type=float, default=10.0, help="Run time in seconds")
+    parser.add_argument('--max-workers', type=int, default=LOAD_MAX_WORKERS)
+    parser.add_argument('--max-error-rate', type=float, default=0.0,
+                        help="Fail (exit 1) above this error rate, e.g. 0.01")
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+
+    # Imported here so `python -m utils.loadgen --help` stays light
+    from services import PostsService, UsersService
+    from utils.local_server import LocalAPIServer
+
+    server = LocalAPIServer().start() if args.local else None
+    base_url = server.base_url if server else args.base_url
+    concurrency = args.users if args.mode == 'closed' else args.max_workers
+    try:
+        with load_client(base_url, concurrency) as client:
+            operations = service_operations(PostsService(client), UsersService(client))
+            weights = SCENARIOS[args.scenario]
+            if args.mode == 'closed':
+                report = run_closed_loop(operations, weights, args.users, args.duration,
+                                         think_time=args.think_time, seed=args.seed)
+            else:
+                end_rate = args.end_rate if args.mode == 'ramp' else None
+                report = run_open_loop(operations, weights, args.rate, args.duration,
+                                       end_rate=end_rate, max_workers=args.max_workers, seed=args.seed)
+    finally:
+        if server:
+            server.stop()
+
+    print(f"{args.scenario} / {args.mode} against {base_url}")
+    print(report.format())
+    return 1 if report.error_rate > args.max_error_rate else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
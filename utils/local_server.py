@@ -0,0 +1,429 @@
+"""
+Local stand-in for the JSONPlaceholder API
+
+Serves every resource in ENDPOINTS from deterministic in-memory data with the
+same filter, pagination and nested routes as the public API, and fakes writes
+the same way (nothing is persisted). Runs in a background thread, so a test
+session can point APIClient at it for fast offline runs. An optional
+FaultProfile (utils.faults) makes it slow or unreliable on purpose.
+"""
+import hashlib
+import json
+import re
+import socket
+import struct
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from config.settings import ENDPOINTS, LOCAL_API_HOST, LOCAL_API_PORT, LOCAL_API_MAX_AGE
+from utils.faults import Fault, FaultProfile
+
+
+# Parent resource -> (child resource, foreign key) for nested routes
+NESTED_ROUTES = {
+    ('posts', 'comments'): 'postId',
+    ('users', 'posts'): 'userId',
+    ('users', 'albums'): 'userId',
+    ('users', 'todos'): 'userId',
+    ('albums', 'photos'): 'albumId',
+}
+
+_FIRST_NAMES = ['Ada', 'Brian', 'Carla', 'Dmitri', 'Elena', 'Farid', 'Grace', 'Hugo', 'Ines', 'Jonas']
+_LAST_NAMES = ['Lovelace', 'Kernighan', 'Mendes', 'Volkov', 'Rossi', 'Haddad', 'Hopper', 'Larsen', 'Soto', 'Berg']
+_WORDS = ['lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consectetur', 'adipiscing', 'elit', 'sed', 'do',
+          'eiusmod', 'tempor', 'incididunt', 'ut', 'labore', 'et', 'dolore', 'magna', 'aliqua', 'enim']
+
+
+def _words(seed: int, count: int) -> str:
+    return ' '.join(_WORDS[(seed * 7 + i * 3) % len(_WORDS)] for i in range(count))
+
+
+def build_dataset() -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Build the deterministic dataset with JSONPlaceholder's shapes and sizes
+
+    Returns:
+        Dictionary mapping resource name to its list of objects
+    """
+    users = []
+    for user_id in range(1, 11):
+        first, last = _FIRST_NAMES[user_id - 1], _LAST_NAMES[user_id - 1]
+        username = f"{first}.{last}".lower()
+        users.append({
+            'id': user_id,
+            'name': f"{first} {last}",
+            'username': username,
+            'email': f"{username}@example.com",
+            'address': {
+                'street': f"{_words(user_id, 1).title()} Street",
+                'suite': f"Suite {100 + user_id}",
+                'city': f"{_words(user_id + 3, 1).title()}ville",
+                'zipcode': f"{10000 + user_id * 137:05d}",
+                'geo': {'lat': f"{-37.3159 + user_id:.4f}", 'lng': f"{81.1496 - user_id:.4f}"},
+            },
+            'phone': f"1-555-010-{user_id:04d}",
+            'website': f"{last.lower()}.example.org",
+            'company': {
+                'name': f"{last} Group",
+                'catchPhrase': _words(user_id, 4),
+                'bs': _words(user_id + 1, 3),
+            },
+        })
+    posts = [
+        {'userId': (i - 1) // 10 + 1, 'id': i, 'title': _words(i, 5), 'body': _words(i + 1, 20)}
+        for i in range(1, 101)
+    ]
+    comments = [
+        {'postId': (i - 1) // 5 + 1, 'id': i, 'name': _words(i, 4),
+         'email': f"commenter{i}@example.net", 'body': _words(i + 2, 15)}
+        for i in range(1, 501)
+    ]
+    albums = [
+        {'userId': (i - 1) // 10 + 1, 'id': i, 'title': _words(i, 3)}
+        for i in range(1, 101)
+    ]
+    photos = [
+        {'albumId': (i - 1) // 50 + 1, 'id': i, 'title': _words(i, 4),
+         'url': f"https://via.placeholder.com/600/{i:06x}",
+         'thumbnailUrl': f"https://via.placeholder.com/150/{i:06x}"}
+        for i in range(1, 5001)
+    ]
+    todos = [
+        {'userId': (i - 1) // 20 + 1, 'id': i, 'title': _words(i, 4), 'completed': i % 3 == 0}
+        for i in range(1, 201)
+    ]
+    return {
+        'posts': posts,
+        'users': users,
+        'comments': comments,
+        'albums': albums,
+        'photos': photos,
+        'todos': todos,
+    }
+
+
+def _field(item: Dict[str, Any], path: str) -> Any:
+    value: Any = item
+    for part in path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def _as_query_value(value: Any) -> str:
+    # json-server compares query strings against the stringified field value
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def _int_param(params: Dict[str, List[str]], name: str) -> Optional[int]:
+    """Integer query parameter, or None when missing or not a number (ignored like the real API)"""
+    try:
+        return int(params[name][0])
+    except (KeyError, ValueError):
+        return None
+
+
+class LocalAPIState:
+    """In-memory resources plus the routing logic shared by every request"""
+
+    def __init__(self, dataset: Optional[Dict[str, List[Dict[str, Any]]]] = None):
+        self.resources = dataset if dataset is not None else build_dataset()
+        self.by_id = {
+            name: {item['id']: item for item in items}
+            for name, items in self.resources.items()
+        }
+        self.routes = {path.strip('/'): name for name, path in ENDPOINTS.items()}
+
+    def query(self, items: List[Dict[str, Any]], params: Dict[str, List[str]],
+              base_path: str) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        """
+        Apply field filters and _start/_end/_limit/_page slicing
+
+        Args:
+            items: Collection to filter
+            params: Parsed query string (repeated keys are OR-ed)
+            base_path: Request path, used to build Link headers
+
+        Returns:
+            Tuple of (matching items, extra response headers)
+        """
+        for key, values in params.items():
+            if key.startswith('_'):
+                continue
+            wanted = set(values)
+            items = [item for item in items if _as_query_value(_field(item, key)) in wanted]
+
+        headers: Dict[str, str] = {}
+        total = len(items)
+        limit = _int_param(params, '_limit')
+        page = _int_param(params, '_page')
+        start = _int_param(params, '_start')
+        end = _int_param(params, '_end')
+
+        if page is not None:
+            page = max(page, 1)
+            per_page = limit or 10
+            start = (page - 1) * per_page
+            items = items[start:start + per_page]
+            headers['X-Total-Count'] = str(total)
+            headers['Link'] = self._link_header(base_path, params, page, per_page, total)
+        elif start is not None or end is not None or limit is not None:
+            start = start or 0
+            if end is None:
+                end = start + limit if limit is not None else total
+            items = items[start:end]
+            headers['X-Total-Count'] = str(total)
+        return items, headers
+
+    @staticmethod
+    def _link_header(base_path: str, params: Dict[str, List[str]], page: int,
+                     per_page: int, total: int) -> str:
+        last = max((total + per_page - 1) // per_page, 1)
+        others = '&'.join(
+            f"{key}={value}" for key, values in params.items()
+            if key not in ('_page', '_limit') for value in values
+        )
+
+        def url(number: int) -> str:
+            query = f"_page={number}&_limit={per_page}"
+            return f"{base_path}?{others + '&' if others else ''}{query}"
+
+        links = [f'<{url(1)}>; rel="first"']
+        if page > 1:
+            links.append(f'<{url(page - 1)}>; rel="prev"')
+        if page < last:
+            links.append(f'<{url(page + 1)}>; rel="next"')
+        links.append(f'<{url(last)}>; rel="last"')
+        return ', '.join(links)
+
+    def handle(self, method: str, path: str, params: Dict[str, List[str]],
+               body: Optional[Any]) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        Route one request
+
+        Args:
+            method: HTTP method
+            path: URL path without query string
+            params: Parsed query string
+            body: Decoded JSON request body, if any
+
+        Returns:
+            Tuple of (status code, JSON-serializable payload, extra headers)
+        """
+        parts = [part for part in path.split('/') if part]
+        if not parts or parts[0] not in self.routes:
+            return 404, {}, {}
+        resource = self.routes[parts[0]]
+        items = self.resources[resource]
+
+        if len(parts) == 1:
+            if method == 'GET':
+                found, headers = self.query(items, params, path)
+                return 200, found, headers
+            if method == 'POST':
+                created = dict(body) if isinstance(body, dict) else {}
+                created['id'] = len(items) + 1
+                return 201, created, {}
+            return 404, {}, {}
+
+        if not re.fullmatch(r'\d+', parts[1]):
+            return 404, {}, {}
+        item_id = int(parts[1])
+        item = self.by_id[resource].get(item_id)
+
+        if len(parts) == 3:
+            child_name = self.routes.get(parts[2])
+            foreign_key = NESTED_ROUTES.get((resource, child_name))
+            if foreign_key is None or method != 'GET':
+                return 404, {}, {}
+            children = [child for child in self.resources[child_name] if child[foreign_key] == item_id]
+            found, headers = self.query(children, params, path)
+            return 200, found, headers
+        if len(parts) > 3:
+            return 404, {}, {}
+
+        if method == 'GET':
+            return (200, item, {}) if item is not None else (404, {}, {})
+        if method == 'PUT':
+            if item is None:
+                # JSONPlaceholder fails updates of unknown ids with a 500
+                return 500, {}, {}
+            updated = dict(body) if isinstance(body, dict) else {}
+            updated['id'] = item_id
+            return 200, updated, {}
+        if method == 'PATCH':
+            if item is None:
+                return 500, {}, {}
+            patched = dict(item)
+            patched.update(body if isinstance(body, dict) else {})
+            patched['id'] = item_id
+            return 200, patched, {}
+        if method == 'DELETE':
+            return 200, {}, {}
+        return 404, {}, {}
+
+
+class _LocalAPIHandler(BaseHTTPRequestHandler):
+    """Thin HTTP/1.1 keep-alive handler delegating to LocalAPIState"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'LocalJSONPlaceholder/1.0'
+    # Headers and body go out in separate writes; without TCP_NODELAY every
+    # keep-alive response waits out the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    def _dispatch(self) -> None:
+        split = urlsplit(self.path)
+        params = parse_qs(split.query, keep_blank_values=True)
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            body = None
+
+        faults = self.server.faults
+        fault = faults.decide(self.command, split.path) if faults is not None else None
+        if fault is not None:
+            if fault.latency:
+                time.sleep(fault.latency)
+            if fault.reset:
+                self._reset()
+                return
+            if fault.status is not None:
+                self.send_json(fault.status, {}, fault.headers)
+                return
+
+        status, payload, headers = self.server.state.handle(self.command, split.path, params, body)
+        self.send_json(status, payload, headers, fault)
+
+    def _reset(self) -> None:
+        # SO_LINGER with a zero timeout turns close() into a TCP RST
+        self.close_connection = True
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+        self.rfile.close()
+        self.connection.close()
+
+    def _write_slowly(self, data: bytes, fault: Fault) -> None:
+        if fault.stall:
+            half = len(data) // 2
+            self.wfile.write(data[:half])
+            time.sleep(fault.stall)
+            data = data[half:]
+        if fault.drip:
+            size, interval = fault.drip
+            for start in range(0, len(data), size):
+                self.wfile.write(data[start:start + size])
+                time.sleep(interval)
+        else:
+            self.wfile.write(data)
+
+    def send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None,
+                  fault: Optional[Fault] = None) -> None:
+        data = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        headers = dict(headers or {})
+        if self.command in ('GET', 'HEAD') and status == 200:
+            # Same caching headers as JSONPlaceholder, including 304 revalidation
+            etag = f'W/"{len(data):x}-{hashlib.sha1(data).hexdigest()[:27]}"'
+            headers['ETag'] = etag
+            headers['Cache-Control'] = f"max-age={LOCAL_API_MAX_AGE}"
+            if etag in (self.headers.get('If-None-Match') or ''):
+                status, data = 304, b''
+
+        self.send_response(status)
+        if status != 304:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command == 'HEAD':
+            return
+        if fault is not None and (fault.drip or fault.stall):
+            self._write_slowly(data, fault)
+        else:
+            self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _dispatch
+
+    def log_message(self, format: str, *args) -> None:
+        # Keep test output quiet
+        pass
+
+
+class _LocalAPIHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, handler, state: LocalAPIState,
+                 faults: Optional[FaultProfile] = None):
+        super().__init__(address, handler)
+        self.state = state
+        self.faults = faults
+
+    def handle_error(self, request, client_address) -> None:
+        # Clients hanging up on a stalled or dripping response are expected
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class LocalAPIServer:
+    """Background-thread stand-in server for the JSONPlaceholder API"""
+
+    def __init__(self, host: str = LOCAL_API_HOST, port: int = LOCAL_API_PORT,
+                 state: Optional[LocalAPIState] = None,
+                 faults: Optional[FaultProfile] = None):
+        """
+        Initialize the server (call start() or use it as a context manager)
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            state: Optional pre-built LocalAPIState
+            faults: Optional FaultProfile to inject latency and errors
+        """
+        self.host = host
+        self.port = port
+        self.state = state or LocalAPIState()
+        self.faults = faults
+        self._httpd: Optional[_LocalAPIHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to hand to APIClient"""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> 'LocalAPIServer':
+        """Bind the socket and start serving in a daemon thread"""
+        self._httpd = _LocalAPIHTTPServer((self.host, self.port), _LocalAPIHandler, self.state,
+                                          self.faults)
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name='local-api-server', daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the socket"""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'LocalAPIServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,230 @@
+"""
+Statistical performance baselines
+
+A performance test takes N latency samples after a warm-up and compares them
+with the samples stored for it in the baseline file:
+
+- Mann-Whitney U (one-sided) asks whether the new samples are stochastically
+  slower than the baseline
+- a bootstrap confidence interval on the p95 ratio catches tail regressions
+  the rank test can miss
+
+A test fails only when a slowdown is both statistically significant and
+larger than a minimum effect size, so network jitter alone does not flip it.
+Baselines never change implicitly; they are rewritten only when the run is
+started with --update-perf-baseline.
+"""
+import json
+import math
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from config.settings import PERF_ALPHA, PERF_BOOTSTRAP_ROUNDS, PERF_MIN_EFFECT
+
+
+def quantile(values: Sequence[float], q: float) -> float:
+    """
+    Linear-interpolation quantile
+
+    Args:
+        values: Samples (any order)
+        q: Quantile in [0, 1]
+
+    Returns:
+        The q-quantile
+    """
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def mann_whitney_greater(current: Sequence[float], baseline: Sequence[float]) -> float:
+    """
+    One-sided Mann-Whitney U test that current tends to be larger than baseline
+
+    Uses the normal approximation with tie and continuity corrections, which
+    is accurate for the sample sizes used here (10+ per side).
+
+    Args:
+        current: New samples
+        baseline: Baseline samples
+
+    Returns:
+        p-value (small means current is significantly slower)
+    """
+    n1, n2 = len(current), len(baseline)
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    rank_sum = 0.0
+    tie_term = 0.0
+    index = 0
+    while index < len(combined):
+        end = index
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[index][0]:
+            end += 1
+        average_rank = (index + end) / 2 + 1
+        ties = end - index + 1
+        tie_term += ties ** 3 - ties
+        rank_sum += average_rank * sum(1 for _, group in combined[index:end + 1] if group == 0)
+        index = end + 1
+
+    n = n1 + n2
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _ratio(current: float, baseline: float) -> float:
+    """current / baseline, with a zero baseline giving inf (or 1.0 if both are zero)"""
+    if baseline:
+        return current / baseline
+    return math.inf if current else 1.0
+
+
+def bootstrap_ratio_ci(current: Sequence[float], baseline: Sequence[float],
+                       statistic: Callable[[Sequence[float]], float],
+                       rounds: int = PERF_BOOTSTRAP_ROUNDS, alpha: float = PERF_ALPHA,
+                       seed: int = 0) -> Tuple[float, float]:
+    """
+    Percentile bootstrap CI for statistic(current) / statistic(baseline)
+
+    Args:
+        current: New samples
+        baseline: Baseline samples
+        statistic: Function of a sample, e.g. lambda s: quantile(s, 0.95)
+        rounds: Bootstrap resamples
+        alpha: Two-sided error rate (0.01 gives a 99% interval)
+        seed: RNG seed so a given pair of samples always gets the same CI
+
+    Returns:
+        (lower, upper) bounds of the ratio
+    """
+    rng = random.Random(seed)
+    ratios = []
+    for _ in range(rounds):
+        resampled_current = rng.choices(current, k=len(current))
+        resampled_baseline = rng.choices(baseline, k=len(baseline))
+        denominator = statistic(resampled_baseline)
+        ratios.append(_ratio(statistic(resampled_current), denominator))
+    return quantile(ratios, alpha / 2), quantile(ratios, 1 - alpha / 2)
+
+
+class Comparison(NamedTuple):
+    """Result of comparing new samples with a baseline"""
+
+    p_value: float
+    median_ratio: float
+    p95_ratio: float
+    p95_ci: Tuple[float, float]
+    regressed: bool
+
+    def describe(self) -> str:
+        low, high = self.p95_ci
+        return (f"median x{self.median_ratio:.2f} (Mann-Whitney p={self.p_value:.4f}), "
+                f"p95 x{self.p95_ratio:.2f} (CI {low:.2f}-{high:.2f})")
+
+
+def compare(current: Sequence[float], baseline: Sequence[float],
+            alpha: float = PERF_ALPHA, min_effect: float = PERF_MIN_EFFECT) -> Comparison:
+    """
+    Decide whether current samples are a significant regression
+
+    Args:
+        current: New latency samples (seconds)
+        baseline: Baseline latency samples (seconds)
+        alpha: Significance level
+        min_effect: Smallest slowdown that counts, e.g. 0.10 for +10%
+
+    Returns:
+        Comparison; regressed is True if the median is significantly slower
+        by more than min_effect, or the whole p95 CI lies above 1 + min_effect
+    """
+    p95 = lambda sample: quantile(sample, 0.95)
+    p_value = mann_whitney_greater(current, baseline)
+    median_ratio = _ratio(statistics.median(current), statistics.median(baseline))
+    p95_ratio = _ratio(p95(current), p95(baseline))
+    p95_ci = bootstrap_ratio_ci(current, baseline, p95, alpha=alpha)
+    regressed = ((p_value < alpha and median_ratio > 1 + min_effect)
+                 or p95_ci[0] > 1 + min_effect)
+    return Comparison(p_value, median_ratio, p95_ratio, p95_ci, regressed)
+
+
+def baseline_key(nodeid: str, target: str) -> str:
+    """
+    Store key of a test's baseline for one target
+
+    Args:
+        nodeid: Test id
+        target: What was measured, e.g. the API host, 'local' or 'cassette'
+
+    Returns:
+        Key such as 'tests/test_posts.py::test_response_time@jsonplaceholder.typicode.com'
+    """
+    return f"{nodeid}@{target}"
+
+
+def sample_latency(func: Callable[[], Any], samples: int, warmup: int) -> List[float]:
+    """
+    Time func after discarding warm-up calls
+
+    Args:
+        func: Operation to time (e.g. a service call)
+        samples: Number of timed calls
+        warmup: Untimed calls first (connection setup, server caches)
+
+    Returns:
+        Latencies in seconds
+    """
+    for _ in range(warmup):
+        func()
+    latencies = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+class BaselineStore:
+    """JSON file of latency samples keyed by test id and target (see baseline_key)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as handle:
+                self._data = json.load(handle)
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """Baseline samples for a test, or None"""
+        entry = self._data.get(key)
+        return entry['samples'] if entry else None
+
+    def set(self, key: str, samples: Sequence[float]) -> None:
+        """Replace the baseline samples for a test"""
+        self._data[key] = {
+            'samples': [round(value, 6) for value in samples],
+            'median': round(statistics.median(samples), 6),
+            'p95': round(quantile(samples, 0.95), 6),
+            'recorded': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        }
+
+    def keys(self) -> List[str]:
+        return sorted(self._data)
+
+    def save(self) -> None:
+        """Write the file atomically"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+            json.dump(self._data, handle, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
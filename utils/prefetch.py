@@ -0,0 +1,43 @@
+"""
+Run-wide prefetch of reference data shared across xdist workers
+
+The first process to need the reference datasets fetches them and writes a
+JSON snapshot; every other process (xdist worker) waits on the same file
+lock and then reads the snapshot instead of repeating the requests.
+"""
+import json
+import os
+import tempfile
+from typing import Any, Callable, Dict, Mapping
+
+from utils.locks import file_lock
+
+
+def load_or_fetch(path: str, fetchers: Mapping[str, Callable[[], Any]]) -> Dict[str, str]:
+    """
+    Read the snapshot at path, fetching and writing it first if needed
+
+    Datasets missing from an existing snapshot are fetched and added, so
+    processes asking for different datasets still share one file.
+
+    Args:
+        path: Snapshot file; path + '.lock' guards it
+        fetchers: Dataset name -> callable returning the decoded JSON
+
+    Returns:
+        Dataset name -> JSON text (decode per use so callers get private copies)
+    """
+    with file_lock(f"{path}.lock"):
+        snapshot: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as handle:
+                snapshot = json.load(handle)
+        missing = [name for name in fetchers if name not in snapshot]
+        if missing:
+            for name in missing:
+                snapshot[name] = json.dumps(fetchers[name](), separators=(',', ':'))
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump(snapshot, handle)
+            os.replace(temp_path, path)
+    return {name: snapshot[name] for name in fetchers}
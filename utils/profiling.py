@@ -0,0 +1,234 @@
+"""
+Sampling profiler with tracemalloc, attributing time and memory to phases
+
+A background thread samples the stack of every busy thread (the test
+thread plus any pool threads it started) every PROFILE_INTERVAL seconds.
+Each sample is classified by its innermost recognizable frame:
+
+- network: requests/urllib3/sockets and the client transport layers
+  (connection pool, resilience, rate limiter, single-flight)
+- decode: JSON encoding and decoding (APIResponse.json, json, json_stream)
+- validation: utils.helpers validate_*, the schema registry, bulk
+  validation and jsonschema
+- other: everything else (test code, fixtures, pytest)
+
+Times are thread-seconds, so a test with four busy pool threads can record
+more than its wall time; a thread only waiting for other threads is not
+counted. While tracemalloc is tracing, every tick also reads the traced
+memory, and each phase seen in that tick is charged with the highest level
+observed (relative to the start of the test).
+
+Stacks are kept in collapsed form ("a;b;c 12"), which flamegraph.pl,
+speedscope and inferno read directly.
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import PROFILE_INTERVAL, PROFILE_TOP
+
+PHASES = ('network', 'decode', 'validation', 'other')
+
+_NETWORK_PATHS = (
+    '/requests/', '/urllib3/', '/aiohttp/', '/http/client.py', '/socket.py', '/ssl.py',
+    '/selectors.py', 'utils/connection_pool.py', 'utils/resilience.py', 'utils/rate_limiter.py',
+    'utils/single_flight.py', 'utils/http_cache.py', 'utils/cassette.py',
+)
+_DECODE_PATHS = ('/json/', 'utils/json_stream.py', 'utils/json_codec.py')
+_VALIDATION_PATHS = ('utils/schema_registry.py', 'utils/bulk_validation.py', '/jsonschema/')
+# Threads whose stacks pass through these are not test work (stand-in server, xdist IO)
+_IGNORED_PATHS = ('/socketserver.py', '/execnet/')
+
+_labels: Dict[CodeType, Tuple[str, str]] = {}
+
+
+def _label(code: CodeType) -> Tuple[str, str]:
+    """(short path, 'path:qualname') for a code object, cached"""
+    cached = _labels.get(code)
+    if cached is None:
+        path = code.co_filename.replace(os.sep, '/')
+        for marker in ('/site-packages/', '/dist-packages/'):
+            if marker in path:
+                path = '/' + path.split(marker, 1)[1]
+                break
+        else:
+            cwd = os.getcwd().replace(os.sep, '/') + '/'
+            if path.startswith(cwd):
+                path = path[len(cwd):]
+        name = getattr(code, 'co_qualname', code.co_name)
+        cached = _labels[code] = (path, f"{path.rsplit('/', 1)[-1]}:{name}")
+    return cached
+
+
+def classify(stack: List[CodeType]) -> str:
+    """
+    Phase of one sampled stack
+
+    Args:
+        stack: Code objects, innermost first
+
+    Returns:
+        One of PHASES
+    """
+    for code in stack:
+        path, _ = _label(code)
+        name = code.co_name
+        if path.endswith('utils/helpers.py'):
+            if name.startswith('validate_'):
+                return 'validation'
+            if name in ('_send', 'request', 'iter_json'):
+                return 'network'
+            continue
+        if path.endswith('utils/async_client.py'):
+            return 'decode' if name == 'json' else 'network'
+        if name == 'json' and path.endswith('/requests/models.py'):
+            return 'decode'
+        if any(marker in path for marker in _VALIDATION_PATHS):
+            return 'validation'
+        if any(marker in path for marker in _DECODE_PATHS):
+            return 'decode'
+        if any(marker in path for marker in _NETWORK_PATHS):
+            return 'network'
+    return 'other'
+
+
+def _is_idle(stack: List[CodeType]) -> bool:
+    innermost_path, _ = _label(stack[0])
+    # An idle ThreadPoolExecutor worker blocks in C code called from _worker
+    if stack[0].co_name == '_worker' and innermost_path.endswith('concurrent/futures/thread.py'):
+        return True
+    return any(marker in _label(code)[0] for code in stack for marker in _IGNORED_PATHS)
+
+
+class Profile:
+    """Samples and per-phase totals of one profiled test"""
+
+    def __init__(self):
+        self.stacks: Counter = Counter()
+        self.functions: Counter = Counter()
+        self.phase_time = dict.fromkeys(PHASES, 0.0)
+        self.phase_peak = dict.fromkeys(PHASES, 0)
+        self.peak_memory = 0
+        self.samples = 0
+        self.duration = 0.0
+
+    def folded(self) -> str:
+        """Collapsed stacks, one 'frame;frame;... count' line each"""
+        return ''.join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+    def summary(self, top: int = PROFILE_TOP) -> Dict[str, Any]:
+        """
+        JSON-serializable summary (e.g. to ship from an xdist worker)
+
+        Args:
+            top: Number of hottest functions to keep
+
+        Returns:
+            Dictionary with duration, samples, phase_time, phase_peak,
+            peak_memory and functions (leaf frame -> thread-seconds)
+        """
+        return {
+            'duration': self.duration,
+            'samples': self.samples,
+            'phase_time': dict(self.phase_time),
+            'phase_peak': dict(self.phase_peak),
+            'peak_memory': self.peak_memory,
+            'functions': dict(self.functions.most_common(top)),
+        }
+
+
+class SamplingProfiler:
+    """Samples thread stacks in the background between start() and stop()"""
+
+    def __init__(self, interval: float = PROFILE_INTERVAL, root: Optional[CodeType] = None):
+        """
+        Initialize the profiler
+
+        Args:
+            interval: Seconds between samples (the GIL switch interval is a
+                practical lower bound while other threads run Python code)
+            root: Code object of the test function; frames above it are
+                dropped from the test thread's stacks
+        """
+        self.interval = interval
+        self.root = root
+        self.profile = Profile()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._memory_base = 0
+        self._start = 0.0
+
+    def start(self) -> 'SamplingProfiler':
+        self.profile = Profile()
+        self._stop.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._memory_base = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='api-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Profile:
+        """
+        Stop sampling
+
+        Returns:
+            Profile of the sampled interval
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        profile = self.profile
+        profile.duration = time.perf_counter() - self._start
+        if tracemalloc.is_tracing():
+            profile.peak_memory = max(tracemalloc.get_traced_memory()[1] - self._memory_base, 0)
+        return profile
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            self.sample(now - last)
+            last = now
+
+    def sample(self, elapsed: float) -> None:
+        """Record one sample of every busy thread, weighted by elapsed seconds"""
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        profile = self.profile
+        phases = set()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = self._stack(frame)
+            if not stack or _is_idle(stack):
+                continue
+            phase = classify(stack)
+            if phase == 'other' and _label(stack[0])[0].endswith('/threading.py'):
+                continue  # waiting on pool threads, which are sampled themselves
+            phases.add(phase)
+            profile.samples += 1
+            profile.phase_time[phase] += elapsed
+            profile.functions[_label(stack[0])[1]] += elapsed
+            frames = [_label(code)[1] for code in reversed(stack)]
+            profile.stacks[';'.join([names.get(ident, 'thread'), *frames])] += 1
+        if phases and tracemalloc.is_tracing():
+            current = tracemalloc.get_traced_memory()[0] - self._memory_base
+            for phase in phases:
+                profile.phase_peak[phase] = max(profile.phase_peak[phase], current)
+
+    def _stack(self, frame: Optional[FrameType]) -> List[CodeType]:
+        stack: List[CodeType] = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            if frame.f_code is self.root:
+                break
+            frame = frame.f_back
+        return stack
@@ -0,0 +1,244 @@
+"""
+Token-bucket rate limiting shared across processes
+
+Each request takes one token from its host bucket and, if configured, from
+its endpoint bucket (/posts/{id} style templates). Buckets refill at `rate`
+tokens per second up to `burst`, so bursts are smoothed to the configured
+rate. A 429/503 with Retry-After blocks the whole host until that time.
+
+Bucket state lives in memory by default. Given a path, it lives in a small
+JSON file guarded by a lock file, so every xdist worker (or load generator
+process) draws from one global budget. Without any budget configured only
+Retry-After applies, and requests just stat the file, re-reading it (without
+the lock) only when another process has changed it.
+"""
+import email.utils
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from config.settings import RATE_LIMIT, RATE_LIMIT_BURST, ENDPOINT_RATE_LIMITS, RETRY_AFTER_MAX
+from utils.locks import file_lock
+from utils.timing import endpoint_template
+
+# key -> [tokens, last refill (epoch seconds), blocked until (epoch seconds)]
+State = Dict[str, List[float]]
+
+
+class RateLimit(NamedTuple):
+    """
+    Sustained requests per second and the largest burst allowed
+
+    A request takes a whole token, so RateLimiter raises a burst below 1
+    (e.g. RateLimit(0.5, 0.5)) to 1; otherwise the bucket could never fill.
+    """
+
+    rate: float
+    burst: float
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None,
+                      maximum: float = RETRY_AFTER_MAX) -> Optional[float]:
+    """
+    Seconds to wait according to a Retry-After header
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+        now: Current epoch time (defaults to time.time())
+        maximum: Upper bound, so a bogus header cannot stall the run
+
+    Returns:
+        Delay in seconds between 0 and maximum, or None if absent or unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return min(float(value), maximum)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return min(max(when.timestamp() - (time.time() if now is None else now), 0.0), maximum)
+
+
+def _whole_burst(limit: Optional[RateLimit]) -> Optional[RateLimit]:
+    if limit is None or limit.burst >= 1:
+        return limit
+    return limit._replace(burst=1.0)
+
+
+class _MemoryStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state: State = {}
+
+    def transact(self, update: Callable[[State], Tuple[Any, bool]]) -> Any:
+        with self._lock:
+            result, _ = update(self._state)
+            return result
+
+    def peek(self) -> State:
+        return self._state
+
+
+class _FileStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._cached: State = {}
+
+    def transact(self, update: Callable[[State], Tuple[Any, bool]]) -> Any:
+        with self._lock, file_lock(f"{self.path}.lock"):
+            try:
+                with open(self.path, encoding='utf-8') as handle:
+                    state = json.load(handle)
+            except (OSError, ValueError):
+                state = {}
+            result, dirty = update(state)
+            if dirty:
+                # Replace atomically so peek() never reads a half-written file
+                directory = os.path.dirname(os.path.abspath(self.path))
+                fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                    json.dump(state, handle)
+                os.replace(temp_path, self.path)
+            return result
+
+    def peek(self) -> State:
+        """Read-only view of the state, re-read only when the file changed"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return {}
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if signature != self._signature:
+            try:
+                with open(self.path, encoding='utf-8') as handle:
+                    self._cached = json.load(handle)
+            except (OSError, ValueError):
+                return {}
+            self._signature = signature
+        return self._cached
+
+
+class RateLimiter:
+    """Per-host and per-endpoint token buckets, optionally shared through a file"""
+
+    def __init__(self, host_limit: Optional[RateLimit] = None,
+                 endpoint_limits: Optional[Dict[str, RateLimit]] = None,
+                 path: Optional[str] = None, stats=None):
+        """
+        Initialize the limiter
+
+        Args:
+            host_limit: Budget per host (None: only Retry-After is enforced)
+            endpoint_limits: Budgets per endpoint template, e.g. {'/posts/{id}': ...}
+            path: State file shared by all processes using the same budget
+            stats: Object with increment(name, amount) for throttling counters
+        """
+        self.host_limit = _whole_burst(host_limit)
+        self.endpoint_limits = {
+            template: _whole_burst(limit) for template, limit in (endpoint_limits or {}).items()
+        }
+        self.store = _FileStore(path) if path else _MemoryStore()
+        self.stats = stats
+
+    @classmethod
+    def from_settings(cls, path: Optional[str] = None, stats=None) -> 'RateLimiter':
+        """Build a limiter from RATE_LIMIT, RATE_LIMIT_BURST and ENDPOINT_RATE_LIMITS"""
+        host_limit = RateLimit(RATE_LIMIT, RATE_LIMIT_BURST or RATE_LIMIT) if RATE_LIMIT else None
+        endpoint_limits = {
+            template: RateLimit(rate, RATE_LIMIT_BURST or rate)
+            for template, rate in ENDPOINT_RATE_LIMITS.items()
+        }
+        return cls(host_limit, endpoint_limits, path, stats)
+
+    def _buckets(self, host: str, path: str) -> List[Tuple[str, Optional[RateLimit]]]:
+        buckets = [(f"host:{host}", self.host_limit)]
+        template = endpoint_template(path)
+        if template in self.endpoint_limits:
+            buckets.append((f"endpoint:{host}{template}", self.endpoint_limits[template]))
+        return buckets
+
+    @staticmethod
+    def _take(state: State, buckets, now: float) -> Tuple[float, bool]:
+        wait = 0.0
+        refilled = []
+        for key, limit in buckets:
+            tokens, updated, blocked = state.get(key) or (limit.burst if limit else 0.0, now, 0.0)
+            wait = max(wait, blocked - now)
+            if limit is not None:
+                tokens = min(limit.burst, tokens + (now - updated) * limit.rate)
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / limit.rate)
+            refilled.append((key, limit, tokens, blocked))
+        if wait > 0:
+            return wait, False
+        dirty = False
+        for key, limit, tokens, blocked in refilled:
+            if limit is not None:
+                state[key] = [tokens - 1, now, blocked]
+                dirty = True
+        return 0.0, dirty
+
+    def acquire(self, host: str, path: str) -> float:
+        """
+        Block until the request may be sent
+
+        Args:
+            host: Host (netloc) of the request
+            path: URL path of the request
+
+        Returns:
+            Seconds spent waiting
+        """
+        buckets = self._buckets(host, path)
+        limited = any(limit is not None for _, limit in buckets)
+        waited = 0.0
+        while True:
+            if limited:
+                wait = self.store.transact(lambda state: self._take(state, buckets, time.time()))
+            else:
+                # Only Retry-After blocks apply, and checking them writes nothing
+                wait, _ = self._take(self.store.peek(), buckets, time.time())
+            if wait <= 0:
+                break
+            time.sleep(wait)
+            waited += wait
+        if waited and self.stats is not None:
+            self.stats.increment('throttled')
+            self.stats.increment('throttled_seconds', waited)
+        return waited
+
+    def block(self, host: str, seconds: float) -> None:
+        """
+        Stop every process from sending to host for `seconds` (Retry-After)
+
+        Args:
+            host: Host (netloc) that asked us to back off
+            seconds: Delay from the Retry-After header
+        """
+        key = f"host:{host}"
+
+        def update(state: State) -> Tuple[None, bool]:
+            now = time.time()
+            limit = self.host_limit
+            tokens, updated, blocked = state.get(key) or (limit.burst if limit else 0.0, now, 0.0)
+            state[key] = [tokens, updated, max(blocked, now + seconds)]
+            return None, True
+
+        self.store.transact(update)
+        if self.stats is not None:
+            self.stats.increment('retry_after')
+
+    def observe(self, host: str, response) -> None:
+        """Apply a Retry-After header from a 429/503 response"""
+        if response.status_code in (429, 503):
+            delay = parse_retry_after(response.headers.get('Retry-After'))
+            if delay:
+                self.block(host, delay)
@@ -0,0 +1,302 @@
+"""
+Resilience layer for APIClient: retries, hedged GETs and circuit breaking
+
+- Retries: only idempotent methods are retried, on connection errors,
+  connect timeouts, 429 and gateway statuses (502/503/504), with full-jitter
+  exponential backoff. POST/PATCH are never resent. Read timeouts are not
+  retried unless RETRY_READ_TIMEOUTS is set: a server that hangs once
+  usually hangs again, and each attempt would wait the full read timeout.
+- Hedging (opt-in): if a GET has not answered after the endpoint's recorded
+  p95, a second copy is sent and whichever answers first is used.
+- Circuit breaker: after repeated failures a host is short-circuited for a
+  cool-down period, so a dead backend fails tests immediately instead of
+  after a timeout per request. One probe request is let through afterwards.
+
+Every retry, hedge and rejection is counted in ResilienceStats so a run that
+only passed thanks to retries is visible in the report.
+"""
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+
+import requests
+from urllib3.exceptions import ReadTimeoutError
+
+from config.settings import (
+    RETRY_MAX_ATTEMPTS,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    RETRY_STATUSES,
+    RETRY_READ_TIMEOUTS,
+    HEDGE_ENABLED,
+    HEDGE_MAX_WORKERS,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT
+)
+
+IDEMPOTENT_METHODS: FrozenSet[str] = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+COUNTERS = ('retries', 'hedges', 'hedges_won', 'circuit_opened', 'circuit_rejected',
+            'throttled', 'throttled_seconds', 'retry_after')
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+
+class ResilienceStats:
+    """Thread-safe counters for retries, hedges and circuit breaker events"""
+
+    def __init__(self, parent: Optional['ResilienceStats'] = None):
+        """
+        Initialize the counters
+
+        Args:
+            parent: Counters to also increment (e.g. the process-wide totals)
+        """
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(COUNTERS, 0)
+        self.parent = parent
+
+    def increment(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+        if self.parent is not None:
+            self.parent.increment(name, amount)
+
+    def merge(self, counts: Dict[str, float]) -> None:
+        """Add counts from a snapshot (e.g. from an xdist worker)"""
+        with self._lock:
+            for name, count in counts.items():
+                self._counts[name] = self._counts.get(name, 0) + count
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Get a consistent copy of the counters
+
+        Returns:
+            Dictionary of counter name -> count
+        """
+        with self._lock:
+            return dict(self._counts)
+
+
+class RetryPolicy:
+    """Which requests to retry and how long to wait between attempts"""
+
+    def __init__(self, max_attempts: int = RETRY_MAX_ATTEMPTS,
+                 backoff_base: float = RETRY_BACKOFF_BASE,
+                 backoff_max: float = RETRY_BACKOFF_MAX,
+                 statuses: Tuple[int, ...] = RETRY_STATUSES,
+                 methods: FrozenSet[str] = IDEMPOTENT_METHODS,
+                 read_timeouts: bool = RETRY_READ_TIMEOUTS):
+        self.max_attempts = max(max_attempts, 1)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.statuses = frozenset(statuses)
+        self.methods = methods
+        self.read_timeouts = read_timeouts
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number `attempt` (1-based)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Per-host closed / open / half-open circuit"""
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT,
+                 stats: Optional[ResilienceStats] = None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.stats = stats or ResilienceStats()
+        self._lock = threading.Lock()
+        # host -> [consecutive failures, opened at (or None), probe in flight]
+        self._hosts: Dict[str, list] = {}
+
+    def before(self, host: str) -> bool:
+        """
+        Check that a request to host may be sent
+
+        Returns:
+            True if the request is the half-open probe; pass it to end_probe()
+            once the request is done
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or a probe is in flight)
+        """
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or state[1] is None:
+                return False
+            if time.monotonic() - state[1] >= self.reset_timeout and not state[2]:
+                state[2] = True  # half-open: let one probe through
+                return True
+        self.stats.increment('circuit_rejected')
+        raise CircuitOpenError(f"Circuit open for {host}: backend failing, not sending request")
+
+    def end_probe(self, host: str) -> None:
+        """Let the next probe through if this one ended without a recorded outcome"""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is not None:
+                state[2] = False
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._hosts.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            state = self._hosts.setdefault(host, [0, None, False])
+            state[0] += 1
+            reopen = state[2]
+            state[2] = False
+            if reopen or (state[1] is None and state[0] >= self.failure_threshold):
+                state[1] = time.monotonic()
+                opened = True
+            else:
+                opened = False
+        if opened:
+            self.stats.increment('circuit_opened')
+
+    def state(self, host: str) -> str:
+        """'closed', 'open' or 'half-open' for host"""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or state[1] is None:
+                return 'closed'
+            return 'half-open' if state[2] else 'open'
+
+
+class Resilience:
+    """Wraps one network attempt with breaker checks, hedging and retries"""
+
+    def __init__(self, retry: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 hedge: bool = HEDGE_ENABLED,
+                 stats: Optional[ResilienceStats] = None):
+        """
+        Initialize the layer
+
+        Args:
+            retry: RetryPolicy (defaults from settings)
+            breaker: CircuitBreaker, or None for a new default one
+            hedge: Send a backup GET after the hedge delay
+            stats: Counters; the breaker reports to them too
+        """
+        self.stats = stats or ResilienceStats(parent=totals)
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.breaker.stats = self.stats
+        self.hedge = hedge
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS,
+                                                    thread_name_prefix='hedge')
+            return self._executor
+
+    def _should_retry(self, response: requests.Response) -> bool:
+        return response.status_code in self.retry.statuses
+
+    def _hedged(self, attempt: Callable[[], requests.Response], delay: float) -> requests.Response:
+        pool = self._pool()
+        primary = pool.submit(attempt)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        self.stats.increment('hedges')
+        backup = pool.submit(attempt)
+        pending = {primary, backup}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                if future is backup:
+                    self.stats.increment('hedges_won')
+                for loser in pending:
+                    loser.add_done_callback(_close_response)
+                return future.result()
+        raise error
+
+    def call(self, method: str, host: str, attempt: Callable[[], requests.Response],
+             hedge_delay: Optional[Callable[[], float]] = None) -> requests.Response:
+        """
+        Send attempt() with breaker checks, optional hedging and retries
+
+        Args:
+            method: HTTP method (decides whether retries/hedges are allowed)
+            host: Breaker key, e.g. 'jsonplaceholder.typicode.com'
+            attempt: Sends the request once
+            hedge_delay: Returns the delay before a backup GET; hedging is
+                skipped when None
+
+        Returns:
+            The first successful response, or the last one if retries ran out
+
+        Raises:
+            CircuitOpenError: If the host's circuit is open
+            requests.RequestException: If the last attempt failed to connect
+        """
+        retryable = method in self.retry.methods
+        hedging = self.hedge and method == 'GET' and hedge_delay is not None
+        number = 0
+        while True:
+            number += 1
+            probe = self.breaker.before(host)
+            last = number == self.retry.max_attempts or not retryable
+            try:
+                response = self._hedged(attempt, hedge_delay()) if hedging else attempt()
+            except (requests.ConnectionError, requests.Timeout) as error:
+                self.breaker.record_failure(host)
+                if last or (not self.retry.read_timeouts and _is_read_timeout(error)):
+                    raise
+            else:
+                if not self._should_retry(response):
+                    self.breaker.record_success(host)
+                    return response
+                # 429 means the backend is up but throttling us, not failing
+                if response.status_code != 429:
+                    self.breaker.record_failure(host)
+                if last:
+                    return response
+                response.close()
+            finally:
+                # Any other error (e.g. a bad URL) must not leave the probe slot taken
+                if probe:
+                    self.breaker.end_probe(host)
+            self.stats.increment('retries')
+            time.sleep(self.retry.backoff(number))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# Process-wide counters every default Resilience layer also reports to
+totals = ResilienceStats()
+
+
+def _is_read_timeout(error: requests.RequestException) -> bool:
+    """True for a read timeout, also when it hit while reading the body"""
+    if isinstance(error, requests.ReadTimeout):
+        return True
+    # requests wraps a timeout during the body read in a ConnectionError
+    return any(isinstance(arg, ReadTimeoutError) for arg in error.args)
+
+
+def _close_response(future: Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
@@ -0,0 +1,38 @@
+"""
+Helpers for building requests.Response objects that did not come off the wire
+"""
+from datetime import timedelta
+from typing import Mapping
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+def build_response(request: requests.PreparedRequest, status_code: int,
+                   headers: Mapping[str, str], content: bytes,
+                   reason: str = 'OK') -> requests.Response:
+    """
+    Build a fully-read Response for a request
+
+    Args:
+        request: Prepared request the response answers
+        status_code: HTTP status code
+        headers: Response headers
+        content: Response body bytes
+        reason: Reason phrase
+
+    Returns:
+        Response object that behaves like one read from the network
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = content
+    response._content_consumed = True
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = request.url
+    response.request = request
+    response.reason = reason
+    response.elapsed = timedelta(0)
+    return response
@@ -0,0 +1,188 @@
+"""
+Duration- and endpoint-aware scheduling for pytest-xdist
+
+Durations and the main endpoint of every test are recorded at the end of
+each run. The next run with --lpt-schedule plans the work up front:
+
+- tests that hit the same endpoint form a group, so they run on one worker
+  and reuse its warm connections and caches (groups larger than a fair share
+  are split)
+- groups are assigned longest-first to the least-loaded worker (LPT), so
+  workers finish at about the same time
+
+Each worker gets its plan in small chunks; a worker that runs out steals
+from the tail of the busiest plan, which covers wrong estimates and new
+tests without history.
+"""
+import heapq
+import json
+import os
+import statistics
+import tempfile
+from typing import Dict, List, Optional, Sequence
+
+from xdist.scheduler import LoadScheduling
+
+# Weight of the newest run when smoothing recorded durations
+_SMOOTHING = 0.5
+
+
+class DurationHistory:
+    """Recorded duration and main endpoint per test id, kept in a JSON file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, object]] = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as handle:
+                self.entries = json.load(handle)
+
+    def durations(self) -> Dict[str, float]:
+        return {nodeid: entry['duration'] for nodeid, entry in self.entries.items()}
+
+    def endpoints(self) -> Dict[str, str]:
+        return {nodeid: entry['endpoint'] for nodeid, entry in self.entries.items()
+                if entry.get('endpoint')}
+
+    def update(self, nodeid: str, duration: float, endpoint: Optional[str]) -> None:
+        """Blend a new measurement into the history of one test"""
+        previous = self.entries.get(nodeid)
+        if previous is not None:
+            duration = _SMOOTHING * duration + (1 - _SMOOTHING) * previous['duration']
+            endpoint = endpoint or previous.get('endpoint')
+        self.entries[nodeid] = {'duration': round(duration, 6), 'endpoint': endpoint}
+
+    def save(self) -> None:
+        """Write the file atomically"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+            json.dump(self.entries, handle, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+
+def plan_schedule(nodeids: Sequence[str], workers: int, durations: Dict[str, float],
+                  endpoints: Dict[str, str]) -> List[List[int]]:
+    """
+    Split tests into one ordered plan per worker
+
+    Args:
+        nodeids: Collected test ids, in collection order
+        workers: Number of workers
+        durations: Recorded seconds per test id (missing tests get the median)
+        endpoints: Main endpoint per test id (missing tests group by module)
+
+    Returns:
+        Per worker, the collection indices to run, longest groups first
+    """
+    default = statistics.median(durations.values()) if durations else 1.0
+    cost = [durations.get(nodeid, default) for nodeid in nodeids]
+
+    groups: Dict[str, List[int]] = {}
+    for index, nodeid in enumerate(nodeids):
+        key = endpoints.get(nodeid) or nodeid.split('::', 1)[0]
+        groups.setdefault(key, []).append(index)
+
+    # Split groups larger than a fair share so one endpoint cannot pin a worker
+    fair_share = sum(cost) / max(workers, 1)
+    chunks = []
+    for indices in groups.values():
+        chunk, chunk_cost = [], 0.0
+        for index in indices:
+            if chunk and chunk_cost + cost[index] > fair_share:
+                chunks.append((chunk_cost, chunk))
+                chunk, chunk_cost = [], 0.0
+            chunk.append(index)
+            chunk_cost += cost[index]
+        chunks.append((chunk_cost, chunk))
+
+    plans: List[List[int]] = [[] for _ in range(workers)]
+    loads = [(0.0, worker) for worker in range(workers)]
+    for chunk_cost, chunk in sorted(chunks, key=lambda item: (-item[0], item[1][0])):
+        load, worker = heapq.heappop(loads)
+        plans[worker].extend(chunk)
+        heapq.heappush(loads, (load + chunk_cost, worker))
+    return plans
+
+
+class DurationAffinityScheduling(LoadScheduling):
+    """xdist scheduler that runs a precomputed LPT/affinity plan with work stealing"""
+
+    def __init__(self, config, log=None, history: Optional[DurationHistory] = None):
+        super().__init__(config, log)
+        self.history = history
+        self.node2plan: Dict[object, List[int]] = {}
+
+    def add_node(self, node):
+        super().add_node(node)
+        self.node2plan[node] = []
+
+    def schedule(self):
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(self.node2collection.values())[0]
+        if not self.collection:
+            return
+        durations = self.history.durations() if self.history else {}
+        endpoints = self.history.endpoints() if self.history else {}
+        plans = plan_schedule(self.collection, len(self.nodes), durations, endpoints)
+        for node, plan in zip(self.nodes, plans):
+            self.node2plan[node] = plan
+        for node in self.nodes:
+            self.check_schedule(node)
+
+    def _next_chunk(self, node) -> List[int]:
+        if self.pending:
+            chunk = self.pending[:2]
+            del self.pending[:2]
+            return chunk
+        plan = self.node2plan[node]
+        if plan:
+            size = max(2, len(plan) // 4)
+            chunk = plan[:size]
+            del plan[:size]
+            return chunk
+        # Steal from the end of the longest remaining plan (its coldest work)
+        victim = max(self.node2plan.values(), key=len, default=[])
+        return [victim.pop()] if victim else []
+
+    def check_schedule(self, node, duration=0):
+        # A worker only runs an item once it holds the next one (or is shut
+        # down), so leave every node with two items or shut it down
+        if node.shutting_down:
+            return
+        while len(self.node2pending[node]) < 2:
+            chunk = self._next_chunk(node)
+            if not chunk:
+                node.shutdown()
+                return
+            self.node2pending[node].extend(chunk)
+            node.send_runtest_some(chunk)
+
+    def remove_node(self, node):
+        pending = self.node2pending.pop(node)
+        plan = self.node2plan.pop(node, [])
+        if not pending and not plan:
+            return None
+        crashitem = self.collection[pending.pop(0)] if pending else None
+        self.pending.extend(pending + plan)
+        for other in self.node2pending:
+            self.check_schedule(other)
+        return crashitem
+
+    @property
+    def tests_finished(self):
+        if any(self.node2plan.values()):
+            return False
+        return super().tests_finished
+
+    @property
+    def has_pending(self):
+        return any(self.node2plan.values()) or super().has_pending
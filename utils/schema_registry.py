@@ -0,0 +1,301 @@
+"""
+Schema registry with compiled validators
+
+Each declarative schema is compiled once into a specialized Python function
+(straight-line type checks, no per-call schema walking) and cached by the
+schema's canonical JSON, so identical schemas share one validator.
+Validators return a list of SchemaViolation with JSON paths instead of a
+bare bool.
+"""
+import json
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from config.schemas import SCHEMAS
+
+
+class SchemaViolation(NamedTuple):
+    """One validation failure: JSON path plus a human-readable message"""
+
+    path: str
+    message: str
+
+
+class SchemaValidationError(ValueError):
+    """Raised by validate_stream on the first invalid element"""
+
+    def __init__(self, index: int, violations: List[SchemaViolation]):
+        self.index = index
+        self.violations = violations
+        super().__init__(f"Element {index} is invalid: {violations}")
+
+
+Validator = Callable[[Any], List[SchemaViolation]]
+
+# Exact-type checks: JSON decoding only produces these types, and checking
+# type() identity keeps bool out of integer/number
+_TYPE_CHECKS = {
+    'object': 'type({v}) is dict',
+    'array': 'type({v}) is list',
+    'string': 'type({v}) is str',
+    'integer': 'type({v}) is int',
+    'number': 'type({v}) in (int, float)',
+    'boolean': 'type({v}) is bool',
+    'null': '{v} is None',
+}
+
+
+class _Compiler:
+    """Turns one schema into the source of a validate(value) function"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.constants: Dict[str, Any] = {}
+        self._counter = 0
+
+    def _name(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+    def _emit(self, indent: int, line: str) -> None:
+        self.lines.append('    ' * indent + line)
+
+    @staticmethod
+    def _key(field: str) -> str:
+        # Path templates become f-strings once inside an array, so literal braces are doubled
+        return field.replace('{', '{{').replace('}', '}}')
+
+    @staticmethod
+    def _path(template: str, dynamic: bool) -> str:
+        if dynamic:
+            return f"f{template!r}"
+        return repr(template.replace('{{', '{').replace('}}', '}'))
+
+    def compile(self, schema: Dict[str, Any]) -> str:
+        self._emit(0, 'def validate(v0):')
+        self._emit(1, 'errors = []')
+        self._node(schema, 'v0', '$', False, 1)
+        self._emit(1, 'return errors')
+        return '\n'.join(self.lines)
+
+    def _block(self, indent: int, header: str, body: Callable[[int], None]) -> None:
+        self._emit(indent, header)
+        size = len(self.lines)
+        body(indent + 1)
+        if len(self.lines) == size:
+            self._emit(indent + 1, 'pass')
+
+    def _node(self, schema: Dict[str, Any], var: str, path: str, dynamic: bool, indent: int) -> None:
+        types = schema.get('type')
+        if isinstance(types, str):
+            types = [types]
+        if not types:
+            self._checks(schema, var, path, dynamic, indent, known=None)
+            return
+
+        unknown = set(types) - set(_TYPE_CHECKS)
+        if unknown:
+            raise ValueError(f"Unsupported schema type(s): {sorted(unknown)}")
+        condition = ' or '.join(_TYPE_CHECKS[name].format(v=var) for name in types)
+        expected = '/'.join(types)
+        self._emit(indent, f"if not ({condition}):")
+        self._emit(indent + 1, f"errors.append(SchemaViolation({self._path(path, dynamic)}, "
+                               f"'expected {expected}, got ' + type({var}).__name__))")
+        # Nested checks only run once the type is right
+        size = len(self.lines)
+        self._emit(indent, 'else:')
+        self._checks(schema, var, path, dynamic, indent + 1,
+                     known=types[0] if len(types) == 1 else None)
+        if len(self.lines) == size + 1:
+            self.lines.pop()
+
+    def _checks(self, schema: Dict[str, Any], var: str, path: str, dynamic: bool,
+                indent: int, known: Optional[str]) -> None:
+        path_expr = self._path(path, dynamic)
+
+        if 'enum' in schema:
+            name = self._name('enum')
+            self.constants[name] = list(schema['enum'])
+            self._emit(indent, f"if {var} not in {name}:")
+            self._emit(indent + 1, f"errors.append(SchemaViolation({path_expr}, 'not one of ' + repr({name})))")
+
+        if 'minimum' in schema:
+            self._emit(indent, f"if type({var}) in (int, float) and {var} < {schema['minimum']!r}:")
+            self._emit(indent + 1, f"errors.append(SchemaViolation({path_expr}, "
+                                   f"'below minimum {schema['minimum']!r}'))")
+
+        if 'minLength' in schema:
+            self._emit(indent, f"if type({var}) is str and len({var}) < {int(schema['minLength'])}:")
+            self._emit(indent + 1, f"errors.append(SchemaViolation({path_expr}, "
+                                   f"'shorter than {int(schema['minLength'])}'))")
+
+        required = schema.get('required', [])
+        properties = schema.get('properties', {})
+        if required or properties:
+            def object_checks(level: int) -> None:
+                for field in required:
+                    field_path = self._path(f"{path}.{self._key(field)}", dynamic)
+                    self._emit(level, f"if {field!r} not in {var}:")
+                    self._emit(level + 1, f"errors.append(SchemaViolation({field_path}, 'missing required field'))")
+                for field, subschema in properties.items():
+                    child = self._name('v')
+                    self._emit(level, f"{child} = {var}.get({field!r}, _MISSING)")
+                    self._block(level, f"if {child} is not _MISSING:",
+                                lambda inner, s=subschema, c=child, f=field:
+                                self._node(s, c, f"{path}.{self._key(f)}", dynamic, inner))
+
+            if known == 'object':
+                object_checks(indent)
+            else:
+                self._block(indent, f"if type({var}) is dict:", object_checks)
+
+        if 'items' in schema:
+            index, child = self._name('i'), self._name('v')
+            loop = f"for {index}, {child} in enumerate({var}):"
+
+            def item_checks(level: int) -> None:
+                self._node(schema['items'], child, f"{path}[{{{index}}}]", True, level)
+
+            if known == 'array':
+                self._block(indent, loop, item_checks)
+            else:
+                self._block(indent, f"if type({var}) is list:",
+                            lambda level: self._block(level, loop, item_checks))
+
+
+def compile_schema(schema: Dict[str, Any]) -> Validator:
+    """
+    Compile a schema into a validator function
+
+    Args:
+        schema: Declarative schema (JSON Schema subset)
+
+    Returns:
+        Function taking a value and returning a list of SchemaViolation
+    """
+    compiler = _Compiler()
+    source = compiler.compile(schema)
+    namespace: Dict[str, Any] = {'SchemaViolation': SchemaViolation, '_MISSING': object()}
+    namespace.update(compiler.constants)
+    exec(compile(source, '<schema validator>', 'exec'), namespace)
+    validator = namespace['validate']
+    validator.__source__ = source
+    return validator
+
+
+class SchemaRegistry:
+    """Named schemas plus a per-schema cache of compiled validators"""
+
+    def __init__(self, schemas: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Initialize the registry
+
+        Args:
+            schemas: Optional mapping of name to schema to register up front
+        """
+        self._schemas: Dict[str, Dict[str, Any]] = {}
+        self._compiled: Dict[str, Validator] = {}
+        self._by_name: Dict[str, Validator] = {}
+        self._lock = threading.Lock()
+        for name, schema in (schemas or {}).items():
+            self.register(name, schema)
+
+    def register(self, name: str, schema: Dict[str, Any]) -> None:
+        """
+        Register (or replace) a named schema
+
+        Args:
+            name: Schema name, e.g. a key of ENDPOINTS
+            schema: Declarative schema
+        """
+        with self._lock:
+            self._schemas[name] = schema
+            self._by_name.pop(name, None)
+
+    def schema(self, name: str) -> Dict[str, Any]:
+        """Get a registered schema by name"""
+        return self._schemas[name]
+
+    def validator(self, name: str) -> Validator:
+        """
+        Get the compiled validator for a named schema, compiling it on first use
+
+        Args:
+            name: Registered schema name
+
+        Returns:
+            Validator function
+        """
+        validator = self._by_name.get(name)
+        if validator is not None:
+            return validator
+        with self._lock:
+            schema = self._schemas[name]
+            key = json.dumps(schema, sort_keys=True)
+            validator = self._compiled.get(key)
+            if validator is None:
+                validator = compile_schema(schema)
+                self._compiled[key] = validator
+            self._by_name[name] = validator
+        return validator
+
+    def validate(self, name: str, data: Any) -> List[SchemaViolation]:
+        """
+        Validate data against a named schema
+
+        Args:
+            name: Registered schema name
+            data: Decoded JSON value
+
+        Returns:
+            List of SchemaViolation (empty if valid)
+        """
+        return self.validator(name)(data)
+
+    def is_valid(self, name: str, data: Any) -> bool:
+        """
+        Check data against a named schema
+
+        Args:
+            name: Registered schema name
+            data: Decoded JSON value
+
+        Returns:
+            True if valid, False otherwise
+        """
+        return not self.validator(name)(data)
+
+
+# Default registry with a schema for every resource in ENDPOINTS
+registry = SchemaRegistry(SCHEMAS)
+
+
+def validate_stream(items: Iterable[Any], name: str,
+                    schema_registry: SchemaRegistry = registry) -> Iterator[Any]:
+    """
+    Validate elements as they stream in, stopping at the first invalid one
+
+    Args:
+        items: Iterable of decoded elements, e.g. APIClient.iter_json(...)
+        name: Registered schema name
+        schema_registry: Registry holding the schema
+
+    Yields:
+        Each valid element
+
+    Raises:
+        SchemaValidationError: On the first invalid element (the source
+            iterator is closed, so no further data is read)
+    """
+    validator = schema_registry.validator(name)
+    iterator = iter(items)
+    try:
+        for index, item in enumerate(iterator):
+            violations = validator(item)
+            if violations:
+                raise SchemaValidationError(index, violations)
+            yield item
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            close()
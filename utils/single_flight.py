@@ -0,0 +1,153 @@
+"""
+Single-flight coalescing of identical in-flight requests
+
+While a GET for a URL is in flight, further GETs for the same URL (from other
+threads, or other tasks on the same event loop) wait for it instead of
+sending their own request. Every caller, the one that sent it included, gets
+its own copy of the result, so one caller mutating a response cannot affect
+the others. Errors are raised to every waiter.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+import requests
+
+
+def request_key(url: str, params: Optional[Dict] = None) -> str:
+    """
+    Coalescing key for a GET: the full URL with encoded query parameters
+
+    Args:
+        url: Request URL without query parameters
+        params: Query parameters
+
+    Returns:
+        URL as it would be sent
+    """
+    prepared = requests.PreparedRequest()
+    prepared.prepare_url(url, params)
+    return prepared.url
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+class SingleFlight:
+    """Coalesce identical calls made from several threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._counts = {'sent': 0, 'coalesced': 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any],
+           copy: Callable[[Any], Any] = _identity) -> Any:
+        """
+        Run fn() unless a call with the same key is already running
+
+        Args:
+            key: Identity of the call, e.g. request_key(url, params)
+            fn: Performs the call
+            copy: Makes a private copy of the result for each caller
+
+        Returns:
+            copy() of the result of fn() or of the in-flight call
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self._counts['sent'] += 1
+            else:
+                self._counts['coalesced'] += 1
+        if not leader:
+            return copy(future.result())
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            with self._lock:
+                del self._calls[key]
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            del self._calls[key]
+        future.set_result(result)
+        return copy(result)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get coalescing counters
+
+        Returns:
+            Dictionary with calls sent and calls coalesced into another
+        """
+        with self._lock:
+            return dict(self._counts)
+
+
+class AsyncSingleFlight:
+    """Coalesce identical calls made from several tasks on one event loop"""
+
+    def __init__(self):
+        # key -> [task running fn(), callers waiting for it]
+        self._calls: Dict[Hashable, list] = {}
+        self._counts = {'sent': 0, 'coalesced': 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]],
+                 copy: Callable[[Any], Any] = _identity) -> Any:
+        """
+        Await fn() unless a call with the same key is already running
+
+        fn() runs in its own task, so cancelling a caller (the one that
+        started the call included) does not cancel it for the others. The
+        task is cancelled once no caller is waiting for it any more.
+
+        Args:
+            key: Identity of the call, e.g. request_key(url, params)
+            fn: Returns the awaitable performing the call
+            copy: Makes a private copy of the result for each caller
+
+        Returns:
+            copy() of the result of fn() or of the in-flight call
+        """
+        call = self._calls.get(key)
+        if call is None:
+            task = asyncio.ensure_future(fn())
+            call = self._calls[key] = [task, 0]
+            task.add_done_callback(lambda done, key=key, call=call: self._finish(key, call))
+            self._counts['sent'] += 1
+        else:
+            self._counts['coalesced'] += 1
+        task = call[0]
+        call[1] += 1
+        try:
+            result = await asyncio.shield(task)
+        finally:
+            call[1] -= 1
+            if not call[1] and not task.done():
+                # Nobody wants the result; later callers must start a fresh call
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                task.cancel()
+        return copy(result)
+
+    def _finish(self, key: Hashable, call: list) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        task = call[0]
+        if not task.cancelled():
+            task.exception()  # retrieved: no warning when every caller was cancelled
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get coalescing counters
+
+        Returns:
+            Dictionary with calls sent and calls coalesced into another
+        """
+        return dict(self._counts)
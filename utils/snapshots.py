@@ -0,0 +1,218 @@
+"""
+Structural snapshots of API responses (contract testing)
+
+A snapshot stores a canonical hash of a response's structure: the key set
+of every object and the type of every value, with all items of an array
+folded into their distinct shapes, so 5000 photos cost as much to store as
+one. With values=True the hash also covers the canonical JSON of the body,
+and one short digest per top-level item or key is kept for the diff.
+
+Checking a response is one hash and one string comparison. The stored
+shape is only walked when the hashes differ, to explain what changed.
+Snapshots change only when the run is started with --update-snapshots.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from config.settings import SNAPSHOT_MAX_DIFF
+
+_TYPE_NAMES = {
+    str: 'string',
+    bool: 'boolean',
+    int: 'integer',
+    float: 'number',
+    type(None): 'null',
+}
+_ITEM_DIGEST_SIZE = 6  # bytes per top-level item digest in values mode
+
+
+def _shape(value: Any) -> Union[str, Tuple]:
+    """Hashable shape: a type name, ('object', (key, shape)...) or ('array', shape...)"""
+    if isinstance(value, dict):
+        return ('object',) + tuple(sorted((key, _shape(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return ('array',) + tuple(sorted({_shape(item) for item in value}, key=repr))
+    return _TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+def _form(shape: Union[str, Tuple]) -> Any:
+    """JSON form of a shape: objects as dicts, arrays as lists of item shapes"""
+    if isinstance(shape, str):
+        return shape
+    if shape[0] == 'object':
+        return {key: _form(item) for key, item in shape[1:]}
+    return [_form(item) for item in shape[1:]]
+
+
+def _canonical(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _digest(shape: Union[str, Tuple], data: Any, values: bool) -> str:
+    hasher = hashlib.blake2b(repr(shape).encode('utf-8'), digest_size=16)
+    if values:
+        hasher.update(_canonical(data))
+    return hasher.hexdigest()
+
+
+def structure_hash(data: Any, values: bool = False) -> str:
+    """
+    Canonical hash of a decoded JSON body
+
+    Args:
+        data: Decoded JSON
+        values: Include the values, not only keys and types
+
+    Returns:
+        Hex digest (independent of key order)
+    """
+    return _digest(_shape(data), data, values)
+
+
+def _item_digests(data: Any) -> Union[Dict[str, str], List[str], None]:
+    def short(value: Any) -> str:
+        return hashlib.blake2b(_canonical(value), digest_size=_ITEM_DIGEST_SIZE).hexdigest()
+    if isinstance(data, list):
+        return [short(item) for item in data]
+    if isinstance(data, dict):
+        return {key: short(item) for key, item in data.items()}
+    return None
+
+
+def snapshot_entry(data: Any, values: bool = False) -> Dict[str, Any]:
+    """
+    Snapshot record for a decoded JSON body
+
+    Args:
+        data: Decoded JSON
+        values: Include the values, not only keys and types
+
+    Returns:
+        Dictionary with hash, values, shape, recorded and (with values)
+        per-item digests
+    """
+    shape = _shape(data)
+    entry = {
+        'hash': _digest(shape, data, values),
+        'values': values,
+        'shape': _form(shape),
+        'recorded': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+    if values:
+        entry['items'] = _item_digests(data)
+    return entry
+
+
+def _describe(form: Any) -> str:
+    if isinstance(form, dict):
+        return 'object'
+    if isinstance(form, list):
+        return 'array'
+    return form
+
+
+def _diff_forms(old: Any, new: Any, path: str, lines: List[str]) -> None:
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in sorted(old.keys() | new.keys()):
+            child = f"{path}.{key}"
+            if key not in new:
+                lines.append(f"- {child}: {_describe(old[key])} (removed)")
+            elif key not in old:
+                lines.append(f"+ {child}: {_describe(new[key])} (added)")
+            else:
+                _diff_forms(old[key], new[key], child, lines)
+    elif isinstance(old, list) and isinstance(new, list):
+        old_items = {json.dumps(item, sort_keys=True): item for item in old}
+        new_items = {json.dumps(item, sort_keys=True): item for item in new}
+        added = [new_items[key] for key in sorted(new_items.keys() - old_items.keys())]
+        removed = [old_items[key] for key in sorted(old_items.keys() - new_items.keys())]
+        for item in added:
+            if not old:
+                lines.append(f"+ {path}[*]: {_describe(item)} items (added)")
+                continue
+            # Explain a new item shape against the closest old one
+            candidates = []
+            for previous in removed or old:
+                candidate: List[str] = []
+                _diff_forms(previous, item, f"{path}[*]", candidate)
+                candidates.append(candidate)
+            lines.extend(line for line in min(candidates, key=len) if line not in lines)
+        if removed and not added:
+            for item in removed:
+                shape = json.dumps(item, sort_keys=True)
+                lines.append(f"- {path}[*]: {_describe(item)} items with shape {shape} (gone)")
+    elif old != new:
+        lines.append(f"~ {path}: {_describe(old)} -> {_describe(new)}")
+
+
+def _diff_items(old: Any, new: Any, lines: List[str]) -> None:
+    if isinstance(old, list) and isinstance(new, list):
+        if len(old) != len(new):
+            lines.append(f"~ $: {len(old)} items -> {len(new)} items")
+        changed = [index for index, (before, after) in enumerate(zip(old, new)) if before != after]
+        if changed:
+            lines.append(f"~ $: values changed in {len(changed)} items, first at "
+                         + ", ".join(f"[{index}]" for index in changed[:5]))
+    elif isinstance(old, dict) and isinstance(new, dict):
+        for key in sorted(key for key in old.keys() & new.keys() if old[key] != new[key]):
+            lines.append(f"~ $.{key}: value changed")
+    else:
+        lines.append("~ $: value changed")
+
+
+def diff(entry: Dict[str, Any], data: Any, limit: int = SNAPSHOT_MAX_DIFF) -> List[str]:
+    """
+    Explain how a body differs from a snapshot (only call this on a mismatch)
+
+    Args:
+        entry: Stored snapshot record
+        data: Decoded JSON of the current response
+        limit: Maximum lines to return
+
+    Returns:
+        Diff lines: '-' removed, '+' added, '~' changed
+    """
+    lines: List[str] = []
+    _diff_forms(entry['shape'], _form(_shape(data)), '$', lines)
+    if not lines and entry.get('values'):
+        _diff_items(entry.get('items'), _item_digests(data), lines)
+    if not lines:
+        lines.append("~ $: hash differs but no change was found (snapshot recorded with other options?)")
+    if len(lines) > limit:
+        lines[limit:] = [f"... {len(lines) - limit} more"]
+    return lines
+
+
+class SnapshotStore:
+    """JSON file of response snapshots keyed by test id"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as handle:
+                self._data = json.load(handle)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Snapshot record for a key, or None"""
+        return self._data.get(key)
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        """Replace the snapshot for a key"""
+        self._data[key] = entry
+
+    def keys(self) -> List[str]:
+        return sorted(self._data)
+
+    def save(self) -> None:
+        """Write the file atomically"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+            json.dump(self._data, handle, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
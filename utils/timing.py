@@ -0,0 +1,279 @@
+"""
+Per-request phase timings and mergeable latency histograms
+
+APIClient starts a PhaseClock for every request that goes to the network; the
+connection pool marks when a connection was acquired, how long connecting
+took and when response headers arrived, and the client marks when the body
+was read. From those marks each request gets:
+
+- queue: preparing the request and waiting for a pooled connection
+- connect: opening a new TCP/TLS connection (0 when one was reused)
+- ttfb: sending the request until the response headers arrived
+- download: reading the body
+
+Timings are aggregated into log-bucketed histograms per method, endpoint and
+phase. Histograms are plain dicts of counts, so xdist workers can ship them
+to the controller and be merged exactly.
+"""
+import math
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+PHASES = ('queue', 'connect', 'ttfb', 'download', 'total')
+
+# Bucket i covers [GROWTH**i, GROWTH**(i+1)) seconds: ~9% relative error
+GROWTH = 2 ** 0.25
+_LOG_GROWTH = math.log(GROWTH)
+_MIN_VALUE = 1e-6
+
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    Collapse numeric path segments so /posts/7 and /posts/8 share a histogram
+
+    Args:
+        endpoint: Endpoint path, e.g. '/posts/7/comments'
+
+    Returns:
+        Template path, e.g. '/posts/{id}/comments'
+    """
+    return _ID_SEGMENT.sub('/{id}', endpoint.split('?', 1)[0])
+
+
+class PhaseTimings(NamedTuple):
+    """Phase durations of one request, in seconds"""
+
+    queue: float
+    connect: float
+    ttfb: float
+    download: float
+    total: float
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram that merges exactly across processes"""
+
+    __slots__ = ('buckets', 'count', 'sum', 'min', 'max')
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one sample"""
+        index = math.floor(math.log(max(seconds, _MIN_VALUE)) / _LOG_GROWTH)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Add every sample of another histogram"""
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct: float) -> float:
+        """
+        Estimate a percentile from the buckets
+
+        Args:
+            pct: Percentile in [0, 100]
+
+        Returns:
+            Upper bound of the bucket holding the percentile, clamped to the
+            observed min/max (0.0 when empty)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(pct / 100 * self.count), 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(GROWTH ** (index + 1), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form (JSON/execnet safe: string keys, no inf)"""
+        return {
+            'buckets': {str(index): count for index, count in self.buckets.items()},
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LatencyHistogram':
+        histogram = cls()
+        histogram.buckets = {int(index): count for index, count in data['buckets'].items()}
+        histogram.count = data['count']
+        histogram.sum = data['sum']
+        histogram.min = data['min'] if data['count'] else math.inf
+        histogram.max = data['max']
+        return histogram
+
+
+class TimingRecorder:
+    """Thread-safe histograms keyed by (method, endpoint template, phase)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+
+    def record(self, method: str, endpoint: str, timings: PhaseTimings) -> None:
+        """
+        Add one request's phase timings
+
+        Args:
+            method: HTTP method
+            endpoint: Endpoint path (numeric segments are collapsed)
+            timings: PhaseTimings of the request
+        """
+        template = endpoint_template(endpoint)
+        with self._lock:
+            for phase, value in zip(PHASES, timings):
+                key = (method, template, phase)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = LatencyHistogram()
+                histogram.record(value)
+
+    def histogram(self, method: str, endpoint: str, phase: str = 'total') -> LatencyHistogram:
+        """Get a copy of one histogram (empty if nothing was recorded)"""
+        copy = LatencyHistogram()
+        with self._lock:
+            histogram = self._histograms.get((method, endpoint_template(endpoint), phase))
+            if histogram is not None:
+                copy.merge(histogram)
+        return copy
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable snapshot, e.g. for xdist workeroutput"""
+        with self._lock:
+            return {'|'.join(key): histogram.to_dict() for key, histogram in self._histograms.items()}
+
+    def merge_dict(self, data: Dict[str, Any]) -> None:
+        """Merge a snapshot produced by to_dict (e.g. from an xdist worker)"""
+        with self._lock:
+            for joined, histogram_data in data.items():
+                key = tuple(joined.split('|', 2))
+                incoming = LatencyHistogram.from_dict(histogram_data)
+                if key in self._histograms:
+                    self._histograms[key].merge(incoming)
+                else:
+                    self._histograms[key] = incoming
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        One row per method/endpoint with latency percentiles and per-phase means
+
+        Returns:
+            Rows sorted by total time spent, largest first
+        """
+        with self._lock:
+            grouped: Dict[Tuple[str, str], Dict[str, LatencyHistogram]] = {}
+            for (method, endpoint, phase), histogram in self._histograms.items():
+                grouped.setdefault((method, endpoint), {})[phase] = histogram
+            rows = []
+            for (method, endpoint), phases in grouped.items():
+                total = phases['total']
+                row = {
+                    'method': method,
+                    'endpoint': endpoint,
+                    'count': total.count,
+                    'time': total.sum,
+                    'p50': total.percentile(50),
+                    'p95': total.percentile(95),
+                    'p99': total.percentile(99),
+                    'max': total.max,
+                }
+                for phase in PHASES[:-1]:
+                    row[phase] = phases[phase].mean
+                rows.append(row)
+        return sorted(rows, key=lambda row: row['time'], reverse=True)
+
+
+class PhaseClock:
+    """Marks taken while one request is in flight on the current thread"""
+
+    __slots__ = ('start', 'acquired', 'connect', 'headers', 'end')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.acquired: Optional[float] = None
+        self.connect = 0.0
+        self.headers: Optional[float] = None
+        self.end: Optional[float] = None
+
+    def timings(self) -> PhaseTimings:
+        end = self.end if self.end is not None else time.perf_counter()
+        acquired = self.acquired if self.acquired is not None else self.start
+        headers = self.headers if self.headers is not None else end
+        return PhaseTimings(
+            queue=acquired - self.start,
+            connect=self.connect,
+            ttfb=max(headers - acquired - self.connect, 0.0),
+            download=end - headers,
+            total=end - self.start,
+        )
+
+
+_local = threading.local()
+
+
+def current_clock() -> Optional[PhaseClock]:
+    """The PhaseClock of the request running on this thread, if any"""
+    return getattr(_local, 'clock', None)
+
+
+@contextmanager
+def measure(hooks: List[Callable[[str, str, PhaseTimings], None]],
+            method: str, endpoint: str) -> Iterator[PhaseClock]:
+    """
+    Time one request and pass its PhaseTimings to every hook
+
+    Args:
+        hooks: Callables taking (method, endpoint, timings)
+        method: HTTP method
+        endpoint: Endpoint path
+
+    Yields:
+        The PhaseClock the connection pool marks
+    """
+    previous = current_clock()
+    clock = _local.clock = PhaseClock()
+    try:
+        yield clock
+    finally:
+        _local.clock = previous
+        clock.end = time.perf_counter()
+    # Failed requests are not timed; they would skew the phase breakdown
+    timings = clock.timings()
+    for hook in hooks:
+        hook(method, endpoint, timings)
+
+
+# Process-wide recorder APIClient instances report to by default
+recorder = TimingRecorder()